@@ -13,6 +13,9 @@ example::
 from __future__ import absolute_import
 
 from .add_userfcn import add_userfcn
+from .atc import atc
+from .bfswpf import bfswpf
+from .bus_ordering import bus_ordering
 from .bustypes import bustypes
 from .case118 import case118
 from .case14 import case14
@@ -37,26 +40,40 @@ from .dAbr_dV import dAbr_dV
 from .dcopf import dcopf
 from .dcopf_solver import dcopf_solver
 from .dcpf import dcpf
+from .dc_contingency_screen import dc_contingency_screen
+from .dc_contingency_screen_n2 import dc_contingency_screen_n2
+from .dcpf_solver import DCPFSolver
 from .dIbr_dV import dIbr_dV
 from .dSbr_dV import dSbr_dV
 from .dSbus_dV import dSbus_dV
 from .ext2int import ext2int
 from .fairmax import fairmax
 from .fdpf import fdpf
+from .fdpf_solver import FDPFSolver
+from .find_islands import find_islands
 from .gausspf import gausspf
 from .get_reorder import get_reorder
 from .hasPQcap import hasPQcap
+from .incremental_ptdf import IncrementalPTDF
+from .incremental_ybus import IncrementalYbus
 from .int2ext import int2ext
 from .ipoptopf_solver import ipoptopf_solver
 from .ipopt_options import ipopt_options
 from .isload import isload
+from .jacobian_plan import JacobianPlan
+from .kkt_plan import KKTPlan
 from .loadcase import loadcase
+from .lodf_solver import LODFSolver
+from .loss_sensitivity import loss_sensitivity
+from .lrucache import LRUCache
 from .makeAang import makeAang
 from .makeApq import makeApq
 from .makeAvl import makeAvl
 from .makeAy import makeAy
 from .makeBdc import makeBdc
 from .makeB import makeB
+from .makeGODF import makeGODF
+from .makeGSDF import makeGSDF
 from .makeLODF import makeLODF
 from .makePTDF import makePTDF
 from .makeSbus import makeSbus
@@ -64,6 +81,7 @@ from .makeYbus import makeYbus
 from .modcost import modcost
 from .mosek_options import mosek_options
 from .newtonpf import newtonpf
+from .newtonpf_batch import newtonpf_batch
 from .opf_args import opf_args
 from .opf_consfcn import opf_consfcn
 from .opf_costfcn import opf_costfcn
@@ -72,6 +90,7 @@ from .opf_hessfcn import opf_hessfcn
 from .opf_model import opf_model
 from .opf import opf
 from .opf_setup import opf_setup
+from .pflinsolver import pflinsolver
 from .pfsoln import pfsoln
 from .pipsopf_solver import pipsopf_solver
 from .pips import pips
@@ -81,6 +100,7 @@ from .polycost import polycost
 from .ppoption import ppoption
 from .ppver import ppver
 from .pqcost import pqcost
+from .ptdf_solver import PTDFSolver
 from .printpf import printpf
 from .qps_cplex import qps_cplex
 from .qps_ipopt import qps_ipopt
@@ -88,12 +108,15 @@ from .qps_mosek import qps_mosek
 from .qps_pips import qps_pips
 from .qps_pypower import qps_pypower
 from .remove_userfcn import remove_userfcn
+from .runcontingency import runcontingency
 from .rundcopf import rundcopf
 from .rundcpf import rundcpf
 from .runduopf import runduopf
 from .runopf import runopf
 from .runopf_w_res import runopf_w_res
 from .runpf import runpf
+from .runpf_batch import runpf_batch
+from .run_timeseries import run_timeseries
 from .runuopf import runuopf
 from .run_userfcn import run_userfcn
 from .savecase import savecase
@@ -101,10 +124,12 @@ from .scale_load import scale_load
 from .set_reorder import set_reorder
 from .toggle_iflims import toggle_iflims
 from .toggle_reserves import toggle_reserves
+from .topology_key import topology_key
 from .total_load import total_load
 from .totcost import totcost
 from .uopf import uopf
 from .update_mupq import update_mupq
+from .voltage_sensitivity import VoltageSensitivity
 
 from .t.test_pypower import test_pypower
 from .t.t_case30_userfcns import t_case30_userfcns
@@ -0,0 +1,210 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""First contingency incremental transfer capabilities of transfer paths.
+"""
+
+from numpy import array, zeros, ones, arange, unique, in1d, bincount, \
+    sign, inf, isnan, errstate, c_, flatnonzero as find
+
+from pypower.dc_contingency_screen import _base_case
+from pypower.ptdf_solver import BLOCK_ENTRIES
+from pypower.isload import isload
+
+from pypower.idx_bus import PD, BUS_AREA
+from pypower.idx_gen import GEN_BUS, PG
+from pypower.idx_brch import RATE_A
+from pypower.idx_area import AREA_I
+
+## columns of the transfer capability table
+FCITC   = 0     ## first contingency incremental transfer capability (MW)
+ELEM    = 1     ## limiting branch (row index), -1 if none
+CONT    = 2     ## index of the limiting contingency, -1 for the base case
+TDF     = 3     ## transfer distribution factor of the limiting branch
+FLOW    = 4     ## pre-transfer real power flow of the limiting branch (MW)
+LIMIT   = 5     ## rating of the limiting branch (MVA)
+
+
+def atc(casedata=None, paths=None, ppopt=None, contingencies=None,
+        areas=False, rate=RATE_A, cont_rate=None, tol=1e-5, block_size=None):
+    """First contingency incremental transfer capabilities of transfer
+    paths.
+
+    Solves the base case DC power flow and computes, for each transfer
+    path in C{paths}, the largest additional real power transfer from its
+    source to its sink for which no branch flow exceeds its rating, in the
+    base case and after the outage of any branch in C{contingencies}, a
+    list of branch row indices, all in-service branches by default. Each
+    path is a tuple C{(source, sink)} of bus numbers or, if C{areas} is
+    true, of area numbers (column C{BUS_AREA} of the bus matrix, which
+    must be listed in the C{areas} matrix of the case if it has one),
+    given as a single number or a list. By default the paths are all
+    ordered pairs of distinct areas. The transfer is injected at the
+    source buses in proportion to their generation and withdrawn at the
+    sink buses in proportion to their load, evenly if there is none.
+
+    The DC model is linear, so no scaled power flows are needed: with
+    the transfer distribution factors C{T}, the flows per MW of transfer,
+    of all paths from one solve per path with the factors of the B matrix
+    (see L{PTDFSolver}), and the LODF columns of the contingencies (see
+    L{LODFSolver}), the post-contingency flows and distribution factors
+    are::
+        F_k = F0 + L[:, k] * F0[k]
+        T_k = T + L[:, k] * T[k, :]
+    and the capability of a path is the smallest transfer which takes a
+    branch to its rating in the direction of its distribution factor::
+        (sign(T_k) * rating - F_k) / T_k
+    over all monitored branches and contingencies, computed for all paths
+    at once for a block of C{block_size} contingencies at a time. The
+    default block size bounds a block to about C{BLOCK_ENTRIES} entries.
+    Distribution factors smaller than C{tol} in absolute value are
+    ignored.
+
+    The ratings are taken from column C{rate} of the branch matrix for the
+    base case and C{cont_rate}, by default the same, after contingencies.
+    Branches with a zero C{rate} are not monitored, a zero C{cont_rate}
+    falls back to C{rate}.
+
+    Returns a table with one row per path and the columns C{FCITC},
+    C{ELEM}, C{CONT}, C{TDF}, C{FLOW} and C{LIMIT} defined in this module,
+    the C{FCITC} being C{inf} for paths without limiting branch and
+    negative if a limit is already violated, the list of paths, and a
+    boolean vector which is true for the contingencies which split the
+    network into islands, which are not considered. The available transfer
+    capability follows by subtracting margins and existing commitments.
+
+    Example::
+        tc, paths, islanding = atc('case118', areas=True, rate=RATE_A,
+                                   cont_rate=RATE_B)
+        worst = tc[:, FCITC].argmin()
+
+    @see: L{dc_contingency_screen}, L{PTDFSolver}, L{LODFSolver}
+    """
+    data = _base_case(casedata, contingencies, ppopt, rate)
+    if data is None:
+        return zeros((0, 6)), [], zeros(0, bool)
+    F0, lim, rating, outages, lodf = \
+        data['F0'], data['lim'], data['rating'], data['outages'], data['lodf']
+    ppc = data['ppc']
+    bus, gen, branch = ppc['bus'], ppc['gen'], ppc['branch']
+    nb, nc = bus.shape[0], len(outages)
+
+    if cont_rate is None:
+        cont_rate = rate
+    cont_rating = branch[lim, cont_rate]
+    cont_rating[cont_rating <= 0] = rating[cont_rating <= 0]
+
+    ## source and sink buses of each path
+    paths, numbers, known = _paths(ppc, paths, areas)
+    npaths = len(paths)
+
+    ## transfer of 1 MW from the source to the sink of each path
+    on = ~isload(gen)
+    pg = bincount(gen[on, GEN_BUS].astype(int), gen[on, PG], minlength=nb)
+    pd = bus[:, PD]
+    W = zeros((nb, npaths))
+    for p, (source, sink) in enumerate(paths):
+        W[:, p] += _shares(pg, _buses(numbers, source, 'source', known))
+        W[:, p] -= _shares(pd, _buses(numbers, sink, 'sink', known))
+    T = lodf.H.flows(W)         ## transfer distribution factors, nl x npaths
+
+    ## base case
+    tc = zeros((npaths, 6))
+    tc[:, FCITC] = inf
+    tc[:, ELEM:CONT + 1] = -1
+    _transfer_limits(tc, F0[lim].reshape(-1, 1), T[lim, None, :], rating,
+                     array([-1]), tol)
+
+    ## contingencies, in blocks
+    if block_size is None:
+        block_size = max(BLOCK_ENTRIES // max(len(lim) * npaths, 1), 1)
+    islanding = zeros(nc, bool)
+    for start in range(0, nc, block_size):
+        j = arange(start, min(start + block_size, nc))
+        j = j[outages[j] >= 0]
+        if len(j) == 0:
+            continue
+        o = outages[j]
+        L = lodf.columns(o)
+        split = isnan(L[o, arange(len(o))])
+        islanding[j[split]] = True
+        j, o, L = j[~split], o[~split], L[lim][:, ~split]
+
+        Fk = F0[lim].reshape(-1, 1) + L * F0[o]
+        Tk = T[lim, None, :] + L[:, :, None] * T[None, o, :]
+        _transfer_limits(tc, Fk, Tk, cont_rating, j, tol)
+
+    ## external branch indices
+    e = tc[:, ELEM] >= 0
+    tc[e, ELEM] = data['br_i2e'][lim[tc[e, ELEM].astype(int)]]
+
+    return tc, paths, islanding
+
+
+def _transfer_limits(tc, F, T, rating, conts, tol):
+    """Updates the table C{tc} with the transfer limits of a set of cases.
+
+    C{F} are the pre-transfer flows of the monitored branches (rows) in
+    the cases C{conts} (columns), C{T} the distribution factors of the
+    paths (third dimension) and C{rating} the ratings of the branches.
+    """
+    m, nk, npaths = T.shape
+    with errstate(divide='ignore', invalid='ignore'):
+        X = (sign(T) * rating.reshape(-1, 1, 1) - F[:, :, None]) / T
+    X[abs(T) < tol] = inf
+
+    ## smallest transfer over all cases and branches, the first case and
+    ## branch on ties, as for smaller blocks
+    X = X.transpose(1, 0, 2).reshape(nk * m, npaths)
+    i = X.argmin(axis=0)
+    p = arange(npaths)
+    x = X[i, p]
+    better = x < tc[:, FCITC]
+    k, l = i // m, i % m
+    l, k, p = l[better], k[better], p[better]
+    tc[better] = c_[x[better], l, conts[k], T[l, k, p], F[l, k], rating[l]]
+
+
+def _paths(ppc, paths, areas):
+    """Transfer paths, by default all ordered pairs of distinct areas if
+    C{areas} is true, with the area or external bus number of each bus
+    and the known area or bus numbers, for L{_buses}.
+    """
+    if areas:
+        if 'areas' in ppc['order']['ext']:
+            known = ppc['order']['ext']['areas'][:, AREA_I]
+        else:
+            known = unique(ppc['bus'][:, BUS_AREA])
+        if paths is None:
+            paths = [(a, b) for a in known for b in known if a != b]
+        numbers = ppc['bus'][:, BUS_AREA]
+    else:
+        if paths is None:
+            raise ValueError('atc: the paths must be given for bus numbers')
+        numbers = known = ppc['order']['bus']['i2e']
+
+    return list(paths), numbers, known
+
+
+def _buses(numbers, s, name, known):
+    """Internal indices of the buses with C{numbers} in the set C{s}.
+    """
+    s = array(s).flatten()
+    if not all(in1d(s, known)):
+        raise ValueError('atc: unknown %s %s' % (name, s[~in1d(s, known)]))
+    b = find(in1d(numbers, s))
+    if len(b) == 0:
+        raise ValueError('atc: %s %s has no buses' % (name, s))
+    return b
+
+
+def _shares(x, b):
+    """Shares of the buses C{b} of a unit injection, in proportion to
+    C{x}, evenly if C{x} is not positive at any of them.
+    """
+    w = zeros(len(x))
+    w[b] = x[b].clip(0)
+    if sum(w) <= 0:
+        w[b] = ones(len(b))
+    return w / sum(w)
@@ -0,0 +1,258 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Solves the power flow of a radial network using a backward/forward sweep.
+"""
+
+import sys
+
+from numpy import linalg, conj, r_, Inf, zeros, ones, arange, asarray, add, \
+    array
+
+from scipy.sparse import csr_matrix, csc_matrix, identity
+from scipy.sparse.csgraph import breadth_first_order
+from scipy.sparse.linalg import splu
+
+from pypower.ppoption import ppoption
+
+from pypower.idx_brch import F_BUS, T_BUS
+
+
+def bfswpf(Ybus, Yf, Yt, branch, Sbus, V0, ref, pv, pq, ppopt=None):
+    """Solves the power flow of a radial network using a backward/forward
+    sweep.
+
+    Solves for bus voltages given the full system admittance matrix (for
+    all buses), the branch admittance matrices C{Yf} and C{Yt} (see
+    L{makeYbus}), the branch matrix, the complex bus power injection
+    vector (for all buses), the initial vector of complex bus voltages,
+    and column vectors with the lists of bus indices for the swing bus,
+    PV buses, and PQ buses, respectively. The bus voltage vector contains
+    the set point for generator (including ref bus) buses, and the
+    reference angle of the swing bus, as well as an initial guess for
+    remaining magnitudes and angles. C{ppopt} is a PYPOWER options vector
+    which can be used to set the termination tolerance, maximum number of
+    iterations, and output options (see L{ppoption} for details). Uses
+    default options if this parameter is not given. Returns the final
+    complex voltages, a flag which indicates whether it converged or not,
+    and the number of iterations performed.
+
+    The network has to be radial, i.e. a tree rooted at a single swing
+    bus, otherwise a C{ValueError} is raised. Each iteration computes the
+    currents drawn by the loads and shunts at the present voltages, sums
+    them up from the leaves to the swing bus through the two-port
+    equations of the branches (backward sweep) and updates the voltages
+    from the swing bus to the leaves (forward sweep). The method does not
+    depend on the R/X ratio of the branches, unlike the fast-decoupled
+    methods.
+
+    The breadth first search order of the buses from the swing bus is
+    computed once per call. In that order both sweeps are triangular
+    systems of equations, whose matrices are factored once without
+    fill-in, so each sweep is a single sparse triangular solve instead of
+    a loop over the layers of the tree.
+
+    The voltage magnitudes of PV buses are kept at their set points by
+    adjusting their reactive injections after each sweep (PV node
+    compensation). The sensitivities of their voltage magnitudes to these
+    injections are approximated by the reactance matrix of the paths from
+    the swing bus to the PV buses, divided by the voltage magnitudes.
+
+    @see: L{runpf}
+    """
+    ## default arguments
+    if ppopt is None:
+        ppopt = ppoption()
+
+    ## options
+    tol     = ppopt['PF_TOL']
+    max_it  = ppopt['PF_MAX_IT_BFSW']
+    verbose = ppopt['VERBOSE']
+
+    ## initialize
+    converged = 0
+    i = 0
+    V = V0.copy()
+    Sbus = Sbus.copy()      ## reactive injections at PV buses are updated
+    ref = array(ref, int).flatten()
+    npv = len(pv)
+    pvpq = r_[pv, pq]
+    Vset = abs(V0[pv])
+
+    ## tree and factored sweeps
+    order, backward, forward, Ycc, z, parent, pbr = \
+        _sweeps(Ybus, Yf, Yt, branch, ref)
+    c = order[1:]           ## all buses but the swing bus
+
+    ## bus shunt admittances, the diagonal of Ybus without the branches
+    f = branch[:, F_BUS].astype(int)
+    t = branch[:, T_BUS].astype(int)
+    nl = len(f)
+    Ysh = asarray(Ybus.diagonal()).flatten()
+    add.at(Ysh, f, -asarray(Yf[arange(nl), f]).flatten())
+    add.at(Ysh, t, -asarray(Yt[arange(nl), t]).flatten())
+
+    ## PV node compensation, reactance matrix of the paths to the PV buses
+    if npv:
+        X = _path_reactance(z, parent, pbr, ref[0], pv)
+
+    ## evaluate F(x0)
+    mis = V * conj(Ybus * V) - Sbus
+    F = r_[  mis[pvpq].real,
+             mis[pq].imag,
+             abs(V[pv]) - Vset  ]
+
+    ## check tolerance
+    normF = linalg.norm(F, Inf)
+    if verbose > 1:
+        sys.stdout.write('\n it    max P & Q mismatch (p.u.)')
+        sys.stdout.write('\n----  ---------------------------')
+        sys.stdout.write('\n%3d        %10.3e' % (i, normF))
+    if normF < tol:
+        converged = 1
+        if verbose > 1:
+            sys.stdout.write('\nConverged!\n')
+
+    ## do backward/forward sweeps
+    while (not converged and i < max_it):
+        ## update iteration counter
+        i = i + 1
+
+        ## backward sweep, the currents drawn by the loads and shunts are
+        ## summed up to the current into each bus from its parent
+        J = backward(-conj(Sbus / V) + Ysh * V, V)
+
+        ## forward sweep
+        rhs = V.copy()
+        rhs[c] = -J[c] / Ycc[pbr[c]]
+        V = forward(rhs)
+
+        ## adjust the reactive injections at PV buses
+        if npv:
+            Vm = abs(V[pv])
+            Sbus[pv] = Sbus[pv] + 1j * linalg.solve(X, Vm * (Vset - Vm))
+
+        ## evalute F(x)
+        mis = V * conj(Ybus * V) - Sbus
+        F = r_[  mis[pvpq].real,
+                 mis[pq].imag,
+                 abs(V[pv]) - Vset  ]
+
+        ## check for convergence
+        normF = linalg.norm(F, Inf)
+        if verbose > 1:
+            sys.stdout.write('\n%3d        %10.3e' % (i, normF))
+        if normF < tol:
+            converged = 1
+            if verbose:
+                sys.stdout.write('\nBackward/forward sweep power flow '
+                                 'converged in %d iterations.\n' % i)
+
+    if verbose:
+        if not converged:
+            sys.stdout.write('Backward/forward sweep power flow did not '
+                             'converge in %d iterations.' % i)
+
+    return V, converged, i
+
+
+def _sweeps(Ybus, Yf, Yt, branch, ref):
+    """Backward and forward sweeps of a radial network.
+
+    Orients the branches from the swing bus to the leaves, with the
+    two-port equations::
+        Ip = Ypp * Vp + Ypc * Vc
+        Ic = Ycp * Vp + Ycc * Vc
+    for the currents into a branch at its parent end p and its child end
+    c. With C{J[c]} the current into bus c from its parent, i.e.
+    C{Ic = -J[c]}, the current at the parent end is
+    C{Ip = -(Ypp / Ycp) * J[c] + (Ypc - Ypp * Ycc / Ycp) * Vc} and the
+    voltage at the child end is C{Vc = -(J[c] + Ycp * Vp) / Ycc}.
+
+    Returns the breadth first search order of the buses, the functions
+    C{backward(Id, V)}, which returns C{J} for the currents C{Id} drawn at
+    the buses and the voltages C{V}, and C{forward(rhs)}, which returns the
+    voltages for C{rhs = -J / Ycc} (the voltage of the swing bus for the
+    swing bus), C{Ycc} and the series impedances of the branches, and the
+    parent and the branch to the parent of each bus.
+    """
+    nb = Ybus.shape[0]
+    f = branch[:, F_BUS].astype(int)
+    t = branch[:, T_BUS].astype(int)
+    nl = len(f)
+    if len(ref) != 1 or nl != nb - 1:
+        raise ValueError('bfswpf: network is not radial with a single '
+                         'swing bus')
+
+    C = csr_matrix((ones(nl), (f, t)), (nb, nb))
+    order, pred = breadth_first_order(C, ref[0], directed=False,
+                                      return_predecessors=True)
+    if len(order) != nb:
+        raise ValueError('bfswpf: network is not connected')
+    pos = zeros(nb, int)
+    pos[order] = arange(nb)
+
+    ## branch to the parent of each bus, and its orientation
+    rev = pred[t] != f              ## branches from child to parent
+    child = t.copy()
+    child[rev] = f[rev]
+    parent = pred[child]
+    pbr = zeros(nb, int)
+    pbr[child] = arange(nl)
+
+    ## two-port admittances, parent end first
+    Yff = asarray(Yf[arange(nl), f]).flatten()
+    Yft = asarray(Yf[arange(nl), t]).flatten()
+    Ytf = asarray(Yt[arange(nl), f]).flatten()
+    Ytt = asarray(Yt[arange(nl), t]).flatten()
+    Ypp, Ypc, Ycp, Ycc = Yff.copy(), Yft.copy(), Ytf.copy(), Ytt.copy()
+    Ypp[rev], Ypc[rev] = Ytt[rev], Ytf[rev]
+    Ycp[rev], Ycc[rev] = Yft[rev], Yff[rev]
+
+    ## backward sweep, (I - A) * J = Id + W * V, with A upper triangular in
+    ## breadth first order
+    I = identity(nb, format='csc')
+    A = csc_matrix((-Ypp / Ycp, (pos[parent], pos[child])), (nb, nb))
+    W = csr_matrix((Ypc - Ypp * Ycc / Ycp, (parent, child)), (nb, nb))
+    lu_b = splu(I - A, permc_spec='NATURAL', diag_pivot_thresh=0.0)
+
+    ## forward sweep, (I - B) * V = rhs, with B lower triangular in breadth
+    ## first order
+    B = csc_matrix((-Ycp / Ycc, (pos[child], pos[parent])), (nb, nb))
+    lu_f = splu(I - B, permc_spec='NATURAL', diag_pivot_thresh=0.0)
+
+    def backward(Id, V):
+        return lu_b.solve((Id + W * V)[order])[pos]
+
+    def forward(rhs):
+        return lu_f.solve(rhs[order])[pos]
+
+    parents = pred.copy()
+    parents[ref] = ref
+
+    return order, backward, forward, Ycc, -1 / Ycp, parents, pbr
+
+
+def _path_reactance(z, parent, pbr, ref, buses):
+    """Reactance matrix of the paths from the swing bus to C{buses}.
+
+    Element C{(i, j)} is the sum of the series reactances of the branches
+    common to the paths from the swing bus to C{buses[i]} and C{buses[j]},
+    with C{z} the series impedances of the branches.
+    """
+    paths = []
+    for k in buses:
+        path = []
+        while k != ref:
+            path.append(pbr[k])
+            k = parent[k]
+        paths.append(set(path))
+
+    n = len(buses)
+    X = zeros((n, n))
+    for i in range(n):
+        for j in range(i, n):
+            X[i, j] = X[j, i] = z[list(paths[i] & paths[j])].imag.sum()
+
+    return X
@@ -0,0 +1,98 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Fill-reducing ordering of the buses of a case.
+"""
+
+from numpy import ones, arange, argsort, empty, r_, bincount, array, \
+    concatenate
+
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+from scipy.sparse.linalg import splu
+
+from pypower.lrucache import LRUCache
+from pypower.topology_key import topology_key
+
+from pypower.idx_brch import F_BUS, T_BUS
+
+#: bus orderings of previous cases, keyed by L{topology_key} and method
+ordering_cache = LRUCache(16)
+
+
+def bus_ordering(ppc, method=2):
+    """Computes a fill-reducing ordering of the buses of a case.
+
+    Computes an ordering of the buses of a case in internal indexing (see
+    L{ext2int}) from the graph of its admittance matrix, i.e. the buses
+    and the in-service branches, and stores it as C{ppc['order']['bus']
+    ['perm']}. C{perm[k]} is the internal index of the bus eliminated
+    k-th, so factoring the matrices of the power flow in this order keeps
+    the fill-in of the factors low. C{method} selects the ordering:
+        1. reverse Cuthill-McKee, which minimizes the bandwidth
+        2. minimum degree on the structure of the admittance matrix, as
+           computed by SuperLU (C{MMD_AT_PLUS_A})
+
+    The ordering only depends on the topology, so it is kept in the
+    module-level L{LRUCache} C{ordering_cache}, keyed by the
+    L{topology_key} of the case, and reused for later cases with the same
+    topology. Returns the updated case.
+
+    Example::
+        ppc = bus_ordering(ext2int(loadcase('case300')))
+        Ybus[ix_(perm, perm)]   ## with perm = ppc['order']['bus']['perm']
+
+    @see: L{order_unknowns}, L{newtonpf}, L{FDPFSolver}
+    """
+    if method not in (1, 2):
+        raise ValueError('bus_ordering: unknown ordering method %d' % method)
+
+    key = (topology_key(ppc), method)
+    perm = ordering_cache.get(key)
+    if perm is None:
+        bus, branch = ppc['bus'], ppc['branch']
+        nb = bus.shape[0]
+        f = branch[:, F_BUS].astype(int)
+        t = branch[:, T_BUS].astype(int)
+
+        ## structure of the admittance matrix, with values of a diagonally
+        ## dominant matrix, so that it can be factored without pivoting
+        deg = bincount(r_[f, t], minlength=nb)
+        A = csr_matrix((r_[-ones(2 * len(f)), deg + 1.0],
+                        (r_[f, t, arange(nb)], r_[t, f, arange(nb)])),
+                       (nb, nb))
+
+        if method == 1:
+            perm = reverse_cuthill_mckee(A, symmetric_mode=True)
+        else:
+            lu = splu(A.tocsc(), permc_spec='MMD_AT_PLUS_A',
+                      diag_pivot_thresh=0.0,
+                      options=dict(SymmetricMode=True))
+            perm = argsort(lu.perm_c)
+        perm = perm.astype(int)
+        ordering_cache.put(key, perm)
+
+    ppc['order']['bus']['perm'] = perm.copy()
+
+    return ppc
+
+
+def order_unknowns(perm, *buses):
+    """Ordering of the unknowns of a system of equations for a bus ordering.
+
+    The unknowns of the power flow equations are given in blocks, e.g. the
+    voltage angles of the PV and PQ buses followed by the voltage
+    magnitudes of the PQ buses, with C{buses} holding the bus index of each
+    unknown of each block, e.g. C{(pv, pq, pq)}. Returns the permutation of
+    the unknowns, over all blocks, which orders them as their buses in the
+    bus ordering C{perm} (see L{bus_ordering}), the unknowns of the same
+    bus in the order of their blocks.
+    """
+    rank = empty(len(perm), int)
+    rank[perm] = arange(len(perm))
+    nblocks = len(buses)
+    keys = concatenate([rank[array(b, int)] * nblocks + k
+                        for k, b in enumerate(buses)])
+
+    return argsort(keys, kind='mergesort')
@@ -0,0 +1,171 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Screens single branch outages with line outage distribution factors.
+"""
+
+from sys import stderr
+
+from os.path import dirname, join
+
+from numpy import array, zeros, ones, arange, argpartition, argsort, \
+    isnan, c_, vstack, flatnonzero as find
+
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.rundcpf import rundcpf
+from pypower.ext2int import ext2int
+from pypower.makeBdc import makeBdc
+from pypower.ptdf_solver import PTDFSolver, BLOCK_ENTRIES
+from pypower.lodf_solver import LODFSolver
+
+from pypower.idx_bus import BUS_TYPE, REF
+from pypower.idx_brch import PF, RATE_A, BR_STATUS
+
+## columns of the violations table
+CONT    = 0     ## index of the contingency in the list of contingencies
+ELEM    = 1     ## overloaded branch (row index)
+FLOW    = 2     ## post-contingency real power flow at the from end (MW)
+LIMIT   = 3     ## branch rating (MVA)
+LOADING = 4     ## absolute flow divided by the rating
+
+
+def dc_contingency_screen(casedata=None, contingencies=None, ppopt=None,
+                          rate=RATE_A, k=5, threshold=1.0, block_size=None):
+    """Screens single branch outages with line outage distribution factors.
+
+    Solves the base case DC power flow and computes the post-contingency
+    DC branch flows of the outage of each branch in C{contingencies}, a
+    list of branch row indices, all in-service branches by default. The
+    flows are the base case flows plus the LODF columns of the outages
+    (see L{LODFSolver}) scaled by the base case flows of the outaged
+    branches, computed for a block of C{block_size} contingencies at a
+    time as one matrix operation. The default block size bounds a block
+    to about C{BLOCK_ENTRIES} entries. The PTDF matrix is never formed.
+
+    The flows are compared against the ratings in column C{rate} of the
+    branch matrix, one of C{RATE_A}, C{RATE_B} or C{RATE_C}. Ratings of
+    zero are treated as unlimited. For each contingency only the C{k}
+    branches with the highest loading above C{threshold} are reported,
+    in decreasing order of loading.
+
+    Returns a table of violations with one row per violation and the
+    columns C{CONT}, C{ELEM}, C{FLOW}, C{LIMIT} and C{LOADING} defined in
+    this module, and a boolean vector which is true for the contingencies
+    which split the network into islands. Those have no DC solution and
+    no rows in the table, and should be checked with L{runcontingency}
+    like the contingencies which fail the screen. Outages of branches
+    which are already out of service leave the base case unchanged.
+
+    Example::
+        viol, islanding = dc_contingency_screen('case118', rate=RATE_B)
+        conts = unique(viol[:, CONT].astype(int))
+
+    @see: L{runcontingency}, L{LODFSolver}
+    """
+    data = _base_case(casedata, contingencies, ppopt, rate)
+    if data is None:
+        return zeros((0, 5)), zeros(0, bool)
+    F0, lim, rating, outages, lodf = \
+        data['F0'], data['lim'], data['rating'], data['outages'], data['lodf']
+    nl, nc = len(F0), len(outages)
+    k = min(k, len(lim))
+
+    if block_size is None:
+        block_size = max(BLOCK_ENTRIES // max(nl, 1), 1)
+
+    viol = []
+    islanding = zeros(nc, bool)
+    for start in range(0, nc, block_size):
+        j = arange(start, min(start + block_size, nc))
+
+        ## post-contingency flows of the monitored branches
+        F = zeros((len(lim), len(j))) + F0[lim].reshape(-1, 1)
+        on = find(outages[j] >= 0)
+        if len(on):
+            o = outages[j[on]]
+            L = lodf.columns(o)
+            F[:, on] += L[lim, :] * F0[o]
+            islanding[j[on]] = isnan(L[o, arange(len(on))])
+
+        loading = abs(F) / rating.reshape(-1, 1)
+        loading[:, islanding[j]] = 0
+        top, cols = _worst_branches(loading, k, threshold)
+        viol.append(c_[j[cols], data['br_i2e'][lim[top]], F[top, cols],
+                       rating[top], loading[top, cols]])
+
+    viol = vstack(viol) if len(viol) else zeros((0, 5))
+
+    return viol, islanding
+
+
+def _base_case(casedata, contingencies, ppopt, rate):
+    """Solves the base case DC power flow for a screen of branch outages.
+
+    Returns a dict with the base case flows C{F0} in internal indexing,
+    the indices C{lim} and ratings C{rating} of the branches with flow
+    limits, the internal index of each outage in C{outages}, -1 for
+    branches out of service, the external index of each internal branch
+    in C{br_i2e}, an L{LODFSolver} for the network and the case in
+    internal indexing C{ppc}, or C{None} if the power flow does not
+    converge.
+    """
+    ## default arguments
+    if casedata is None:
+        casedata = join(dirname(__file__), 'case9')
+    ppopt = ppoption(ppopt)
+
+    ## base case
+    ppc = loadcase(casedata)
+    results, success = rundcpf(ppc, ppoption(ppopt, VERBOSE=0, OUT_ALL=0))
+    if not success:
+        stderr.write('dc_contingency_screen: base case power flow did not '
+                     'converge\n')
+        return None
+
+    if contingencies is None:
+        contingencies = find(ppc['branch'][:, BR_STATUS] > 0)
+    contingencies = array(contingencies, int).flatten()
+
+    ## convert to internal indexing, with the base case solution
+    ppc = ext2int(results)
+    baseMVA, bus, branch = ppc['baseMVA'], ppc['bus'], ppc['branch']
+
+    ## internal index of each outaged branch, -1 if out of service
+    br_on = ppc['order']['branch']['status']['on']
+    br_e2i = -ones(ppc['order']['ext']['branch'].shape[0], int)
+    br_e2i[br_on] = arange(branch.shape[0])
+
+    lim = find(branch[:, rate] > 0)         ## branches with flow limits
+
+    Bbus, Bf, _, _ = makeBdc(baseMVA, bus, branch)
+    slack = find(bus[:, BUS_TYPE] == REF)[0]
+
+    return {
+        'F0':       branch[:, PF],
+        'lim':      lim,
+        'rating':   branch[lim, rate],
+        'outages':  br_e2i[contingencies],
+        'br_i2e':   br_on,
+        'lodf':     LODFSolver(branch, PTDFSolver(Bbus, Bf, slack),
+                               cache_size=0),
+        'ppc':      ppc,
+    }
+
+
+def _worst_branches(loading, k, threshold):
+    """The C{k} highest loadings above C{threshold} of each column.
+
+    Returns the row and column indices of the selected entries of
+    C{loading}, column by column in decreasing order of loading.
+    """
+    if k == 0:
+        return zeros(0, int), zeros(0, int)
+    top = argpartition(-loading, k - 1, axis=0)[:k, :]
+    cols = arange(loading.shape[1])
+    top = top[argsort(-loading[top, cols], axis=0), cols].T
+    cols = cols.reshape(-1, 1).repeat(k, axis=1)
+    sel = loading[top, cols] > threshold
+
+    return top[sel], cols[sel]
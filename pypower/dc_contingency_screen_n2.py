@@ -0,0 +1,214 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Screens double branch outages with line outage distribution factors.
+"""
+
+from multiprocessing import Pool, cpu_count
+
+from numpy import zeros, ones, arange, maximum, minimum, isnan, triu, \
+    array_split, c_, vstack, flatnonzero as find
+
+from scipy.sparse import csr_matrix as sparse
+from scipy.sparse.csgraph import dijkstra
+
+from pypower.dc_contingency_screen import _base_case, _worst_branches
+
+from pypower.idx_brch import RATE_A
+
+## columns of the violations table
+CONT1   = 0     ## index of the first outage in the list of contingencies
+CONT2   = 1     ## index of the second outage in the list of contingencies
+ELEM    = 2     ## overloaded branch (row index)
+FLOW    = 3     ## post-contingency real power flow at the from end (MW)
+LIMIT   = 4     ## branch rating (MVA)
+LOADING = 5     ## absolute flow divided by the rating
+
+#: default bound on the memory used for the flows of a chunk of pairs
+#: (bytes)
+MAX_MEMORY = 2**28
+
+
+def dc_contingency_screen_n2(casedata=None, contingencies=None, ppopt=None,
+                             rate=RATE_A, k=5, threshold=1.0,
+                             lodf_threshold=None, distance=None,
+                             max_memory=MAX_MEMORY, workers=1):
+    """Screens double branch outages with line outage distribution factors.
+
+    Solves the base case DC power flow and computes the post-contingency
+    DC branch flows of the simultaneous outage of each pair of branches of
+    C{contingencies}, a list of branch row indices, all in-service
+    branches by default. The flows follow from the single outage LODFs
+    of the two branches (see L{LODFSolver}) with the compensated double
+    outage formula: with C{L} the LODF matrix and C{F0} the base case
+    flows, the flows of the outage of branches C{m} and C{n} are::
+        F = F0 + L[:, m] * Fm + L[:, n] * Fn
+    where C{Fm} and C{Fn} solve::
+        Fm - L[m, n] * Fn = F0[m]
+        Fn - L[n, m] * Fm = F0[n]
+    The LODF columns of the contingencies are computed once, and the pairs
+    are screened in chunks whose flow matrices take at most about
+    C{max_memory} bytes, spread over C{workers} processes of a
+    C{multiprocessing} pool if C{workers} is greater than 1. The LODFs and
+    flows are passed to each process once, when it starts, and the chunks
+    only consist of the indices of their pairs.
+
+    Pairs can be pruned before the screen. With C{lodf_threshold}, only
+    pairs with an LODF of either branch for the outage of the other of at
+    least this value in absolute terms are kept, which excludes the pairs
+    with an outage which splits the network on its own. With C{distance},
+    only pairs with terminal buses at an electrical distance, the sum of
+    the branch reactances along the shortest path, of at most this value
+    (p.u.) are kept. The outage of a pair which fails these criteria is
+    close to the superposition of the single outages.
+
+    The flows are compared against the ratings in column C{rate} of the
+    branch matrix. For each pair only the C{k} branches with the highest
+    loading above C{threshold} are reported, in decreasing order.
+
+    Returns a table of violations with one row per violation and the
+    columns C{CONT1}, C{CONT2}, C{ELEM}, C{FLOW}, C{LIMIT} and C{LOADING}
+    defined in this module, a C{p x 2} matrix of the pairs of indices of
+    C{contingencies} whose outage splits the network into islands, which
+    have no rows in the table, and the number of pairs left after pruning.
+    Pairs with a branch which is already out of service are skipped.
+
+    Example::
+        viol, islanding, npairs = dc_contingency_screen_n2('case118',
+                                        lodf_threshold=0.05, workers=4)
+
+    @see: L{dc_contingency_screen}, L{LODFSolver}
+    """
+    data = _base_case(casedata, contingencies, ppopt, rate)
+    if data is None:
+        return zeros((0, 6)), zeros((0, 2), int), 0
+    F0, lim, outages = data['F0'], data['lim'], data['outages']
+
+    ## LODF columns of the in-service contingencies
+    c = find(outages >= 0)
+    o = outages[c]
+    L = data['lodf'].columns(o)
+    single = isnan(L[o, arange(len(o))])    ## islanding single outages
+
+    ## candidate pairs
+    keep = triu(ones((len(o), len(o)), bool), 1)
+    Lcc = abs(L[o, :])
+    if lodf_threshold is not None:
+        ## the LODFs of islanding single outages are not defined
+        keep &= (maximum(Lcc, Lcc.T) >= lodf_threshold) & \
+            ~(single.reshape(-1, 1) | single)
+    if distance is not None:
+        keep &= _distances(data['lodf'], o, distance) <= distance
+    i, j = keep.nonzero()
+    npairs = len(i)
+
+    ## pairs with an islanding single outage
+    split = single[i] | single[j]
+    islanding = [c_[c[i[split]], c[j[split]]]]
+    i, j = i[~split], j[~split]
+
+    pdata = {
+        'F0':       F0[lim],
+        'F0c':      F0[o],
+        'L':        L[lim, :],
+        'Lcc':      L[o, :],
+        'rating':   data['rating'],
+        'elem':     data['br_i2e'][lim],
+        'c':        c,
+        'k':        min(k, len(lim)),
+        'threshold': threshold,
+        'tol':      data['lodf'].tol,
+    }
+
+    ## screen the pairs, in chunks
+    size = max(int(max_memory // (8 * 3 * max(len(lim), 1))), 1)
+    chunks = array_split(arange(len(i)), max(-(-len(i) // size), 1))
+    if workers is None:
+        workers = cpu_count()
+    if workers > 1 and len(chunks) > 1:
+        pool = Pool(min(workers, len(chunks)), _init_worker, (pdata,))
+        try:
+            out = pool.map(_screen_chunk, [(i[ch], j[ch]) for ch in chunks])
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        out = [_screen_pairs(pdata, i[ch], j[ch]) for ch in chunks]
+
+    viol = [v for v, _ in out if len(v)]
+    viol = vstack(viol) if len(viol) else zeros((0, 6))
+    islanding = vstack(islanding + [s for _, s in out]).astype(int)
+
+    return viol, islanding, npairs
+
+
+## data of the screen in a worker process, set by _init_worker
+_worker_data = None
+
+
+def _init_worker(data):
+    """Keeps the data of the screen in a worker process.
+    """
+    global _worker_data
+    _worker_data = data
+
+
+def _screen_chunk(pairs):
+    """Screens a chunk of pairs in a worker process.
+    """
+    return _screen_pairs(_worker_data, *pairs)
+
+
+def _screen_pairs(data, i, j):
+    """Screens the double outages of the pairs C{(i[n], j[n])} of columns
+    of the LODF matrix.
+
+    Returns the rows of the violations table and the pairs of indices of
+    the contingencies which split the network.
+    """
+    F0, F0c, L, Lcc = data['F0'], data['F0c'], data['L'], data['Lcc']
+
+    ## compensated flows of the outaged branches
+    Lij, Lji = Lcc[i, j], Lcc[j, i]
+    det = 1 - Lij * Lji
+    split = abs(det) < data['tol']
+    det[split] = 1
+    Fi = (F0c[i] + Lij * F0c[j]) / det
+    Fj = (F0c[j] + Lji * F0c[i]) / det
+
+    ## post-contingency flows of the monitored branches
+    F = F0.reshape(-1, 1) + L[:, i] * Fi + L[:, j] * Fj
+    loading = abs(F) / data['rating'].reshape(-1, 1)
+    loading[:, split] = 0
+    top, cols = _worst_branches(loading, data['k'], data['threshold'])
+
+    c = data['c']
+    viol = c_[c[i[cols]], c[j[cols]], data['elem'][top], F[top, cols],
+              data['rating'][top], loading[top, cols]]
+
+    return viol, c_[c[i[split]], c[j[split]]]
+
+
+def _distances(lodf, o, limit):
+    """Electrical distances between the branches C{o}.
+
+    Returns the matrix of the smallest sums of branch reactances along a
+    path between a terminal bus of one branch and one of the other, for
+    distances up to C{limit}, C{inf} beyond.
+    """
+    Bf = lodf.H.Bf          ## rows b * (e_f - e_t)
+    nl, nb = Bf.shape
+    f, t = lodf.f, lodf.t
+
+    ## reactances of the connections, parallel branches combined
+    G = sparse((abs(Bf[arange(nl), f].A1), (f, t)), (nb, nb))
+    G.eliminate_zeros()
+    G.data = 1 / G.data
+
+    D = dijkstra(G, directed=False, indices=c_[f[o], t[o]].flatten(),
+                 limit=limit)           ## 2 * len(o) x nb
+    Df, Dt = D[0::2, :], D[1::2, :]
+
+    return minimum(minimum(Df[:, f[o]], Df[:, t[o]]),
+                   minimum(Dt[:, f[o]], Dt[:, t[o]]))
@@ -5,8 +5,7 @@
 """Solves a DC power flow.
 """
 
-from numpy import copy, r_, matrix
-from scipy.sparse.linalg import spsolve
+from pypower.dcpf_solver import DCPFSolver
 
 
 def dcpf(B, Pbus, Va0, ref, pv, pq):
@@ -18,18 +17,14 @@ def dcpf(B, Pbus, Va0, ref, pv, pq):
     the lists of bus indices for the swing bus, PV buses, and PQ buses,
     respectively. Returns a vector of bus voltage angles in radians.
 
-    @see: L{rundcpf}, L{runpf}
+    The reduced B matrix is factored on every call. Use a L{DCPFSolver}
+    to keep the factors for repeated power flows on the same network, or
+    to solve many injection scenarios at once.
+
+    @see: L{rundcpf}, L{runpf}, L{DCPFSolver}
 
     @author: Carlos E. Murillo-Sanchez (PSERC Cornell & Universidad
     Autonoma de Manizales)
     @author: Ray Zimmerman (PSERC Cornell)
     """
-    pvpq = matrix(r_[pv, pq])
-
-    ## initialize result vector
-    Va = copy(Va0)
-
-    ## update angles for non-reference buses
-    Va[pvpq] = spsolve(B[pvpq.T, pvpq], Pbus[pvpq] - B[pvpq.T, ref] * Va0[ref])
-
-    return Va
+    return DCPFSolver(B, ref, pv, pq).solve(Pbus, Va0)[0]
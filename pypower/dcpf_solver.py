@@ -0,0 +1,116 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""DC power flow solver with a cached factorization.
+"""
+
+from numpy import r_, ix_, sort, array, zeros, asarray
+
+from pypower.bus_ordering import order_unknowns
+from pypower.pflinsolver import LUSolver
+
+
+class DCPFSolver(object):
+    """DC power flow solver with a cached factorization.
+
+    Holds the full system C{B} matrix and optionally the branch matrix
+    C{Bf} and the phase shift injections C{Pfinj} of the branches, as
+    returned by L{makeBdc}, and the lists of bus indices for the swing
+    bus, PV buses, and PQ buses, together with the LU factors of the
+    reduced B matrix, which are computed by the first call to L{solve}.
+    Any number of DC power flows with different injections can then be
+    solved without factoring again.
+
+    The bus real power injections can be given as a vector or as a matrix
+    with one column per scenario, which are solved together in a single
+    forward and back substitution with the factors. The reduced B matrix
+    is factored by an L{LUSolver}, in the order of the fill-reducing bus
+    ordering C{perm} if one is given (see L{bus_ordering}), otherwise with
+    a COLAMD column ordering.
+
+    Example::
+        B, Bf, Pbusinj, Pfinj = makeBdc(baseMVA, bus, branch)
+        solver = DCPFSolver(B, ref, pv, pq, Bf, Pfinj)
+        Va, Pf = solver.solve(Pbus)     ## Pbus is nb x nscen
+
+    @see: L{dcpf}, L{makeBdc}
+    """
+
+    def __init__(self, B, ref, pv, pq, Bf=None, Pfinj=None, perm=None):
+        #: number of factorizations of the reduced B matrix performed
+        self.factorizations = 0
+        #: time spent in factorizations (seconds)
+        self.et_factor = 0.0
+        #: fill-in of the current factors
+        self.fill = 0
+        #: fill-reducing bus ordering, C{None} for none
+        self.perm = perm
+
+        self.B, self.Bf, self.Pfinj = B, Bf, Pfinj
+        self.ref = array(ref, int).flatten()
+        self.pvpq = sort(r_[array(pv, int).flatten(),
+                            array(pq, int).flatten()])
+        self._solver = None
+
+    def update(self, B=None, Bf=None, Pfinj=None):
+        """Changes the network.
+
+        Arguments which are C{None} are left unchanged. A new C{B} drops
+        the factors, which are recomputed by the next call to L{solve}.
+        """
+        if B is not None:
+            self.B = B
+            self._solver = None
+        if Bf is not None:
+            self.Bf = Bf
+        if Pfinj is not None:
+            self.Pfinj = Pfinj
+
+    def factor(self):
+        """Factors the reduced B matrix, unless factors are available.
+        """
+        if self._solver is None:
+            pvpq = self.pvpq
+            self._solver = LUSolver(None if self.perm is None else
+                                    order_unknowns(self.perm, pvpq))
+            self._solver.factor(self.B[ix_(pvpq, pvpq)])
+            self.factorizations += 1
+            self.et_factor += self._solver.et_factor
+            self.fill = self._solver.fill
+
+    def solve(self, Pbus, Va0=None):
+        """Solves the DC power flow for the bus real power injections
+        C{Pbus}.
+
+        C{Pbus} is a vector of length C{nb} or a C{nb x nscen} matrix with
+        the injections of one scenario per column. The voltage angles of
+        the reference buses (in radians) are taken from C{Va0}, a vector
+        or a matrix of the same shape as C{Pbus}, zero if it is not given.
+        Returns the bus voltage angles in radians and, if C{Bf} was given,
+        the real power flows at the from ends of the branches,
+        C{Bf * Va + Pfinj}, both with one column per scenario if C{Pbus}
+        is a matrix. The flows are C{None} if C{Bf} was not given.
+        """
+        self.factor()
+        B, ref, pvpq = self.B, self.ref, self.pvpq
+
+        Pbus = asarray(Pbus)
+        if Va0 is None:
+            Va = zeros(Pbus.shape)
+        else:
+            Va = array(Va0, float)
+            if Va.ndim < Pbus.ndim:
+                Va = Va.reshape(-1, 1).repeat(Pbus.shape[1], axis=1)
+
+        ## update angles for non-reference buses
+        Va[pvpq] = self._solver.solve(Pbus[pvpq] -
+                                      B[pvpq, :][:, ref] * Va[ref])
+
+        Pf = None
+        if self.Bf is not None:
+            Pf = self.Bf * Va
+            if self.Pfinj is not None:
+                Pf = (Pf.T + self.Pfinj).T
+
+        return Va, Pf
@@ -0,0 +1,255 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Fast decoupled power flow solver with cached factorizations.
+"""
+
+import sys
+
+from numpy import angle, exp, linalg, conj, r_, Inf, ix_, sort, array, \
+    array_equal
+
+from pypower.bus_ordering import order_unknowns
+from pypower.makeYbus import makeYbus
+from pypower.makeB import makeB
+from pypower.pflinsolver import LUSolver
+from pypower.ppoption import ppoption
+
+
+class FDPFSolver(object):
+    """Fast decoupled power flow solver with cached factorizations.
+
+    Holds the full system admittance matrix, the FDPF matrices B prime and
+    B double prime (see L{makeB}) and the lists of bus indices for the
+    swing bus, PV buses, and PQ buses, together with the LU factors of the
+    reduced B prime and B double prime matrices, which are computed by the
+    first call to L{solve}. Any number of power flows with different
+    injections and initial voltages can then be solved without factoring
+    again.
+
+    The network and the bus types can be changed with L{update}. The
+    factors are dropped only if they are affected by the change: the B
+    prime factors if B prime or the set of non-reference buses changes,
+    the B double prime factors if B double prime or the set of PQ buses
+    changes. In particular a conversion of PV to PQ buses only requires a
+    new factorization of B double prime. A new C{Ybus} which differs from
+    the current one, e.g. after a change of the topology, must come with
+    the B matrices of the new network, or with the case data to build all
+    three, so that the factors never belong to another network than the
+    mismatches.
+
+    The reduced B matrices are factored by L{LUSolver}s, in the order of
+    the fill-reducing bus ordering C{perm} if one is given (see
+    L{bus_ordering}), otherwise with a COLAMD column ordering. The time
+    spent factoring and the fill-in of the current factors are kept in
+    C{et_factor} and C{fill}.
+
+    Example::
+        solver = FDPFSolver(Ybus, Bp, Bpp, ref, pv, pq, ppopt)
+        for Sbus in scenarios:
+            V, success, iterations = solver.solve(Sbus, V0)
+
+    @see: L{fdpf}, L{makeB}
+    """
+
+    def __init__(self, Ybus, Bp, Bpp, ref, pv, pq, ppopt=None, perm=None):
+        if ppopt is None:
+            ppopt = ppoption()
+
+        #: PYPOWER options vector used by L{solve}
+        self.ppopt = ppopt
+        #: number of factorizations of B prime and B double prime performed
+        self.factorizations = 0
+        #: time spent in factorizations (seconds)
+        self.et_factor = 0.0
+        #: fill-in of the current factors of B prime and B double prime
+        self.fill = 0
+        #: fill-reducing bus ordering, C{None} for none
+        self.perm = perm
+
+        self.Ybus, self.Bp, self.Bpp = Ybus, Bp, Bpp
+        self._set_bus_types(ref, pv, pq)
+        self._Bp_solver = None
+        self._Bpp_solver = None
+
+    def _set_bus_types(self, ref, pv, pq):
+        self.ref = array(ref, int).flatten()
+        self.pv = array(pv, int).flatten()
+        self.pq = array(pq, int).flatten()
+        self.pvpq = sort(r_[self.pv, self.pq])
+
+    def update(self, Ybus=None, Bp=None, Bpp=None, ref=None, pv=None, pq=None,
+               baseMVA=None, bus=None, branch=None):
+        """Changes the network and/or the bus types.
+
+        Arguments which are C{None} are left unchanged. C{ref}, C{pv} and
+        C{pq} have to be given together. Factors which are affected by the
+        change are dropped and recomputed by the next call to L{solve}.
+
+        If C{baseMVA}, C{bus} and C{branch} are given, C{Ybus}, if not
+        given, and the B matrices are built from them (see L{makeYbus} and
+        L{makeB}, with the C{PF_ALG} option). Otherwise a C{Ybus} which
+        differs from the current one requires both B matrices, and a
+        C{ValueError} is raised without them.
+        """
+        if branch is not None:
+            if Ybus is None:
+                Ybus = makeYbus(baseMVA, bus, branch)[0]
+            Bp, Bpp = makeB(baseMVA, bus, branch, self.ppopt['PF_ALG'])
+        if Ybus is not None and not _same(Ybus, self.Ybus):
+            if Bp is None or Bpp is None:
+                raise ValueError('FDPFSolver: the B matrices of the new '
+                                 'network must be given with a new Ybus')
+        if Ybus is not None:
+            self.Ybus = Ybus
+        if Bp is not None and not _same(Bp, self.Bp):
+            self.Bp = Bp
+            self._Bp_solver = None
+        if Bpp is not None and not _same(Bpp, self.Bpp):
+            self.Bpp = Bpp
+            self._Bpp_solver = None
+        if pq is not None:
+            pvpq, pq0 = self.pvpq, self.pq
+            self._set_bus_types(ref, pv, pq)
+            if not array_equal(pvpq, self.pvpq):
+                self._Bp_solver = None
+            if not array_equal(pq0, self.pq):
+                self._Bpp_solver = None
+
+    def factor(self):
+        """Factors the reduced B matrices, unless factors are available.
+        """
+        if self._Bp_solver is None:
+            self._Bp_solver = self._factor(self.Bp, self.pvpq)
+        if self._Bpp_solver is None:
+            self._Bpp_solver = self._factor(self.Bpp, self.pq)
+        self.fill = self._Bp_solver.fill + self._Bpp_solver.fill
+
+    def _factor(self, B, idx):
+        """Returns an L{LUSolver} with the factors of C{B[idx, idx]}.
+        """
+        solver = LUSolver(None if self.perm is None else
+                          order_unknowns(self.perm, idx))
+        solver.factor(B[ix_(idx, idx)])
+        self.factorizations += 1
+        self.et_factor += solver.et_factor
+        return solver
+
+    def solve(self, Sbus, V0):
+        """Solves the power flow for injections C{Sbus}, starting at C{V0}.
+
+        C{V0} contains the set point for generator (including ref bus)
+        buses and the reference angle of the swing bus, as well as an
+        initial guess for remaining magnitudes and angles. Returns the
+        final complex voltages, a flag which indicates whether it
+        converged or not, and the number of iterations performed.
+        """
+        ## options
+        tol     = self.ppopt['PF_TOL']
+        max_it  = self.ppopt['PF_MAX_IT_FD']
+        verbose = self.ppopt['VERBOSE']
+
+        Ybus = self.Ybus
+        pvpq, pq = self.pvpq, self.pq
+
+        ## initialize
+        converged = 0
+        i = 0
+        V = V0
+        Va = angle(V)
+        Vm = abs(V)
+
+        ## evaluate initial mismatch
+        mis = (V * conj(Ybus * V) - Sbus) / Vm
+        P = mis[pvpq].real
+        Q = mis[pq].imag
+
+        ## check tolerance
+        normP = linalg.norm(P, Inf)
+        normQ = linalg.norm(Q, Inf)
+        if verbose > 1:
+            sys.stdout.write('\niteration     max mismatch (p.u.)  ')
+            sys.stdout.write('\ntype   #        P            Q     ')
+            sys.stdout.write('\n---- ----  -----------  -----------')
+            sys.stdout.write('\n  -  %3d   %10.3e   %10.3e' %
+                             (i, normP, normQ))
+        if normP < tol and normQ < tol:
+            converged = 1
+            if verbose > 1:
+                sys.stdout.write('\nConverged!\n')
+
+        ## factor B matrices
+        self.factor()
+        Bp_solver = self._Bp_solver
+        Bpp_solver = self._Bpp_solver
+
+        ## do P and Q iterations
+        while (not converged and i < max_it):
+            ## update iteration counter
+            i = i + 1
+
+            ##-----  do P iteration, update Va  -----
+            dVa = -Bp_solver.solve(P)
+
+            ## update voltage
+            Va[pvpq] = Va[pvpq] + dVa
+            V = Vm * exp(1j * Va)
+
+            ## evalute mismatch
+            mis = (V * conj(Ybus * V) - Sbus) / Vm
+            P = mis[pvpq].real
+            Q = mis[pq].imag
+
+            ## check tolerance
+            normP = linalg.norm(P, Inf)
+            normQ = linalg.norm(Q, Inf)
+            if verbose > 1:
+                sys.stdout.write("\n  P  %3d   %10.3e   %10.3e" %
+                                 (i, normP, normQ))
+            if normP < tol and normQ < tol:
+                converged = 1
+                if verbose:
+                    sys.stdout.write('\nFast-decoupled power flow converged '
+                                     'in %d P-iterations and %d '
+                                     'Q-iterations.\n' % (i, i - 1))
+                break
+
+            ##-----  do Q iteration, update Vm  -----
+            dVm = -Bpp_solver.solve(Q)
+
+            ## update voltage
+            Vm[pq] = Vm[pq] + dVm
+            V = Vm * exp(1j * Va)
+
+            ## evalute mismatch
+            mis = (V * conj(Ybus * V) - Sbus) / Vm
+            P = mis[pvpq].real
+            Q = mis[pq].imag
+
+            ## check tolerance
+            normP = linalg.norm(P, Inf)
+            normQ = linalg.norm(Q, Inf)
+            if verbose > 1:
+                sys.stdout.write('\n  Q  %3d   %10.3e   %10.3e' %
+                                 (i, normP, normQ))
+            if normP < tol and normQ < tol:
+                converged = 1
+                if verbose:
+                    sys.stdout.write('\nFast-decoupled power flow converged '
+                                     'in %d P-iterations and %d '
+                                     'Q-iterations.\n' % (i, i))
+                break
+
+        if verbose:
+            if not converged:
+                sys.stdout.write('\nFast-decoupled power flow did not '
+                                 'converge in %d iterations.' % i)
+
+        return V, converged, i
+
+
+def _same(A, B):
+    """Returns C{True} if sparse matrices C{A} and C{B} are equal.
+    """
+    return A is B or (A.shape == B.shape and (A != B).nnz == 0)
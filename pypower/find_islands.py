@@ -0,0 +1,72 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Finds the electrical islands of a network.
+"""
+
+from numpy import ones, zeros, arange, argsort, bincount, r_
+from numpy import flatnonzero as find
+
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from pypower.idx_bus import BUS_I, BUS_TYPE, NONE
+from pypower.idx_brch import F_BUS, T_BUS, BR_STATUS
+
+
+def find_islands(ppc):
+    """Finds the electrical islands of a network.
+
+    Returns the islands of the network in C{ppc}, the connected components
+    of the graph of the in-service buses and branches, as a list
+    C{groups} of arrays of bus indices, i.e. row indices of the bus
+    matrix, and an array C{isolated} with the indices of the in-service
+    buses which are not connected to any in-service branch. The groups
+    are sorted by decreasing number of buses, and islands of the same
+    size by their first bus. Isolated buses (C{BUS_TYPE} of C{NONE}) and
+    branches connected to them are ignored. Works for cases in external
+    or internal indexing.
+
+    Example::
+        groups, isolated = find_islands(ppc)
+        ## buses of the largest island
+        ppc['bus'][groups[0], BUS_I]
+
+    @see: L{runpf}
+    """
+    bus, branch = ppc['bus'], ppc['branch']
+    nb = bus.shape[0]
+
+    ## bus indices of the branch terminals
+    e2i = zeros(int(max(bus[:, BUS_I])) + 1, int)
+    e2i[bus[:, BUS_I].astype(int)] = arange(nb)
+    on = branch[:, BR_STATUS] > 0
+    f = e2i[branch[on, F_BUS].astype(int)]
+    t = e2i[branch[on, T_BUS].astype(int)]
+
+    ## ignore isolated buses and their branches
+    bs = bus[:, BUS_TYPE] != NONE
+    k = bs[f] & bs[t]
+    f, t = f[k], t[k]
+
+    ## connected components of the graph
+    C = csr_matrix((ones(len(f)), (f, t)), (nb, nb))
+    _, labels = connected_components(C, directed=False)
+
+    deg = bincount(r_[f, t], minlength=nb)
+    isolated = find(bs & (deg == 0))
+    labels[isolated] = -1
+    labels[~bs] = -1
+
+    ## group the buses by component
+    idx = argsort(labels, kind='mergesort')
+    idx = idx[labels[idx] >= 0]
+    groups = []
+    if len(idx):
+        split = find(labels[idx][1:] != labels[idx][:-1]) + 1
+        bounds = r_[0, split, len(idx)]
+        groups = [idx[bounds[k]:bounds[k + 1]] for k in range(len(bounds) - 1)]
+        groups.sort(key=lambda g: (-len(g), g[0]))
+
+    return groups, isolated
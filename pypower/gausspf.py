@@ -7,7 +7,10 @@
 
 import sys
 
-from numpy import linalg, conj, r_, Inf, asscalar
+from numpy import linalg, conj, r_, Inf, ones, arange, unique, diff, in1d, \
+    flatnonzero as find
+
+from scipy.sparse import csr_matrix
 
 from pypower.ppoption import ppoption
 
@@ -29,6 +32,20 @@ def gausspf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
     a flag which indicates whether it converged or not, and the number
     of iterations performed.
 
+    The rows of C{Ybus} and the inverses of its diagonal elements are
+    extracted once. The C{PF_GS_SWEEP} option selects how the bus voltages
+    are updated in each iteration:
+        0. sequential Gauss-Seidel sweep, PQ buses first, then PV buses,
+        1. Jacobi iteration, all buses updated at once from the voltages of
+           the previous iteration,
+        2. sweep over the colors of a coloring of the network graph, the
+           buses of one color are not adjacent to each other and are
+           updated at once (red-black Gauss-Seidel).
+    The vectorized variants 1 and 2 are much faster per iteration for
+    larger systems, which makes them practical for computing an initial
+    point for Newton's method. The Jacobi iteration usually needs more
+    iterations than the other two.
+
     @see: L{runpf}
 
     @author: Ray Zimmerman (PSERC Cornell)
@@ -42,19 +59,37 @@ def gausspf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
     tol     = ppopt['PF_TOL']
     max_it  = ppopt['PF_MAX_IT_GS']
     verbose = ppopt['VERBOSE']
+    sweep   = ppopt['PF_GS_SWEEP']
 
     ## initialize
     converged = 0
     i = 0
     V = V0.copy()
+    Sbus = Sbus.copy()      ## reactive injections at PV buses are updated
     #Va = angle(V)
     Vm = abs(V)
 
     ## set up indexing for updating V
     npv = len(pv)
-    npq = len(pq)
     pvpq = r_[pv, pq]
 
+    ## rows of Ybus and inverses of its diagonal elements
+    Ybus = csr_matrix(Ybus)
+    dinv = 1 / Ybus.diagonal()
+    if sweep == 0:
+        rows = [(Ybus.data[Ybus.indptr[k]:Ybus.indptr[k + 1]],
+                 Ybus.indices[Ybus.indptr[k]:Ybus.indptr[k + 1]])
+                for k in range(Ybus.shape[0])]
+    elif sweep == 1:
+        groups = [pvpq]
+    elif sweep == 2:
+        groups = _color(Ybus, pvpq)
+    else:
+        raise ValueError('gausspf: unknown PF_GS_SWEEP value %d' % sweep)
+    if sweep > 0:
+        ## rows of Ybus and PV buses of each group of buses
+        groups = [(g, Ybus[g, :], in1d(g, pv)) for g in groups]
+
     ## evaluate F(x0)
     mis = V * conj(Ybus * V) - Sbus
     F = r_[  mis[pvpq].real,
@@ -77,20 +112,34 @@ def gausspf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
         i = i + 1
 
         ## update voltage
-        ## at PQ buses
-        for k in pq[list(range(npq))]:
-            tmp = (conj(Sbus[k] / V[k]) - Ybus[k, :] * V) / Ybus[k, k]
-            V[k] = V[k] + asscalar(tmp)
-
-        ## at PV buses
-        if npv:
-            for k in pv[list(range(npv))]:
-                tmp = (V[k] * conj(Ybus[k,:] * V)).imag
-                Sbus[k] = Sbus[k].real + 1j * asscalar(tmp)
-                tmp = (conj(Sbus[k] / V[k]) - Ybus[k, :] * V) / Ybus[k, k]
-                V[k] = V[k] + asscalar(tmp)
-#               V[k] = Vm[k] * V[k] / abs(V[k])
-            V[pv] = Vm[pv] * V[pv] / abs(V[pv])
+        if sweep == 0:
+            ## at PQ buses
+            for k in pq:
+                data, idx = rows[k]
+                V[k] = V[k] + (conj(Sbus[k] / V[k]) -
+                               data.dot(V[idx])) * dinv[k]
+
+            ## at PV buses
+            if npv:
+                for k in pv:
+                    data, idx = rows[k]
+                    Sbus[k] = Sbus[k].real + \
+                        1j * (V[k] * conj(data.dot(V[idx]))).imag
+                    V[k] = V[k] + (conj(Sbus[k] / V[k]) -
+                                   data.dot(V[idx])) * dinv[k]
+#                   V[k] = Vm[k] * V[k] / abs(V[k])
+                V[pv] = Vm[pv] * V[pv] / abs(V[pv])
+        else:
+            ## all buses of a group at once
+            for g, Yg, isPV in groups:
+                Ig = Yg * V
+                if npv:
+                    k = g[isPV]
+                    Sbus[k] = Sbus[k].real + \
+                        1j * (V[k] * conj(Ig[isPV])).imag
+                V[g] = V[g] + (conj(Sbus[g] / V[g]) - Ig) * dinv[g]
+                if npv:
+                    V[k] = Vm[k] * V[k] / abs(V[k])
 
         ## evalute F(x)
         mis = V * conj(Ybus * V) - Sbus
@@ -114,3 +163,23 @@ def gausspf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
                              'iterations.' % i)
 
     return V, converged, i
+
+
+def _color(Ybus, buses):
+    """Groups buses such that no two buses of a group are adjacent.
+
+    Greedy coloring of the graph of C{Ybus} restricted to C{buses}, which
+    are visited in order of decreasing degree. Returns a list with the
+    array of buses of each color.
+    """
+    nb = Ybus.shape[0]
+    indptr, indices = Ybus.indptr, Ybus.indices
+    color = -ones(nb, int)
+    degree = diff(indptr)
+    for k in buses[(-degree[buses]).argsort(kind='mergesort')]:
+        used = color[indices[indptr[k]:indptr[k + 1]]]
+        free = find(~in1d(arange(len(used) + 1), used))
+        color[k] = free[0]
+
+    c = color[buses]
+    return [buses[c == j] for j in unique(c)]
@@ -0,0 +1,143 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""DC PTDF matrix with rank-1 updates for branch switching.
+"""
+
+from numpy import outer, flatnonzero as find
+
+from pypower.makeBdc import makeBdc
+from pypower.ptdf_solver import PTDFSolver
+from pypower.lodf_solver import LODFSolver
+
+from pypower.idx_bus import BUS_TYPE, REF
+from pypower.idx_brch import F_BUS, T_BUS, BR_STATUS
+
+
+class IncrementalPTDF(object):
+    """DC PTDF matrix with rank-1 updates for branch switching.
+
+    Builds the same matrix C{H} as L{makePTDF} once and then updates it in
+    place when a branch is taken out of service or put back in service.
+    The change of a branch changes the B matrix by a rank-1 term, so by
+    the Sherman-Morrison formula the new PTDF matrix is::
+        H' = H - s * (H * a) * v / (1 + s * v * a)
+    where C{a} is the incidence vector of the branch (+1 at its from bus,
+    -1 at its to bus), C{v} the PTDF row of the branch at its nominal
+    susceptance and C{s} is -1 for an outage and +1 for a restoration.
+    An update costs C{O(nl * nb)} instead of a new factorization and
+    C{nl} solves. The rows of branches out of service are zero in C{H},
+    their nominal rows, which are needed to restore them, are kept aside
+    and updated as well.
+
+    An outage which would split the network into islands has no PTDF
+    matrix: L{outage} then returns C{False} and leaves everything
+    unchanged. The C{slack} is a bus index or a vector of slack weights,
+    as for L{makePTDF}, the reference bus by default. Since C{H} is
+    updated in place, it may differ from a freshly built matrix by
+    round-off after many updates.
+
+    C{lodf} is an L{LODFSolver} on C{H}, with the given C{threshold} and
+    C{cache_size}, whose cached columns are recomputed for the new network
+    after each update, at C{O(nl)} per column.
+
+    Example::
+        ip = IncrementalPTDF(baseMVA, bus, branch)
+        if ip.outage(k):
+            Pf = dot(ip.H, Pbus)
+            L = ip.lodf.columns(contingencies)
+        ip.restore(k)
+
+    @see: L{makePTDF}, L{IncrementalYbus}
+    """
+
+    def __init__(self, baseMVA, bus, branch, slack=None, threshold=None,
+                 cache_size=1024, tol=1e-8):
+        ## use reference bus for slack by default
+        if slack is None:
+            slack = find(bus[:, BUS_TYPE] == REF)[0]
+
+        #: branch data the PTDF matrix is built for
+        self.branch = branch.copy()
+        #: tolerance of C{1 - v * a} below which an outage splits the network
+        self.tol = tol
+
+        self.f = self.branch[:, F_BUS].astype(int)
+        self.t = self.branch[:, T_BUS].astype(int)
+
+        ## PTDF rows of all branches at their nominal susceptance
+        nominal = self.branch.copy()
+        nominal[:, BR_STATUS] = 1
+        Bbus, _, _, _ = makeBdc(baseMVA, bus, self.branch)
+        _, Bf, _, _ = makeBdc(baseMVA, bus, nominal)
+        H = PTDFSolver(Bbus, Bf, slack).ptdf()
+
+        ## nominal rows of the branches out of service
+        self._off = {}
+        for k in find(self.branch[:, BR_STATUS] == 0):
+            self._off[k] = H[k, :].copy()
+            H[k, :] = 0
+
+        #: DC PTDF matrix
+        self.H = H
+        #: LODF columns on C{H}
+        self.lodf = LODFSolver(self.branch, H, threshold, cache_size, tol)
+
+    def outage(self, k):
+        """Takes branch C{k} out of service.
+
+        Returns C{False}, leaving the PTDF matrix unchanged, if the outage
+        would split the network into islands.
+        """
+        if self.branch[k, BR_STATUS] == 0:
+            return True
+        if self.islanding(k):
+            return False
+
+        v = self.H[k, :].copy()
+        self._update(k, v, -1)
+
+        ## keep the nominal row of the branch
+        self._off[k] = self.H[k, :].copy()
+        self.H[k, :] = 0
+        self.branch[k, BR_STATUS] = 0
+        self.lodf.refresh()
+
+        return True
+
+    def restore(self, k):
+        """Puts branch C{k} back in service.
+        """
+        if self.branch[k, BR_STATUS] != 0:
+            return
+
+        v = self._off.pop(k)
+        self._update(k, v, 1)
+        self.H[k, :] = v / (1 + v[self.f[k]] - v[self.t[k]])
+        self.branch[k, BR_STATUS] = 1
+        self.lodf.refresh()
+
+    def islanding(self, k):
+        """Returns true if the outage of branch C{k} would split the
+        network into islands.
+        """
+        if self.branch[k, BR_STATUS] == 0:
+            return False
+        h = self.H[k, self.f[k]] - self.H[k, self.t[k]]
+
+        return abs(1 - h) < self.tol
+
+    def _update(self, k, v, s):
+        """Rank-1 update of C{H} and of the nominal rows of the branches
+        out of service for a change C{s} of the status of branch C{k}
+        with nominal PTDF row C{v}.
+        """
+        f, t = self.f[k], self.t[k]
+        d = 1 + s * (v[f] - v[t])
+
+        u = self.H[:, f] - self.H[:, t]
+        self.H -= outer(s / d * u, v)
+        for j in self._off:
+            w = self._off[j]
+            w -= s / d * (w[f] - w[t]) * v
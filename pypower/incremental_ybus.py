@@ -0,0 +1,184 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Bus and branch admittance matrices with incremental branch updates.
+"""
+
+from sys import stderr
+
+from numpy import \
+    ones, zeros, conj, any, exp, pi, r_, c_, arange, repeat, diff, \
+    searchsorted, minimum, maximum, atleast_1d, add, array
+
+from scipy.sparse import csr_matrix
+
+from pypower.idx_bus import BUS_I, GS, BS
+from pypower.idx_brch import F_BUS, T_BUS, BR_R, BR_X, BR_B, BR_STATUS, \
+    SHIFT, TAP
+
+
+class IncrementalYbus(object):
+    """Bus and branch admittance matrices with incremental branch updates.
+
+    Builds the same matrices C{Ybus}, C{Yf} and C{Yt} as L{makeYbus}, but
+    with a sparsity structure that contains the entries of every branch,
+    in-service or not, and the full diagonal of C{Ybus}. A change of the
+    status, tap or impedance of a branch then only changes the values of
+    the at most four nonzeros of C{Ybus} and the two nonzeros of each of
+    C{Yf} and C{Yt} belonging to that branch, which are patched in place
+    in the data arrays of the CSR matrices. The matrix objects themselves
+    are kept, so e.g. a L{JacobianPlan} built for C{Ybus} stays valid.
+
+    The object works on its own copy of the branch matrix, available as
+    C{branch}, which is updated along with the admittance matrices. Since
+    C{Ybus} is updated by adding the change of the branch admittances, it
+    may differ from a freshly built matrix by round-off after many updates.
+
+    Example::
+        yb = IncrementalYbus(baseMVA, bus, branch)
+        yb.outage(k)
+        V, success, _ = newtonpf(yb.Ybus, Sbus, V0, ref, pv, pq)
+        yb.restore(k)
+
+    @see: L{makeYbus}
+    """
+
+    def __init__(self, baseMVA, bus, branch):
+        nb = bus.shape[0]          ## number of buses
+        nl = branch.shape[0]       ## number of lines
+
+        ## check that bus numbers are equal to indices to bus (one set of bus
+        ## nums)
+        if any(bus[:, BUS_I] != list(range(nb))):
+            stderr.write('buses must appear in order by bus number\n')
+
+        #: branch data the admittance matrices are built from
+        self.branch = branch.copy()
+
+        f = self.branch[:, F_BUS].astype(int)     ## list of "from" buses
+        t = self.branch[:, T_BUS].astype(int)     ## list of "to" buses
+        self.f, self.t = f, t
+
+        ## branch admittance matrix elements of all branches
+        Yff, Yft, Ytf, Ytt = self._branch_admittances(arange(nl))
+        self._Y = array([Yff, Yft, Ytf, Ytt])
+
+        ## vector of shunt admittances
+        Ysh = (bus[:, GS] + 1j * bus[:, BS]) / baseMVA
+
+        ## Yf and Yt in canonical CSR form, built directly from two entries
+        ## per row, stored in order of increasing column index
+        indptr = 2 * arange(nl + 1)
+        indices = c_[minimum(f, t), maximum(f, t)].flatten()
+        self._yf = 2 * arange(nl) + (f > t)     ## position of column f
+        self._yt = 2 * arange(nl) + (f < t)     ## position of column t
+        Yf_data = zeros(2 * nl, complex)
+        Yt_data = zeros(2 * nl, complex)
+        Yf_data[self._yf], Yf_data[self._yt] = Yff, Yft
+        Yt_data[self._yf], Yt_data[self._yt] = Ytf, Ytt
+
+        #: branch admittance matrix for the "from" end currents
+        self.Yf = csr_matrix((Yf_data, indices.copy(), indptr.copy()),
+                             (nl, nb))
+        #: branch admittance matrix for the "to" end currents
+        self.Yt = csr_matrix((Yt_data, indices.copy(), indptr.copy()),
+                             (nl, nb))
+
+        ## Ybus with the entries of all branches and all diagonal elements
+        ## stored, duplicates summed and indices sorted
+        rows = r_[f, f, t, t, arange(nb)]
+        cols = r_[f, t, f, t, arange(nb)]
+        Ybus = csr_matrix((r_[Yff, Yft, Ytf, Ytt, Ysh], (rows, cols)),
+                          (nb, nb))
+        Ybus.sum_duplicates()
+
+        #: bus admittance matrix
+        self.Ybus = Ybus
+
+        ## position of the (f, f), (f, t), (t, f) and (t, t) entries of each
+        ## branch in Ybus.data
+        key = repeat(arange(nb), diff(Ybus.indptr)) * nb + Ybus.indices
+        self._pos = array([searchsorted(key, f * nb + f),
+                           searchsorted(key, f * nb + t),
+                           searchsorted(key, t * nb + f),
+                           searchsorted(key, t * nb + t)])
+
+    def matrices(self):
+        """Returns C{Ybus}, C{Yf} and C{Yt}, as returned by L{makeYbus}.
+        """
+        return self.Ybus, self.Yf, self.Yt
+
+    def outage(self, k):
+        """Takes branch(es) C{k} out of service.
+        """
+        self._update(k, BR_STATUS, 0)
+
+    def restore(self, k):
+        """Puts branch(es) C{k} back in service.
+        """
+        self._update(k, BR_STATUS, 1)
+
+    def set_tap(self, k, tap=None, shift=None):
+        """Sets the tap ratio and/or phase shift angle (degrees) of branch(es)
+        C{k}.
+
+        A tap ratio of zero denotes a transmission line, as in the C{TAP}
+        column of the branch matrix. Arguments which are C{None} are left
+        unchanged.
+        """
+        self._update(k, TAP, tap, SHIFT, shift)
+
+    def set_impedance(self, k, r=None, x=None, b=None):
+        """Sets the resistance, reactance and/or total line charging
+        susceptance (p.u.) of branch(es) C{k}.
+
+        Arguments which are C{None} are left unchanged.
+        """
+        self._update(k, BR_R, r, BR_X, x, BR_B, b)
+
+    def _update(self, k, *args):
+        """Sets columns of branch(es) C{k} and patches the matrices.
+
+        C{args} are pairs of a branch matrix column and its new value(s),
+        values which are C{None} are skipped.
+        """
+        k = atleast_1d(k).astype(int)
+        for col, value in zip(args[::2], args[1::2]):
+            if value is not None:
+                self.branch[k, col] = value
+
+        Y = array(self._branch_admittances(k))
+
+        ## patch Ybus by the change of the branch admittances, accumulating
+        ## the changes of parallel branches
+        add.at(self.Ybus.data, self._pos[:, k].flatten(),
+               (Y - self._Y[:, k]).flatten())
+        self._Y[:, k] = Y
+
+        ## Yf and Yt hold the branch admittances themselves
+        self.Yf.data[self._yf[k]], self.Yf.data[self._yt[k]] = Y[0], Y[1]
+        self.Yt.data[self._yf[k]], self.Yt.data[self._yt[k]] = Y[2], Y[3]
+
+    def _branch_admittances(self, k):
+        """Elements of the branch admittance matrices of branches C{k}.
+
+        Returns C{Yff}, C{Yft}, C{Ytf} and C{Ytt} computed as in
+        L{makeYbus}.
+        """
+        branch = self.branch[k, :]
+        stat = branch[:, BR_STATUS]              ## ones at in-service branches
+        ## series admittance
+        Ys = stat / (branch[:, BR_R] + 1j * branch[:, BR_X])
+        Bc = stat * branch[:, BR_B]              ## line charging susceptance
+        tap = ones(len(k))                       ## default tap ratio = 1
+        i = branch[:, TAP] != 0                  ## non-zero tap ratios
+        tap[i] = branch[i, TAP]                  ## assign non-zero tap ratios
+        tap = tap * exp(1j * pi / 180 * branch[:, SHIFT]) ## add phase shifters
+
+        Ytt = Ys + 1j * Bc / 2
+        Yff = Ytt / (tap * conj(tap))
+        Yft = - Ys / conj(tap)
+        Ytf = - Ys / tap
+
+        return Yff, Yft, Ytf, Ytt
@@ -0,0 +1,204 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Precomputed sparsity structure of the power flow Jacobian.
+"""
+
+from numpy import \
+    arange, array, ones, zeros, r_, conj, diff, repeat, lexsort, cumsum, \
+    bincount, searchsorted, take, tile, concatenate, array_equal, \
+    flatnonzero as find
+
+from scipy.sparse import issparse, csr_matrix, csc_matrix
+
+
+class JacobianPlan(object):
+    """Precomputed sparsity structure of the power flow Jacobian.
+
+    The Newton power flow Jacobian::
+
+            | J11  J12 |   | dP/dVa[pvpq, pvpq]  dP/dVm[pvpq, pq] |
+        J = |          | = |                                      |
+            | J21  J22 |   | dQ/dVa[pq,   pvpq]  dQ/dVm[pq,   pq] |
+
+    has the same sparsity pattern for every voltage vector, as long as the
+    pattern of the admittance matrix and the PV and PQ bus index lists stay
+    the same. This object computes that pattern, in compressed sparse column
+    form, once from C{Ybus}, C{pv} and C{pq}, together with a map from each
+    nonzero of C{J} to the nonzero of C{Ybus} and the partial derivative it
+    is taken from. L{jac} then only recomputes the nonzeros of C{dSbus_dV}
+    for a given voltage and scatters them into the data array of a single
+    C{csc_matrix}, which is reused from one call to the next.
+
+    If C{Ybus} is a CSR matrix in canonical format with all diagonal entries
+    stored, the plan keeps a reference to it and any in-place change of its
+    data array is picked up by the next call to L{jac}. Otherwise a private
+    canonical copy is made. L{matches} compares the sparsity patterns, so
+    that the plan can be used for any admittance matrix with the same
+    pattern, e.g. a new one built by L{makeYbus} for the same network,
+    whose values are taken over by L{update}.
+
+    Example::
+        plan = JacobianPlan(Ybus, pv, pq)
+        J = plan.jac(V)
+        if plan.matches(Ybus2, pv, pq):
+            plan.update(Ybus2)
+            J = plan.jac(V)
+
+    @see: L{newtonpf}, L{dSbus_dV}
+    """
+
+    def __init__(self, Ybus, pv, pq):
+        #: PV and PQ bus indices the plan was built for
+        self.pv = array(pv, int)
+        self.pq = array(pq, int)
+
+        #: admittance matrix whose values are used to fill the Jacobian
+        self.Ybus = self._canonical(Ybus)
+
+        Y = self.Ybus
+        nb = Y.shape[0]
+        nz = Y.nnz
+        pvpq = r_[self.pv, self.pq]
+        npvpq = len(pvpq)
+        n = npvpq + len(self.pq)
+
+        ## row and column index of each nonzero of Ybus
+        self._rows = repeat(arange(nb), diff(Y.indptr))
+        self._cols = Y.indices.astype(int)
+
+        ## position of the diagonal elements in Ybus.data
+        self._diag = searchsorted(self._rows * nb + self._cols,
+                                  arange(nb) * (nb + 1))
+
+        ## row/column of each bus in the P (and Va) and Q (and Vm) blocks
+        iP = -ones(nb, int)
+        iP[pvpq] = arange(npvpq)
+        iQ = -ones(nb, int)
+        iQ[self.pq] = npvpq + arange(len(self.pq))
+
+        ## each nonzero (i, j) of Ybus gives up to 4 nonzeros of J, taken
+        ## from Re(dS/dVa), Re(dS/dVm), Im(dS/dVa) and Im(dS/dVm), which are
+        ## stored in that order in a single array of length 4 * nnz(Ybus)
+        r, c, src = [], [], []
+        for k, (ir, ic) in enumerate([(iP, iP), (iP, iQ), (iQ, iP), (iQ, iQ)]):
+            jr = ir[self._rows]
+            jc = ic[self._cols]
+            i = find((jr >= 0) & (jc >= 0))
+            r.append(jr[i])
+            c.append(jc[i])
+            src.append(k * nz + i)
+        r, c, src = concatenate(r), concatenate(c), concatenate(src)
+
+        ## sort into compressed sparse column order
+        order = lexsort((r, c))
+        indptr = r_[0, cumsum(bincount(c, minlength=n))]
+
+        #: index of each nonzero of J in the stacked partial derivatives
+        self.src = src[order]
+
+        #: the Jacobian, whose data array is refilled by L{jac}
+        self.J = csc_matrix((zeros(len(order)), r[order], indptr), (n, n))
+
+    @staticmethod
+    def _canonical(Ybus):
+        """Returns C{Ybus} as a canonical CSR matrix with a full diagonal.
+        """
+        if issparse(Ybus) and Ybus.format == 'csr' and \
+                Ybus.has_canonical_format:
+            nb = Ybus.shape[0]
+            rows = repeat(arange(nb), diff(Ybus.indptr))
+            if len(find(rows == Ybus.indices)) == nb:
+                return Ybus
+
+        Y = csr_matrix(Ybus).tocoo()
+        nb = Y.shape[0]
+        Y = csr_matrix((r_[Y.data, zeros(nb)],
+                        (r_[Y.row, arange(nb)], r_[Y.col, arange(nb)])),
+                       (nb, nb))
+        Y.sum_duplicates()
+        return Y
+
+    def matches(self, Ybus, pv, pq):
+        """Returns C{True} if the plan can be used for the given arguments.
+
+        This is the case if C{pv} and C{pq} are those of the plan and the
+        canonical form of C{Ybus} has the same sparsity pattern as the
+        admittance matrix of the plan, whatever its values.
+        """
+        if not (array_equal(pv, self.pv) and array_equal(pq, self.pq)):
+            return False
+        if Ybus is self.Ybus:
+            return True
+        return self._matches(self._canonical(Ybus))
+
+    def _matches(self, Y):
+        return Y.shape == self.Ybus.shape and \
+            array_equal(Y.indptr, self.Ybus.indptr) and \
+            array_equal(Y.indices, self.Ybus.indices)
+
+    def update(self, Ybus):
+        """Uses the values of C{Ybus} in the next calls to L{jac}.
+
+        C{Ybus} must have the sparsity pattern of the plan (see
+        L{matches}). As in the constructor, a reference to it is kept if it
+        is in canonical format, otherwise a canonical copy is made.
+        """
+        if Ybus is self.Ybus:
+            return
+        Y = self._canonical(Ybus)
+        if not self._matches(Y):
+            raise ValueError('JacobianPlan: Ybus has another sparsity '
+                             'pattern than the plan')
+        self.Ybus = Y
+
+    def dS_dV(self, V):
+        """Nonzeros of C{dSbus_dV}, stacked as described above.
+
+        C{V} is a vector of complex bus voltages, or a matrix with one
+        voltage vector per row, in which case a matrix with one row of
+        stacked partial derivatives per voltage vector is returned.
+        """
+        Y = self.Ybus
+        rows, cols, diag = self._rows, self._cols, self._diag
+
+        Ibus = (Y * V.T).T
+        Vnorm = V / abs(V)
+
+        dS_dVa = -1j * V[..., rows] * conj(Y.data * V[..., cols])
+        dS_dVa[..., diag] += 1j * V * conj(Ibus)
+
+        dS_dVm = V[..., rows] * conj(Y.data * Vnorm[..., cols])
+        dS_dVm[..., diag] += conj(Ibus) * Vnorm
+
+        return concatenate([dS_dVa.real, dS_dVm.real,
+                            dS_dVa.imag, dS_dVm.imag], -1)
+
+    def jac(self, V):
+        """Returns the Jacobian for the complex bus voltage vector C{V}.
+
+        The same C{csc_matrix} object is returned on every call, with its
+        data array overwritten in place.
+        """
+        take(self.dS_dV(V), self.src, out=self.J.data)
+        return self.J
+
+    def jac_batch(self, V):
+        """Returns the block diagonal Jacobian for a matrix of voltages.
+
+        C{V} has one complex bus voltage vector per row. The result is a
+        C{csc_matrix} with the Jacobians of the rows of C{V} as diagonal
+        blocks, in the same order.
+        """
+        ns = V.shape[0]
+        n = self.J.shape[0]
+        nnz = self.J.nnz
+        data = self.dS_dV(V)[:, self.src]
+        indices = (tile(self.J.indices, (ns, 1)) +
+                   n * arange(ns).reshape(ns, 1))
+        indptr = r_[(tile(self.J.indptr[:-1], (ns, 1)) +
+                     nnz * arange(ns).reshape(ns, 1)).flatten(), ns * nnz]
+
+        return csc_matrix((data.flatten(), indices.flatten(), indptr),
+                          (ns * n, ns * n))
@@ -0,0 +1,185 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Precomputed sparsity structure of the PIPS Newton (KKT) system.
+"""
+
+from numpy import arange, zeros, r_, diff, repeat, cumsum, bincount, \
+    unique, searchsorted, concatenate, array_equal
+
+from scipy.sparse import issparse, csr_matrix, csc_matrix
+
+
+class KKTPlan(object):
+    """Precomputed sparsity structure of the PIPS Newton (KKT) system.
+
+    Each iteration of L{pips} solves the system::
+
+            | M     dg |   | dx   |   | -N |
+            |          | * |      | = |    |
+            | dg.T  0  |   | dlam |   | -g |
+
+    with C{M = Lxx + dh * diag(d) * dh.T} and C{d = mu / z}. As long as the
+    sparsity patterns of the Hessian of the Lagrangian C{Lxx} and of the
+    constraint gradients C{dh} and C{dg} stay the same, so does that of the
+    KKT matrix. This object computes the pattern, in compressed sparse
+    column form, once from C{Lxx}, C{dh} and C{dg}, together with the
+    position in it of each nonzero of C{Lxx} and C{dg} and of each product
+    C{dh[i, k] * dh[j, k]}. L{kkt} then computes the values of all terms in
+    one vectorized pass and sums them into the data array of a single
+    C{csc_matrix}, which is reused from one call to the next, so that it
+    can be factored with the ordering of the previous factorization (see
+    L{LUSolver}).
+
+    Entries which cancel numerically are kept as explicit zeros, so the
+    pattern never depends on the values. Since functions which evaluate
+    the derivatives often leave out entries which happen to be zero, the
+    matrices may also have any pattern which fits into that of the plan.
+    A new plan built from a previous one in C{plan} has the union of both
+    patterns, so that the pattern settles after a few changes. C{dh} and
+    C{dg} may be C{None} if there are no inequality or equality
+    constraints.
+
+    Example::
+        plan = KKTPlan(Lxx, dh, dg)
+        K = plan.kkt(Lxx, dh, dg, mu / z)
+        if K is None:       ## entries outside the pattern
+            plan = KKTPlan(Lxx, dh, dg, plan)
+
+    @see: L{pips}, L{JacobianPlan}
+    """
+
+    def __init__(self, Lxx, dh, dg, plan=None):
+        Lxx, dh, dg = self._canonical(Lxx, dh, dg)
+        self._nx = Lxx.shape[0]
+        self._neq = 0 if dg is None else dg.shape[1]
+        n = self._nx + self._neq
+
+        ## terms of the KKT matrix for these patterns
+        self._use(Lxx, dh, dg, self._terms(Lxx, dh, dg))
+
+        ## union of the patterns, and of those of a previous plan, in
+        ## compressed sparse column order
+        key = self._key
+        if plan is not None and plan._neq == self._neq and \
+                plan._nx == self._nx:
+            key = r_[key, plan._keys]
+        #: sorted keys C{col * n + row} of the nonzeros of the KKT matrix
+        self._keys = unique(key)
+        self._pos = searchsorted(self._keys, self._key)
+
+        indptr = r_[0, cumsum(bincount(self._keys // n, minlength=n))]
+        #: the KKT matrix, whose data array is refilled by L{kkt}
+        self.K = csc_matrix((zeros(len(self._keys)), self._keys % n, indptr),
+                            (n, n))
+
+    def _terms(self, Lxx, dh, dg):
+        """Keys C{col * n + row} of the terms of the KKT matrix, and the
+        nonzeros of C{dh} and the column of each product of two of them.
+        """
+        nx, n = self._nx, self._nx + self._neq
+
+        ## row and column of each nonzero of Lxx
+        r = [repeat(arange(nx), diff(Lxx.indptr))]
+        c = [Lxx.indices]
+
+        ## each pair of nonzeros (i, k) and (j, k) of a column of dh adds
+        ## to entry (i, j) of M
+        ia = ib = k = None
+        if dh is not None:
+            cnt = diff(dh.indptr)
+            col = repeat(arange(dh.shape[1]), cnt)  ## column of each nonzero
+            reps = cnt[col]
+            ia = repeat(arange(dh.nnz), reps)
+            ib = repeat(dh.indptr[col], reps) + \
+                arange(len(ia)) - repeat(cumsum(reps) - reps, reps)
+            k = col[ia]
+            r.append(dh.indices[ia])
+            c.append(dh.indices[ib])
+
+        ## dg and its transpose
+        if dg is not None:
+            gr = dg.indices
+            gc = nx + repeat(arange(self._neq), diff(dg.indptr))
+            r += [gr, gc]
+            c += [gc, gr]
+
+        return concatenate(c).astype(int) * n + concatenate(r), ia, ib, k
+
+    def _use(self, Lxx, dh, dg, terms):
+        """Keeps the patterns and the terms of the given matrices for the
+        next calls to L{kkt}.
+        """
+        self._patterns = [None if p is None else
+                          (p[0], p[1].copy(), p[2].copy())
+                          for p in self._pattern(Lxx, dh, dg)]
+        self._key, self._ia, self._ib, self._k = terms
+
+    @staticmethod
+    def _canonical(Lxx, dh, dg):
+        """Returns C{Lxx} as canonical CSR and C{dh} and C{dg} as canonical
+        CSC matrices.
+        """
+        Lxx = Lxx.tocsr() if issparse(Lxx) else csr_matrix(Lxx)
+        Lxx.sum_duplicates()
+        if dh is not None:
+            dh = dh.tocsc() if issparse(dh) else csc_matrix(dh)
+            dh.sum_duplicates()
+        if dg is not None:
+            dg = dg.tocsc() if issparse(dg) else csc_matrix(dg)
+            dg.sum_duplicates()
+        return Lxx, dh, dg
+
+    @staticmethod
+    def _pattern(*mats):
+        return [None if A is None else (A.shape, A.indptr, A.indices)
+                for A in mats]
+
+    def matches(self, Lxx, dh, dg):
+        """Returns C{True} if the plan can be used for the given matrices.
+        """
+        return self._matches(*self._canonical(Lxx, dh, dg))
+
+    def _matches(self, Lxx, dh, dg):
+        for p, q in zip(self._patterns, self._pattern(Lxx, dh, dg)):
+            if (p is None) != (q is None):
+                return False
+            if p is not None and not (p[0] == q[0] and
+                                      array_equal(p[1], q[1]) and
+                                      array_equal(p[2], q[2])):
+                return False
+        return True
+
+    def kkt(self, Lxx, dh, dg, d):
+        """Returns the KKT matrix, or C{None} if it has entries outside the
+        pattern of the plan.
+
+        C{d} is the vector C{mu / z}. Matrices with other patterns than
+        those of the last call, e.g. with entries which happen to be zero
+        left out, are mapped onto the pattern of the plan if they fit into
+        it. The same C{csc_matrix} object is returned on every call, with
+        its data array overwritten in place.
+        """
+        Lxx, dh, dg = self._canonical(Lxx, dh, dg)
+        if not self._matches(Lxx, dh, dg):
+            if Lxx.shape[0] != self._nx or \
+                    (0 if dg is None else dg.shape[1]) != self._neq:
+                return None
+            terms = self._terms(Lxx, dh, dg)
+            pos = searchsorted(self._keys, terms[0])
+            pos = pos.clip(0, len(self._keys) - 1)
+            if len(pos) and not array_equal(self._keys[pos], terms[0]):
+                return None
+            self._use(Lxx, dh, dg, terms)
+            self._pos = pos
+
+        vals = [Lxx.data]
+        if dh is not None:
+            vals.append(dh.data[self._ia] * dh.data[self._ib] * d[self._k])
+        if dg is not None:
+            vals += [dg.data, dg.data]
+
+        self.K.data[:] = bincount(self._pos, concatenate(vals),
+                                  minlength=self.K.nnz)
+        return self.K
@@ -0,0 +1,138 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Line outage distribution factors computed on demand.
+"""
+
+from numpy import array, arange, zeros, unique, nan, flatnonzero as find
+from scipy.sparse import csc_matrix, hstack
+
+from pypower.lrucache import LRUCache
+from pypower.ptdf_solver import PTDFSolver
+
+from pypower.idx_brch import F_BUS, T_BUS
+
+
+class LODFSolver(object):
+    """Line outage distribution factors computed on demand.
+
+    Computes the columns of the DC line outage distribution factor matrix
+    (see L{makeLODF}) of the requested outage branches only. Column C{k}
+    holds the change of the flows of all branches per unit of pre-outage
+    flow on branch C{k} when branch C{k} is taken out of service. It is
+    computed from the flows of a unit transfer from the from bus to the to
+    bus of branch C{k}, which are taken from the PTDF matrix C{H} if it
+    is given as a matrix, or obtained by one solve with its factorization
+    if C{H} is a L{PTDFSolver}. Columns of outages which split the network
+    into islands are C{nan}.
+
+    Entries with an absolute value smaller than C{threshold} are dropped
+    if a threshold is given, in which case the columns are kept and
+    returned as sparse matrices, otherwise as dense arrays. The computed
+    columns are kept in an L{LRUCache} of C{cache_size} columns, C{cache}.
+
+    Example::
+        lodf = LODFSolver(branch, PTDFSolver(Bbus, Bf), threshold=1e-4)
+        L = lodf.columns(contingencies)     ## nl x len(contingencies)
+
+    @see: L{makeLODF}, L{PTDFSolver}
+    """
+
+    def __init__(self, branch, H, threshold=None, cache_size=1024, tol=1e-8):
+        #: PTDF matrix or L{PTDFSolver}
+        self.H = H
+        #: entries smaller than this in absolute value are dropped, C{None}
+        #: to keep the columns dense
+        self.threshold = threshold
+        #: tolerance of C{1 - PTDF} below which an outage splits the network
+        self.tol = tol
+        #: cache of computed columns, by branch index
+        self.cache = LRUCache(cache_size)
+
+        self.f = branch[:, F_BUS].astype(int)
+        self.t = branch[:, T_BUS].astype(int)
+        self.nl = branch.shape[0]
+
+    def columns(self, outage_idx):
+        """Returns the LODF columns of the outages of branches C{outage_idx}.
+
+        Returns an C{nl x len(outage_idx)} matrix, sparse if a C{threshold}
+        is set. Columns which are not cached are computed together.
+        """
+        outage_idx = array(outage_idx, int).flatten()
+        cols = [self.cache.get(k) for k in outage_idx]
+        missing = unique([k for k, c in zip(outage_idx, cols) if c is None])
+        if len(missing):
+            new = self._compute(missing)
+            computed = {}
+            for n, k in enumerate(missing):
+                if self.threshold is None:
+                    computed[k] = new[:, n]
+                else:
+                    computed[k] = new[:, [n]]
+                self.cache.put(k, computed[k])
+            cols = [computed[k] if c is None else c
+                    for k, c in zip(outage_idx, cols)]
+
+        if self.threshold is None:
+            L = zeros((self.nl, len(outage_idx)))
+            for j, c in enumerate(cols):
+                L[:, j] = c
+            return L
+        elif cols:
+            return hstack(cols).tocsc()
+        else:
+            return csc_matrix((self.nl, 0))
+
+    def refresh(self):
+        """Recomputes the cached columns, e.g. after a change of C{H} in
+        place (see L{IncrementalPTDF}).
+        """
+        keys = self.cache.keys()
+        if keys:
+            new = self._compute(array(keys, int))
+            for n, k in enumerate(keys):
+                if self.threshold is None:
+                    self.cache.put(k, new[:, n])
+                else:
+                    self.cache.put(k, new[:, [n]])
+
+    def islanding(self, outage_idx):
+        """Returns true for the outages of C{outage_idx} which split the
+        network into islands.
+        """
+        outage_idx = array(outage_idx, int).flatten()
+        L = self.columns(outage_idx)
+        d = L[outage_idx, arange(len(outage_idx))]
+        if self.threshold is not None:
+            d = d.A1
+        return d != d       ## nan
+
+    def _compute(self, idx):
+        f, t = self.f[idx], self.t[idx]
+        n = len(idx)
+
+        ## flows of unit transfers from the from bus to the to bus
+        if isinstance(self.H, PTDFSolver):
+            nb = self.H.Bbus.shape[0]
+            P = zeros((nb, n))
+            P[f, arange(n)] = 1
+            P[t, arange(n)] -= 1
+            L = self.H.flows(P)
+        else:
+            L = self.H[:, f] - self.H[:, t]
+        L = array(L, float).reshape(self.nl, n)
+
+        h = L[idx, arange(n)]
+        split = find(abs(1 - h) < self.tol)
+        h[split] = 0
+        L = L / (1 - h)
+        L[idx, arange(n)] = -1
+        L[:, split] = nan
+
+        if self.threshold is not None:
+            L[abs(L) < self.threshold] = 0
+            L = csc_matrix(L)
+
+        return L
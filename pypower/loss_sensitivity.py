@@ -0,0 +1,72 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Loss sensitivities and penalty factors of an AC power flow solution.
+"""
+
+from numpy import array, asarray, zeros, r_
+
+from pypower.dSbus_dV import dSbus_dV
+from pypower.jacobian_plan import JacobianPlan
+from pypower.pflinsolver import LUSolver
+
+
+def loss_sensitivity(Ybus, V, ref, pv, pq, lin=None):
+    """Loss sensitivities and penalty factors of an AC power flow solution.
+
+    Computes the incremental transmission losses, the change of the total
+    real power losses per unit of additional real or reactive power
+    injection at each bus, taken up by the swing bus, at the power flow
+    solution C{V} with the bus types C{ref}, C{pv} and C{pq}, all in
+    internal indexing. The losses are the sum of the real power injections
+    of all buses, so their sensitivity to the real power injection at a
+    bus is one plus that of the injection at the swing bus, and with C{g}
+    the derivatives of the latter w.r.t. the unknowns of the Newton power
+    flow and C{J} its Jacobian, the sensitivities to all injections are
+    the solution of the single transposed system::
+        J.T * s = g
+    which is solved with the factors in the linear solver C{lin}, e.g. as
+    returned by L{newtonpf} with C{return_solver}, if it solves systems
+    with the transposed matrix exactly (see C{transposable} in
+    L{LinearSolver}), otherwise the Jacobian at C{V} is factored by a new
+    L{LUSolver}.
+
+    Returns the vectors of the sensitivities of the losses to the real
+    power injections C{dPL_dP}, zero at the swing bus, and to the reactive
+    power injections C{dPL_dQ}, zero at all but the PQ buses, and the
+    penalty factors C{1 / (1 - dPL_dP)}. All are per unit, so the same in
+    MW per MW and MW per MVAr.
+
+    Example::
+        V, success, _, lin = newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt,
+                                      return_solver=True)
+        dPL_dP, dPL_dQ, pf = loss_sensitivity(Ybus, V, ref, pv, pq, lin)
+
+    @see: L{newtonpf}, L{dSbus_dV}
+    """
+    ref = int(array(ref, int).flatten()[0])
+    pv = array(pv, int).flatten()
+    pq = array(pq, int).flatten()
+    pvpq = r_[pv, pq]
+    npvpq = len(pvpq)
+    nb = len(V)
+
+    ## derivatives of the real power injection at the swing bus
+    dS_dVm, dS_dVa = dSbus_dV(Ybus, V)
+    dP_dVa = asarray(dS_dVa[ref, :].todense()).flatten().real
+    dP_dVm = asarray(dS_dVm[ref, :].todense()).flatten().real
+    g = r_[dP_dVa[pvpq], dP_dVm[pq]]
+
+    ## single solve with the transposed Jacobian
+    if lin is None or not lin.transposable:
+        lin = LUSolver()
+        lin.factor(JacobianPlan(Ybus, pv, pq).jac(V))
+    s = lin.solve_transposed(g)
+
+    dPL_dP = zeros(nb)
+    dPL_dP[pvpq] = 1 + s[:npvpq]
+    dPL_dQ = zeros(nb)
+    dPL_dQ[pq] = s[npvpq:]
+
+    return dPL_dP, dPL_dQ, 1 / (1 - dPL_dP)
@@ -0,0 +1,91 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Least recently used cache.
+"""
+
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """Mapping with a bounded number of entries and hit/miss counters.
+
+    When a new entry is added to a full cache, the least recently used
+    entry is evicted. An entry is used when it is stored with L{put} or
+    retrieved with L{get}. A C{maxsize} of zero disables the cache: nothing
+    is stored and every lookup is a miss.
+
+    Example::
+        cache = LRUCache(8)
+        cache.put(key, value)
+        value = cache.get(key)      # None if not cached
+
+    @see: L{runpf}
+    """
+
+    def __init__(self, maxsize=128):
+        self._data = OrderedDict()
+        self._maxsize = int(maxsize)
+        #: number of lookups which found an entry
+        self.hits = 0
+        #: number of lookups which did not find an entry
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    @property
+    def maxsize(self):
+        """Maximum number of entries, evicts entries if decreased."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize):
+        self._maxsize = int(maxsize)
+        self._evict()
+
+    def get(self, key, default=None):
+        """Returns the entry for C{key}, or C{default} if there is none.
+        """
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data[key] = value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Stores C{value} for C{key}, evicting the oldest entries if full.
+        """
+        self._data.pop(key, None)
+        if self._maxsize > 0:
+            self._data[key] = value
+            self._evict()
+
+    def keys(self):
+        """Returns the keys of the entries, least recently used first.
+        """
+        return list(self._data.keys())
+
+    def clear(self):
+        """Removes all entries and resets the counters.
+        """
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Returns a dict with the hit/miss counters and the cache size.
+        """
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._data), 'maxsize': self._maxsize}
+
+    def _evict(self):
+        while len(self._data) > max(self._maxsize, 0):
+            self._data.popitem(last=False)
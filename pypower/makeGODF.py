@@ -0,0 +1,48 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Builds the generator outage distribution factor matrix.
+"""
+
+from numpy import asarray, dot, zeros
+
+from pypower.idx_gen import GEN_STATUS, APF
+
+
+def makeGODF(gen, GSDF):
+    """Builds the generator outage distribution factor matrix.
+
+    Returns the DC generator outage distribution factor matrix for a given
+    generation shift distribution factor matrix. The matrix is C{nbr x ng},
+    where C{nbr} is the number of branches and C{ng} the number of
+    generators. Column C{g} holds the change of the branch flows per unit
+    of output of generator C{g} when it trips. Its output is picked up by
+    the other in-service generators in proportion to their participation
+    factors in the C{APF} column of C{gen}, or by the slack of the GSDF
+    matrix if none of them has a participation factor. Columns of
+    generators out of service are zero.
+
+    The flows after each generator outage are then given by a single
+    matrix product::
+        G = makeGSDF(baseMVA, bus, gen, branch)
+        GODF = makeGODF(gen, G)
+        F = F0.reshape(-1, 1) + GODF * gen[:, PG]    ## nbr x ng
+
+    @see: L{makeGSDF}, L{makeLODF}
+    """
+    G = asarray(GSDF)
+    on = gen[:, GEN_STATUS] > 0
+    a = gen[:, APF] * on            ## participation factors
+    rest = sum(a) - a               ## of the generators not outaged
+
+    ## flow changes of the other generators picking up the lost output,
+    ##    dot(G, a) - G[:, g] * a[g], normalized by rest[g]
+    i = rest > 0
+    pickup = zeros(G.shape)
+    pickup[:, i] = (dot(G, a).reshape(-1, 1) - G[:, i] * a[i]) / rest[i]
+
+    GODF = pickup - G
+    GODF[:, ~on] = 0
+
+    return GODF
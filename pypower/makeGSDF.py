@@ -0,0 +1,37 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Builds the DC generation shift distribution factor matrix.
+"""
+
+from numpy import unique
+
+from pypower.makePTDF import makePTDF
+
+from pypower.idx_gen import GEN_BUS
+
+
+def makeGSDF(baseMVA, bus, gen, branch, slack=None, branch_idx=None,
+             dtype=None):
+    """Builds the DC generation shift distribution factor matrix.
+
+    Returns the DC generation shift distribution factor matrix, the
+    change of the real power flow of each branch per unit of additional
+    real power output of each generator, taken up by the slack. The
+    matrix is C{nbr x ng}, where C{nbr} is the number of branches and
+    C{ng} the number of generators, and holds the columns of the PTDF
+    matrix (see L{makePTDF}) of the generator buses. The C{slack}, rows
+    C{branch_idx} and C{dtype} are as for L{makePTDF}. In particular a
+    vector of slack weights distributes the slack, e.g. over the
+    generators in proportion to their participation factors::
+        slack = Cg * gen[:, APF]
+
+    Only the columns of the buses with generators are computed.
+
+    @see: L{makeGODF}, L{makePTDF}
+    """
+    gbus, j = unique(gen[:, GEN_BUS].astype(int), return_inverse=True)
+    H = makePTDF(baseMVA, bus, branch, slack, branch_idx, gbus, dtype)
+
+    return H[:, j]
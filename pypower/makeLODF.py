@@ -5,7 +5,7 @@
 """Builds the line outage distribution factor matrix.
 """
 
-from numpy import ones, diag, eye, r_, arange
+from numpy import ones, r_, arange, asarray
 from scipy.sparse import csr_matrix as sparse
 
 from pypower.idx_brch import F_BUS, T_BUS
@@ -21,7 +21,10 @@ def makeLODF(branch, PTDF):
         H = makePTDF(baseMVA, bus, branch)
         LODF = makeLODF(branch, H)
 
-    @see: L{makePTDF}
+    The full matrix takes C{nbr^2} entries. Use an L{LODFSolver} to compute
+    only the columns of a list of contingencies.
+
+    @see: L{makePTDF}, L{LODFSolver}
 
     @author: Ray Zimmerman (PSERC Cornell)
     """
@@ -31,9 +34,9 @@ def makeLODF(branch, PTDF):
     Cft = sparse((r_[ones(nl), -ones(nl)],
                       (r_[f, t], r_[arange(nl), arange(nl)])), (nb, nl))
 
-    H = PTDF * Cft
-    h = diag(H, 0)
-    LODF = H / (ones((nl, nl)) - ones((nl, 1)) * h.T)
-    LODF = LODF - diag(diag(LODF)) - eye(nl, nl)
+    H = asarray(Cft.T * asarray(PTDF).T).T     ## = PTDF * Cft
+    h = H.diagonal().copy()
+    LODF = H / (1 - h)
+    LODF[arange(nl), arange(nl)] = -1
 
     return LODF
@@ -7,15 +7,15 @@
 
 from sys import stderr
 
-from numpy import zeros, arange, isscalar, dot, ix_, flatnonzero as find
-
-from numpy.linalg import solve
+from numpy import arange, flatnonzero as find
 
 from pypower.idx_bus import BUS_TYPE, REF, BUS_I
 from pypower.makeBdc import makeBdc
+from pypower.ptdf_solver import PTDFSolver
 
 
-def makePTDF(baseMVA, bus, branch, slack=None):
+def makePTDF(baseMVA, bus, branch, slack=None, branch_idx=None,
+             bus_idx=None, dtype=None):
     """Builds the DC PTDF matrix for a given choice of slack.
 
     Returns the DC PTDF matrix for a given choice of slack. The matrix is
@@ -29,7 +29,14 @@ def makePTDF(baseMVA, bus, branch, slack=None):
     column specifies how the slack should be handled for injections
     at that bus.
 
-    @see: L{makeLODF}
+    If C{branch_idx} and/or C{bus_idx} are given, only the rows of those
+    monitored branches and/or the columns of those injection buses are
+    computed. The result is of type C{dtype} (e.g. C{float32}) if given.
+    The matrix is computed with a sparse factorization of the reduced B
+    matrix. Use a L{PTDFSolver} to keep the factors for further rows or
+    columns, or to compute the rows of large systems in blocks.
+
+    @see: L{makeLODF}, L{PTDFSolver}
 
     @author: Ray Zimmerman (PSERC Cornell)
     """
@@ -38,40 +45,11 @@ def makePTDF(baseMVA, bus, branch, slack=None):
         slack = find(bus[:, BUS_TYPE] == REF)
         slack = slack[0]
 
-    ## set the slack bus to be used to compute initial PTDF
-    if isscalar(slack):
-        slack_bus = slack
-    else:
-        slack_bus = 0      ## use bus 1 for temp slack bus
-
-    nb = bus.shape[0]
-    nbr = branch.shape[0]
-    noref = arange(1, nb)      ## use bus 1 for voltage angle reference
-    noslack = find(arange(nb) != slack_bus)
-
     ## check that bus numbers are equal to indices to bus (one set of bus numbers)
+    nb = bus.shape[0]
     if any(bus[:, BUS_I] != arange(nb)):
         stderr.write('makePTDF: buses must be numbered consecutively')
 
-    ## compute PTDF for single slack_bus
     Bbus, Bf, _, _ = makeBdc(baseMVA, bus, branch)
-    Bbus, Bf = Bbus.todense(), Bf.todense()
-    H = zeros((nbr, nb))
-    H[:, noslack] = solve( Bbus[ix_(noslack, noref)].T, Bf[:, noref].T ).T
-    #             = Bf[:, noref] * inv(Bbus[ix_(noslack, noref)])
-
-    ## distribute slack, if requested
-    if not isscalar(slack):
-        if len(slack.shape) == 1:  ## slack is a vector of weights
-            slack = slack / sum(slack)   ## normalize weights
-
-            ## conceptually, we want to do ...
-            ##    H = H * (eye(nb, nb) - slack * ones((1, nb)))
-            ## ... we just do it more efficiently
-            v = dot(H, slack)
-            for k in range(nb):
-                H[:, k] = H[:, k] - v
-        else:
-            H = dot(H, slack)
 
-    return H
+    return PTDFSolver(Bbus, Bf, slack).ptdf(branch_idx, bus_idx, dtype)
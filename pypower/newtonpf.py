@@ -7,16 +7,18 @@
 
 import sys
 
-from numpy import array, angle, exp, linalg, conj, r_, Inf
+from time import time
 
-from scipy.sparse import hstack, vstack
-from scipy.sparse.linalg import spsolve
+from numpy import angle, exp, linalg, conj, r_, Inf
 
-from pypower.dSbus_dV import dSbus_dV
+from pypower.bus_ordering import order_unknowns
+from pypower.jacobian_plan import JacobianPlan
+from pypower.pflinsolver import pflinsolver
 from pypower.ppoption import ppoption
 
 
-def newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
+def newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None, plan=None, info=None,
+             perm=None, return_solver=False, qlim_fcn=None):
     """Solves the power flow using a full Newton's method.
 
     Solves for bus voltages given the full system admittance matrix (for
@@ -33,7 +35,53 @@ def newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
     flag which indicates whether it converged or not, and the number of
     iterations performed.
 
-    @see: L{runpf}
+    The sparsity pattern of the Jacobian is computed once per call by a
+    L{JacobianPlan}, and each iteration only refills its numerical values.
+    A plan from a previous call can be passed in C{plan} to reuse it; it is
+    used with the values of C{Ybus} if it was built for an admittance
+    matrix with the same sparsity pattern and for these C{pv} and C{pq}
+    lists, otherwise a new one is built.
+
+    The update steps are computed by the linear solver selected with the
+    C{PF_LIN_SOLVER} option (see L{pflinsolver}), which includes
+    preconditioned Krylov solvers for an inexact Newton method, whose
+    forcing terms are adapted to the decrease of the mismatch. If
+    C{PF_JAC_REUSE} is greater than zero, a "dishonest" Newton method is
+    used, which keeps the factored Jacobian for up to that many additional
+    iterations and only refactors it earlier if the ratio of successive
+    mismatch norms exceeds C{PF_JAC_REUSE_TOL}. If a fill-reducing bus
+    ordering C{perm} is given (see L{bus_ordering}), the Jacobian, or its
+    preconditioner, is factored with its rows and columns in that order.
+
+    If a dict is given in C{info}, the number of iterations, the number of
+    Jacobian factorizations and the time spent factoring and solving are
+    added to its C{'iterations'}, C{'factorizations'}, C{'et_factor'} and
+    C{'et_solve'} entries, which allows statistics to be accumulated over
+    several calls. For solvers which compute explicit factors, the fill-in
+    of the last factorization is stored in C{'fill'}, and the iterative
+    solvers add the number of Krylov iterations to C{'lin_iterations'}.
+
+    Buses can be converted from PV to PQ within the iterations, as needed
+    to enforce generator reactive power limits, with a function
+    C{qlim_fcn}, which is called with the current voltages and bus index
+    lists C{ref}, C{pv} and C{pq} whenever the mismatch norm is below the
+    C{PF_QLIM_TOL} option, and at the latest when it is below C{PF_TOL}.
+    It returns C{None} if the bus types stay the same, otherwise the new
+    lists C{ref}, C{pv} and C{pq} and the injections C{Sbus} with the
+    converted buses fixed at their limits. The iterations then continue
+    from the current voltages with a L{JacobianPlan} and a linear solver
+    for the new bus types, and up to C{PF_MAX_IT} more iterations, so that
+    the power flow only converges once all limits are satisfied. The
+    number of conversions and the time spent in them are added to the
+    C{'qlim_switches'} and C{'et_qlim'} entries of C{info}.
+
+    If C{return_solver} is true, the linear solver is returned as a fourth
+    value, with the Jacobian at the final voltages factored in it, for
+    further solves with that Jacobian, e.g. by L{loss_sensitivity}. This
+    takes one more factorization, which reuses the ordering of the earlier
+    ones and is included in the statistics.
+
+    @see: L{runpf}, L{JacobianPlan}, L{pflinsolver}, L{bus_ordering}
 
     @author: Ray Zimmerman (PSERC Cornell)
     """
@@ -45,6 +93,9 @@ def newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
     tol     = ppopt['PF_TOL']
     max_it  = ppopt['PF_MAX_IT']
     verbose = ppopt['VERBOSE']
+    reuse   = ppopt['PF_JAC_REUSE']
+    reuse_tol = ppopt['PF_JAC_REUSE_TOL']
+    qlim_tol = max(ppopt['PF_QLIM_TOL'], tol)
 
     ## initialize
     converged = 0
@@ -54,13 +105,23 @@ def newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
     Vm = abs(V)
 
     ## set up indexing for updating V
-    pvpq = r_[pv, pq]
     npv = len(pv)
     npq = len(pq)
     j1 = 0;         j2 = npv           ## j1:j2 - V angle of pv buses
     j3 = j2;        j4 = j2 + npq      ## j3:j4 - V angle of pq buses
     j5 = j4;        j6 = j4 + npq      ## j5:j6 - V mag of pq buses
 
+    ## sparsity pattern of the Jacobian, fixed for these bus types
+    if plan is None or not plan.matches(Ybus, pv, pq):
+        plan = JacobianPlan(Ybus, pv, pq)
+    else:
+        plan.update(Ybus)
+
+    ## linear solver for the update step, with the unknowns in bus order
+    lin = pflinsolver(ppopt, _order(perm, pv, pq), Ybus, pv, pq)
+    refactor = True         ## factor the Jacobian in the next iteration?
+    age = 0                 ## iterations since the last factorization
+
     ## evaluate F(x0)
     mis = V * conj(Ybus * V) - Sbus
     F = r_[  mis[pv].real,
@@ -73,31 +134,64 @@ def newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
         sys.stdout.write('\n it    max P & Q mismatch (p.u.)')
         sys.stdout.write('\n----  ---------------------------')
         sys.stdout.write('\n%3d        %10.3e' % (i, normF))
-    if normF < tol:
-        converged = 1
-        if verbose > 1:
-            sys.stdout.write('\nConverged!\n')
 
-    ## do Newton iterations
-    while (not converged and i < max_it):
-        ## update iteration counter
-        i = i + 1
+    ## do Newton iterations, up to max_it after the last change of bus types
+    it0 = 0
+    while True:
+        ## convert PV buses to PQ buses within the iterations, until the
+        ## limits of the remaining PV buses are satisfied at this point
+        tq = time()
+        while qlim_fcn is not None and normF < qlim_tol:
+            types = qlim_fcn(V, ref, pv, pq)
+            if types is None:
+                break
+            ref, pv, pq, Sbus = types
+            npv = len(pv)
+            npq = len(pq)
+            j1 = 0;         j2 = npv           ## j1:j2 - V angle of pv buses
+            j3 = j2;        j4 = j2 + npq      ## j3:j4 - V angle of pq buses
+            j5 = j4;        j6 = j4 + npq      ## j5:j6 - V mag of pq buses
+
+            ## Jacobian structure and linear solver for the new bus types
+            if info is not None:
+                _add_stats(info, lin.stats())
+                info['qlim_switches'] = info.get('qlim_switches', 0) + 1
+            plan = JacobianPlan(plan.Ybus, pv, pq)
+            lin = pflinsolver(ppopt, _order(perm, pv, pq), Ybus, pv, pq)
+            refactor = True
+            it0 = i
+
+            mis = V * conj(Ybus * V) - Sbus
+            F = r_[  mis[pv].real,
+                     mis[pq].real,
+                     mis[pq].imag  ]
+            normF = linalg.norm(F, Inf)
+            if verbose > 1:
+                sys.stdout.write('\n%3d        %10.3e  (PV to PQ)' %
+                                 (i, normF))
+        if qlim_fcn is not None and info is not None:
+            info['et_qlim'] = info.get('et_qlim', 0) + time() - tq
 
-        ## evaluate Jacobian
-        dS_dVm, dS_dVa = dSbus_dV(Ybus, V)
+        if normF < tol:
+            converged = 1
+            if verbose:
+                sys.stdout.write("\nNewton's method power flow converged in "
+                                 "%d iterations.\n" % i)
+            break
+        if i - it0 >= max_it:
+            break
 
-        J11 = dS_dVa[array([pvpq]).T, pvpq].real
-        J12 = dS_dVm[array([pvpq]).T, pq].real
-        J21 = dS_dVa[array([pq]).T, pvpq].imag
-        J22 = dS_dVm[array([pq]).T, pq].imag
+        ## update iteration counter
+        i = i + 1
 
-        J = vstack([
-                hstack([J11, J12]),
-                hstack([J21, J22])
-            ], format="csr")
+        ## evaluate and factor Jacobian
+        if refactor:
+            lin.factor(plan.jac(V))
+            age = 0
 
         ## compute update step
-        dx = -1 * spsolve(J, F)
+        dx = -1 * lin.solve(F)
+        age = age + 1
 
         ## update voltage
         if npv:
@@ -115,19 +209,46 @@ def newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
                  mis[pq].real,
                  mis[pq].imag  ]
 
-        ## check for convergence
+        ## mismatch norm, checked for convergence at the top of the loop
+        normF0 = normF
         normF = linalg.norm(F, Inf)
+        refactor = age > reuse or normF > reuse_tol * normF0
         if verbose > 1:
             sys.stdout.write('\n%3d        %10.3e' % (i, normF))
-        if normF < tol:
-            converged = 1
-            if verbose:
-                sys.stdout.write("\nNewton's method power flow converged in "
-                                 "%d iterations.\n" % i)
 
     if verbose:
         if not converged:
             sys.stdout.write("\nNewton's method power did not converge in %d "
                              "iterations.\n" % i)
 
+    ## factor the Jacobian at the solution
+    if return_solver:
+        lin.factor(plan.jac(V))
+
+    if info is not None:
+        stats = lin.stats()
+        stats['iterations'] = i
+        _add_stats(info, stats)
+
+    if return_solver:
+        return V, converged, i, lin
+
     return V, converged, i
+
+
+def _order(perm, pv, pq):
+    """Order of the unknowns for the bus ordering C{perm}, if any.
+    """
+    return None if perm is None else order_unknowns(perm, pv, pq, pq)
+
+
+def _add_stats(info, stats):
+    """Adds the statistics C{stats} of a linear solver to C{info}.
+    """
+    for key in ['iterations', 'factorizations', 'et_factor', 'et_solve']:
+        info[key] = info.get(key, 0) + stats.get(key, 0)
+    if 'lin_iterations' in stats:
+        info['lin_iterations'] = \
+            info.get('lin_iterations', 0) + stats['lin_iterations']
+    if stats['fill'] is not None:
+        info['fill'] = stats['fill']
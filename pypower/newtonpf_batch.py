@@ -0,0 +1,141 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Solves a batch of power flows using a full Newton's method.
+"""
+
+import sys
+
+from numpy import \
+    angle, exp, conj, c_, zeros, tile, isfinite, atleast_2d, \
+    flatnonzero as find
+
+from scipy.sparse.linalg import spsolve
+
+from pypower.jacobian_plan import JacobianPlan
+from pypower.ppoption import ppoption
+
+
+def newtonpf_batch(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
+    """Solves a batch of power flows using a full Newton's method.
+
+    Solves for bus voltages for a number of scenarios that share the same
+    network, i.e. the same full system admittance matrix C{Ybus} and the
+    same lists of bus indices for the swing bus, PV buses, and PQ buses.
+    C{Sbus} is an C{nscen x nb} matrix whose rows are the complex bus power
+    injection vectors of the individual scenarios. C{V0} is either a single
+    vector of initial complex bus voltages used for every scenario or an
+    C{nscen x nb} matrix of per scenario initial voltages (see L{newtonpf}
+    for the meaning of its entries).
+
+    Mismatches and voltage updates are evaluated for all scenarios at once.
+    In each iteration the Jacobians of the scenarios that are still active
+    are filled in from a single L{JacobianPlan} and stacked into one block
+    diagonal system that is factored and solved in one call. A scenario is
+    dropped from the active set as soon as it has converged (or has diverged
+    to a non-finite mismatch), so that the cost of an iteration is
+    proportional to the number of scenarios still being solved.
+
+    C{ppopt} is a PYPOWER options vector (see L{ppoption}), of which the
+    C{PF_TOL}, C{PF_MAX_IT} and C{VERBOSE} options are used. Returns the
+    C{nscen x nb} matrix of final complex voltages, a boolean vector of
+    convergence flags and a vector with the number of iterations performed
+    for each scenario.
+
+    @see: L{newtonpf}, L{runpf_batch}
+    """
+    ## default arguments
+    if ppopt is None:
+        ppopt = ppoption()
+
+    ## options
+    tol     = ppopt['PF_TOL']
+    max_it  = ppopt['PF_MAX_IT']
+    verbose = ppopt['VERBOSE']
+
+    ## initialize
+    Sbus = atleast_2d(Sbus)
+    ns = Sbus.shape[0]
+    if V0.ndim == 1:
+        V = tile(V0, (ns, 1))
+    else:
+        V = V0.copy()
+    Va = angle(V)
+    Vm = abs(V)
+    iterations = zeros(ns, int)
+    i = 0
+
+    ## set up indexing for updating V
+    npv = len(pv)
+    npq = len(pq)
+    j1 = 0;         j2 = npv           ## j1:j2 - V angle of pv buses
+    j3 = j2;        j4 = j2 + npq      ## j3:j4 - V angle of pq buses
+    j5 = j4;        j6 = j4 + npq      ## j5:j6 - V mag of pq buses
+    nx = j6
+
+    ## sparsity pattern of the Jacobian, shared by all scenarios
+    plan = JacobianPlan(Ybus, pv, pq)
+
+    ## evaluate F(x0) for all scenarios
+    mis = V * conj(Ybus * V.T).T - Sbus
+    F = c_[ mis[:, pv].real,
+            mis[:, pq].real,
+            mis[:, pq].imag ]
+
+    ## check tolerance
+    normF = abs(F).max(1) if nx else zeros(ns)
+    converged = normF < tol
+    if verbose > 1:
+        sys.stdout.write('\n it    active    max P & Q mismatch (p.u.)')
+        sys.stdout.write('\n----  --------  ---------------------------')
+        sys.stdout.write('\n%3d   %8d        %10.3e' % (i, ns, normF.max()))
+
+    ## do Newton iterations on the scenarios which are still active
+    active = find(~converged & isfinite(normF))
+    while len(active) and i < max_it:
+        ## update iteration counter
+        i = i + 1
+        na = len(active)
+
+        ## evaluate Jacobians, one diagonal block per active scenario
+        J = plan.jac_batch(V[active])
+
+        ## compute update step for all active scenarios with one solve
+        dx = -1 * spsolve(J, F[active].reshape(na * nx))
+        dx = dx.reshape(na, nx)
+
+        ## update voltage
+        Vaa = Va[active]
+        Vma = Vm[active]
+        if npv:
+            Vaa[:, pv] = Vaa[:, pv] + dx[:, j1:j2]
+        if npq:
+            Vaa[:, pq] = Vaa[:, pq] + dx[:, j3:j4]
+            Vma[:, pq] = Vma[:, pq] + dx[:, j5:j6]
+        Vact = Vma * exp(1j * Vaa)
+        V[active] = Vact
+        Vm[active] = abs(Vact)        ## update Vm and Va again in case
+        Va[active] = angle(Vact)      ## we wrapped around with a negative Vm
+
+        ## evalute F(x) for the active scenarios
+        mis = V[active] * conj(Ybus * V[active].T).T - Sbus[active]
+        F[active] = c_[ mis[:, pv].real,
+                        mis[:, pq].real,
+                        mis[:, pq].imag ]
+
+        ## check for convergence, drop converged/diverged scenarios
+        normF[active] = abs(F[active]).max(1)
+        iterations[active] = i
+        converged[active] = normF[active] < tol
+        if verbose > 1:
+            sys.stdout.write('\n%3d   %8d        %10.3e' %
+                             (i, na, normF[active].max()))
+        active = active[~converged[active] & isfinite(normF[active])]
+
+    if verbose:
+        sys.stdout.write("\nNewton's method power flow converged for %d of "
+                         "%d scenarios in %d iterations.\n" %
+                         (converged.sum(), ns, i))
+
+    return V, converged, iterations
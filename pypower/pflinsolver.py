@@ -0,0 +1,391 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Linear solvers for the Newton power flow update step.
+"""
+
+from time import time
+
+from numpy import argsort, empty_like, r_, ix_, linalg
+
+from scipy import __version__ as scipy_version
+from scipy.sparse.linalg import spsolve, splu, spilu, gmres, bicgstab, \
+    LinearOperator
+
+from pypower.ppoption import ppoption
+
+## tolerance keywords of the Krylov solvers of SciPy, which renamed the
+## relative tolerance tol to rtol in 1.12 and has no atol before 1.1
+_SCIPY_VERSION = tuple(int(v) for v in scipy_version.split('.')[:2])
+_RTOL = 'rtol' if _SCIPY_VERSION >= (1, 12) else 'tol'
+_ATOL = {'atol': 0.0} if _SCIPY_VERSION >= (1, 1) else {}
+
+
+def pflinsolver(ppopt=None, perm=None, Ybus=None, pv=None, pq=None):
+    """Returns the linear solver for the Newton update step.
+
+    Selects the solver according to the C{PF_LIN_SOLVER} option and returns
+    a new instance of it. A C{PF_JAC_REUSE} value greater than zero requires
+    a solver that keeps its factorization, so it selects L{LUSolver} if the
+    direct solver would have been used otherwise. So does an ordering of
+    the unknowns given in C{perm}, which is passed on to the L{LUSolver}.
+
+    The iterative solvers (C{PF_LIN_SOLVER} 2 and 3) are preconditioned as
+    selected by C{PF_KRYLOV_PREC}. The fast-decoupled preconditioner is
+    built from the admittance matrix C{Ybus} and the lists of PV and PQ
+    buses C{pv} and C{pq} that define the unknowns of the Jacobian.
+
+    @see: L{newtonpf}, L{ppoption}
+    """
+    if ppopt is None:
+        ppopt = ppoption()
+
+    alg = ppopt['PF_LIN_SOLVER']
+    if alg == 0 and (ppopt['PF_JAC_REUSE'] > 0 or perm is not None):
+        alg = 1
+
+    if alg == 0:
+        return DirectSolver()
+    elif alg == 1:
+        return LUSolver(perm)
+    elif alg == 2 or alg == 3:
+        prec = ppopt['PF_KRYLOV_PREC']
+        if prec == 0:
+            M = ILUSolver(perm)
+        elif prec == 1:
+            if Ybus is None:
+                raise ValueError('pflinsolver: the fast-decoupled '
+                                 'preconditioner requires Ybus, pv and pq')
+            M = FDPreconditioner(Ybus, pv, pq, perm)
+        else:
+            raise ValueError('pflinsolver: unknown PF_KRYLOV_PREC value %d'
+                             % prec)
+        return KrylovSolver(gmres if alg == 2 else bicgstab, M,
+                            ppopt['PF_KRYLOV_ETA'], ppopt['PF_KRYLOV_MAX_IT'],
+                            ppopt['PF_TOL'])
+    else:
+        raise ValueError('pflinsolver: unknown PF_LIN_SOLVER value %d' % alg)
+
+
+class LinearSolver(object):
+    """Base class of the linear solvers for the Newton update step.
+
+    A solver is given a matrix with L{factor} and can then solve any number
+    of systems with that matrix with L{solve}. It counts the factorizations
+    it performs and accumulates the time spent factoring and solving, see
+    L{stats}. Solvers which compute explicit factors also record the
+    fill-in of the last factorization.
+    """
+
+    #: C{True} if L{solve_transposed} solves systems with the transposed
+    #: matrix exactly
+    transposable = False
+
+    def __init__(self):
+        #: number of numerical factorizations performed
+        self.factorizations = 0
+        #: number of entries of the last factors (L and U, with a single
+        #: diagonal) in excess of those of the factored matrix, C{None} if
+        #: not known
+        self.fill = None
+        #: number of systems solved
+        self.solves = 0
+        #: time spent in factorizations (seconds)
+        self.et_factor = 0.0
+        #: time spent in solves, excluding factorizations (seconds)
+        self.et_solve = 0.0
+
+    def factor(self, A):
+        """Sets the matrix of the systems to be solved next.
+        """
+        raise NotImplementedError
+
+    def solve(self, b):
+        """Solves C{A * x = b} for the matrix given to L{factor}.
+        """
+        raise NotImplementedError
+
+    def solve_transposed(self, b):
+        """Solves C{A.T * x = b} for the matrix given to L{factor}.
+
+        Only available for solvers with C{transposable} set.
+        """
+        raise NotImplementedError
+
+    def stats(self):
+        """Returns a dict with the counters and timings of the solver.
+        """
+        return {'factorizations': self.factorizations,
+                'solves': self.solves,
+                'et_factor': self.et_factor,
+                'et_solve': self.et_solve,
+                'fill': self.fill}
+
+
+class DirectSolver(LinearSolver):
+    """Solves each system from scratch with C{spsolve}.
+
+    The fill-reducing ordering, the symbolic analysis and the numerical
+    factorization are all recomputed by every call to L{solve}, so each
+    solve counts as a factorization and its time as factorization time.
+    """
+
+    transposable = True
+
+    def factor(self, A):
+        self.A = A
+
+    def solve(self, b):
+        t0 = time()
+        x = spsolve(self.A, b)
+        self.et_factor += time() - t0
+        self.factorizations += 1
+        self.solves += 1
+        return x
+
+    def solve_transposed(self, b):
+        t0 = time()
+        x = spsolve(self.A.T.tocsc(), b)
+        self.et_factor += time() - t0
+        self.factorizations += 1
+        self.solves += 1
+        return x
+
+
+class LUSolver(LinearSolver):
+    """Sparse LU solver which keeps its column ordering.
+
+    The first call to L{factor} computes a fill-reducing column ordering
+    (COLAMD) as part of the factorization. Later calls apply that ordering
+    to the new matrix and factor it without computing a new ordering, which
+    is valid as long as the sparsity pattern does not change, as is the
+    case for the Jacobians of one Newton power flow. The numerical
+    factorization is kept between calls to L{solve}, so it can be reused
+    for several right hand sides or Newton iterations.
+
+    Alternatively an ordering can be given in C{perm}, e.g. one derived
+    from a L{bus_ordering}, which is applied to both the rows and the
+    columns, so that the factorization of a structurally symmetric matrix
+    pivots on the diagonal where possible and follows the given ordering.
+
+    The factors also solve systems with the transposed matrix, see
+    L{solve_transposed}.
+    """
+
+    transposable = True
+
+    def __init__(self, perm=None):
+        super(LUSolver, self).__init__()
+        #: column ordering used by the factorization, C{None} until the
+        #: first call to L{factor} unless given
+        self.perm = perm
+        self.lu = None
+        self._permuted = False
+        self._symmetric = perm is not None
+
+    def factor(self, A):
+        t0 = time()
+        if self._symmetric:
+            p = self.perm
+            self.lu = self._lu(A[p, :][:, p].tocsc(), permc_spec='NATURAL',
+                               diag_pivot_thresh=0.001,
+                               options=dict(SymmetricMode=True))
+            self._permuted = True
+        elif self.perm is None:
+            self.lu = self._lu(A.tocsc(), permc_spec='COLAMD')
+            self.perm = argsort(self.lu.perm_c)
+            self._permuted = False
+        else:
+            self.lu = self._lu(A[:, self.perm].tocsc(), permc_spec='NATURAL')
+            self._permuted = True
+        self.et_factor += time() - t0
+        self.factorizations += 1
+        self.fill = self.lu.L.nnz + self.lu.U.nnz - A.shape[0] - A.nnz
+
+    def solve(self, b):
+        return self._solve(b, 'N')
+
+    def solve_transposed(self, b):
+        return self._solve(b, 'T')
+
+    def _solve(self, b, trans):
+        t0 = time()
+        if self._symmetric:
+            ## Q.T * A * Q factored, its transpose is Q.T * A.T * Q
+            b = b[self.perm]
+        elif self._permuted and trans == 'T':
+            ## A * Q factored, (A * Q).T * x = Q.T * b solves A.T * x = b
+            b = b[self.perm]
+        y = self.lu.solve(b, trans)
+        if self._symmetric or (self._permuted and trans == 'N'):
+            x = empty_like(y)
+            x[self.perm] = y
+        else:
+            x = y
+        self.et_solve += time() - t0
+        self.solves += 1
+        return x
+
+    def _lu(self, A, **kw):
+        """Returns the factors of the CSC matrix C{A}.
+        """
+        return splu(A, **kw)
+
+
+class ILUSolver(LUSolver):
+    """Incomplete LU factorization, for use as a preconditioner.
+
+    Works like L{LUSolver}, including the reuse of its column ordering or
+    the use of a given ordering C{perm}, but computes an incomplete
+    factorization with C{spilu}, dropping entries smaller than C{drop_tol}
+    and limiting the number of entries of the factors to about
+    C{fill_factor} times those of the matrix. L{solve} and
+    L{solve_transposed} return approximate solutions.
+    """
+
+    transposable = False
+
+    def __init__(self, perm=None, drop_tol=1e-4, fill_factor=10):
+        super(ILUSolver, self).__init__(perm)
+        self.drop_tol = drop_tol
+        self.fill_factor = fill_factor
+
+    def _lu(self, A, **kw):
+        return spilu(A, drop_tol=self.drop_tol, fill_factor=self.fill_factor,
+                     **kw)
+
+
+class FDPreconditioner(LinearSolver):
+    """Fast-decoupled block preconditioner for the Newton update step.
+
+    Approximates the Jacobian with unknowns C{[Va(pv), Va(pq), Vm(pq)]} by
+    the block diagonal matrix of the reduced B matrices of the
+    fast-decoupled method, using minus the imaginary part of C{Ybus} for
+    both B prime (rows and columns of the PV and PQ buses) and B double
+    prime (rows and columns of the PQ buses). Both are factored by
+    L{LUSolver}s on the first call to L{factor} and kept for the rest of
+    the power flow, since they do not depend on the voltages. An ordering
+    C{perm} of the unknowns of the Jacobian is applied to both blocks.
+    """
+
+    def __init__(self, Ybus, pv, pq, perm=None):
+        super(FDPreconditioner, self).__init__()
+        self.Ybus, self.pv, self.pq = Ybus, pv, pq
+        self.n1 = len(pv) + len(pq)     ## number of voltage angles
+        self._Bp = None
+        self._Bpp = None
+        if perm is None:
+            self._perm = (None, None)
+        else:
+            self._perm = (perm[perm < self.n1],
+                          perm[perm >= self.n1] - self.n1)
+
+    def factor(self, A):
+        if self._Bp is not None:
+            return
+
+        pvpq = r_[self.pv, self.pq]
+        self._Bp = LUSolver(self._perm[0])
+        self._Bp.factor(-self.Ybus[ix_(pvpq, pvpq)].imag)
+        self._Bpp = LUSolver(self._perm[1])
+        self._Bpp.factor(-self.Ybus[ix_(self.pq, self.pq)].imag)
+        self.factorizations = 2
+        self.et_factor = self._Bp.et_factor + self._Bpp.et_factor
+        self.fill = self._Bp.fill + self._Bpp.fill
+
+    def solve(self, b):
+        t0 = time()
+        x = r_[self._Bp.solve(b[:self.n1]), self._Bpp.solve(b[self.n1:])]
+        self.et_solve += time() - t0
+        self.solves += 1
+        return x
+
+
+class KrylovSolver(LinearSolver):
+    """Preconditioned Krylov solver with inexact Newton forcing terms.
+
+    Solves the systems with the Krylov method C{method}, C{gmres} or
+    C{bicgstab} from C{scipy.sparse.linalg}, preconditioned by the linear
+    solver C{M}, e.g. an L{ILUSolver} or an L{FDPreconditioner}, which is
+    given the matrix by L{factor} and applied from the right. Only the
+    preconditioner is factored, so the factorizations, factorization time
+    and fill-in reported by L{stats} are those of C{M}, and the number of
+    Krylov iterations, as the number of applications of the
+    preconditioner, is returned as C{'lin_iterations'}.
+
+    Each system is solved to a relative residual given by a forcing term
+    of the Eisenstat-Walker type (choice 2), which is at most C{eta_max},
+    is reduced as fast as the norm of the right hand side, i.e. the Newton
+    mismatch, decreases, and is kept from being smaller than necessary to
+    reach a mismatch of C{tol}. A solve which does not reach its tolerance
+    in C{maxiter} iterations returns its last iterate.
+    """
+
+    def __init__(self, method, M, eta_max=0.1, maxiter=100, tol=1e-8):
+        super(KrylovSolver, self).__init__()
+        self.method = method
+        self.M = M
+        self.eta_max = eta_max
+        self.maxiter = maxiter
+        self.tol = tol
+        #: number of Krylov iterations performed
+        self.lin_iterations = 0
+        self.A = None
+        self._eta = None            ## last forcing term
+        self._normb = None          ## norm of the last right hand side
+
+    def factor(self, A):
+        self.A = A
+        self.M.factor(A)
+
+    def solve(self, b):
+        t0 = time()
+        normb = linalg.norm(b)
+
+        ## forcing term
+        eta = self.eta_max
+        if self._normb is not None:
+            eta = 0.9 * (normb / self._normb) ** 2
+            if 0.9 * self._eta ** 2 > 0.1:
+                eta = max(eta, 0.9 * self._eta ** 2)
+            eta = min(eta, self.eta_max)
+        if normb > 0:
+            eta = max(eta, 0.5 * self.tol / normb)
+        self._eta, self._normb = eta, normb
+
+        ## right preconditioning, A * inv(M) * y = b with x = inv(M) * y, so
+        ## that the Krylov method works with the true residual, for the
+        ## normalized right hand side, since older versions of scipy test
+        ## the residual against an absolute tolerance if the norm of the
+        ## right hand side is smaller than one
+        its = self.M.solves
+        A, Msolve = self.A, self.M.solve
+        AM = LinearOperator(A.shape, matvec=lambda y: A * Msolve(y),
+                            dtype=b.dtype)
+        if normb > 0:
+            y, _ = _krylov(self.method, AM, b / normb, eta, self.maxiter)
+            x = Msolve(y) * normb
+        else:
+            x = 0 * b
+        self.lin_iterations += self.M.solves - its - (normb > 0)
+
+        self.et_solve += time() - t0
+        self.solves += 1
+        return x
+
+    def stats(self):
+        return {'factorizations': self.M.factorizations,
+                'solves': self.solves,
+                'et_factor': self.M.et_factor,
+                'et_solve': self.et_solve,
+                'fill': self.M.fill,
+                'lin_iterations': self.lin_iterations}
+
+
+def _krylov(method, A, b, tol, maxiter):
+    """Calls a Krylov solver of scipy with relative tolerance C{tol}.
+    """
+    kw = {_RTOL: tol}
+    kw.update(_ATOL)
+    return method(A, b, maxiter=maxiter, **kw)
@@ -5,15 +5,18 @@
 """Python Interior Point Solver (PIPS).
 """
 
+from time import time
+
 from numpy import array, Inf, any, isnan, ones, r_, finfo, \
-    zeros, dot, absolute, log, flatnonzero as find
+    zeros, dot, absolute, log, nan, flatnonzero as find
 
 from numpy.linalg import norm
 
-from scipy.sparse import vstack, hstack, eye, csr_matrix as sparse
-from scipy.sparse.linalg import spsolve
+from scipy.sparse import vstack, hstack, eye
 
 from pypower.pipsver import pipsver
+from pypower.kkt_plan import KKTPlan
+from pypower.pflinsolver import LUSolver
 
 
 EPS = finfo(float).eps
@@ -89,6 +92,13 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
         IEEE Transactions on Power Systems, Vol. 22, No. 3, Aug. 2007,
         pp. 1185-1193.
 
+    The sparsity pattern of the Newton (KKT) system is computed once by a
+    L{KKTPlan} and only its values are refilled in each iteration, as long
+    as the patterns of the Hessian and the constraint gradients fit into
+    it. The system is solved by an L{LUSolver}, which keeps the column
+    ordering of its first factorization for all later ones with the same
+    pattern.
+
     All parameters are optional except C{f_fcn} and C{x0}.
     @param f_fcn: Function that evaluates the objective function, its gradients
                   and Hessian for a given value of M{x}. If there are
@@ -154,7 +164,11 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
                    - C{iterations} - number of iterations performed
                    - C{hist} - list of arrays with trajectories of the
                      following: feascond, gradcond, compcond, costcond, gamma,
-                     stepsize, obj, alphap, alphad
+                     stepsize, obj, alphap, alphad, et_assemble (time to
+                     assemble the KKT system), et_solve (time to factor and
+                     solve it)
+                   - C{kkt_orderings} - number of KKT sparsity patterns,
+                     each analysed and ordered once
                    - C{message} - exit message
                - C{lmbda} - dictionary containing the Langrange and Kuhn-Tucker
                  multipliers on the constraints, with keys:
@@ -334,7 +348,13 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
     # save history
     hist.append({'feascond': feascond, 'gradcond': gradcond,
         'compcond': compcond, 'costcond': costcond, 'gamma': gamma,
-        'stepsize': 0, 'obj': f / opt["cost_mult"], 'alphap': 0, 'alphad': 0})
+        'stepsize': 0, 'obj': f / opt["cost_mult"], 'alphap': 0, 'alphad': 0,
+        'et_assemble': 0.0, 'et_solve': 0.0})
+
+    # KKT system structure and its solver
+    plan = None
+    lin = None
+    orderings = 0
 
     if opt["verbose"]:
         s = '-sc' if opt["step_control"] else ''
@@ -373,21 +393,25 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
         else:
             _, _, d2f = f_fcn(x, True)      # cost
             Lxx = d2f * opt["cost_mult"]
-        rz = range(len(z))
-        zinvdiag = sparse((1.0 / z, (rz, rz))) if len(z) else None
-        rmu = range(len(mu))
-        mudiag = sparse((mu, (rmu, rmu))) if len(mu) else None
-        dh_zinv = None if dh is None else dh * zinvdiag
-        M = Lxx if dh is None else Lxx + dh_zinv * mudiag * dh.T
-        N = Lx if dh is None else Lx + dh_zinv * (mudiag * h + gamma * e)
-
-        Ab = sparse(M) if dg is None else vstack([
-            hstack([M, dg]),
-            hstack([dg.T, sparse((neq, neq))])
-        ])
+        t0 = time()
+        N = Lx if dh is None else Lx + dh * ((mu * h + gamma * e) / z)
         bb = r_[-N, -g]
 
-        dxdlam = spsolve(Ab.tocsr(), bb)
+        # KKT matrix, with a new structure only if the pattern changed
+        Ab = None if plan is None else plan.kkt(Lxx, dh, dg, mu / z)
+        if Ab is None:
+            plan = KKTPlan(Lxx, dh, dg, plan)
+            lin = LUSolver()
+            orderings += 1
+            Ab = plan.kkt(Lxx, dh, dg, mu / z)
+        t1 = time()
+
+        try:
+            lin.factor(Ab)
+            dxdlam = lin.solve(bb)
+        except RuntimeError:            ## singular
+            dxdlam = nan * bb
+        et_assemble, et_solve = t1 - t0, time() - t1
 
         if any(isnan(dxdlam)):
             if opt["verbose"]:
@@ -398,7 +422,7 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
         dx = dxdlam[:nx]
         dlam = dxdlam[nx:nx + neq]
         dz = -h - z if dh is None else -h - z - dh.T * dx
-        dmu = -mu if dh is None else -mu + zinvdiag * (gamma * e - mudiag * dz)
+        dmu = -mu if dh is None else -mu + (gamma * e - mu * dz) / z
 
         # optional step-size control
         sc = False
@@ -558,7 +582,8 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
         hist.append({'feascond': feascond, 'gradcond': gradcond,
             'compcond': compcond, 'costcond': costcond, 'gamma': gamma,
             'stepsize': norm(dx), 'obj': f / opt["cost_mult"],
-            'alphap': alphap, 'alphad': alphad})
+            'alphap': alphap, 'alphad': alphad,
+            'et_assemble': et_assemble, 'et_solve': et_solve})
 
         if opt["verbose"] > 1:
             print("%3d  %12.8g %10.5g %12g %12g %12g %12g" %
@@ -599,7 +624,8 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
     else:
         raise
 
-    output = {"iterations": i, "hist": hist, "message": message}
+    output = {"iterations": i, "hist": hist, "message": message,
+              "kkt_orderings": orderings}
 
     # zero out multipliers on non-binding constraints
     mu[find( (h < -opt["feastol"]) & (mu < mu_threshold) )] = 0.0
@@ -13,7 +13,8 @@ PF_OPTIONS = [
 1 - Newton's method,
 2 - Fast-Decoupled (XB version),
 3 - Fast-Decoupled (BX version),
-4 - Gauss Seidel'''),
+4 - Gauss Seidel,
+5 - backward/forward sweep (radial networks only)'''),
 
     ('pf_tol', 1e-8, 'termination tolerance on per unit P & Q mismatch'),
 
@@ -25,9 +26,61 @@ PF_OPTIONS = [
     ('pf_max_it_gs', 1000, 'maximum number of iterations for '
      'Gauss-Seidel method'),
 
+    ('pf_max_it_bfsw', 100, 'maximum number of iterations for '
+     'backward/forward sweep method'),
+
+    ('pf_gs_sweep', 0, '''Gauss-Seidel voltage update:
+0 - sequential sweep over the buses,
+1 - Jacobi, all buses at once (vectorized),
+2 - sweep over the colors of a graph coloring (vectorized)'''),
+
+    ('pf_lin_solver', 0, '''linear solver for Newton's method update step:
+0 - direct solve, new ordering and factorization each iteration,
+1 - sparse LU, column ordering computed once per power flow,
+2 - GMRES, preconditioned as selected by PF_KRYLOV_PREC,
+3 - BiCGSTAB, preconditioned as selected by PF_KRYLOV_PREC'''),
+
+    ('pf_krylov_prec', 0, '''preconditioner of the iterative linear solvers:
+0 - incomplete LU factorization of the Jacobian,
+1 - fast-decoupled, block diagonal B prime and B double prime from Ybus,
+    factored once per power flow'''),
+
+    ('pf_krylov_eta', 0.1, '''maximum forcing term (relative residual
+tolerance) of the iterative linear solvers, reduced as the Newton
+mismatch decreases'''),
+
+    ('pf_krylov_max_it', 100, 'maximum number of iterations of the '
+     'iterative linear solvers per update step'),
+
+    ('pf_jac_reuse', 0, '''maximum number of additional Newton iterations
+a factored Jacobian may be reused for (0 - full Newton's method),
+values > 0 imply PF_LIN_SOLVER = 1'''),
+
+    ('pf_jac_reuse_tol', 0.5, '''refactor a reused Jacobian as soon as the
+ratio of successive max P & Q mismatches exceeds this value'''),
+
+    ('pf_ordering', 0, '''fill-reducing bus ordering for the factorizations
+of Newton's method and the fast-decoupled methods:
+0 - none, column ordering of the linear solver,
+1 - reverse Cuthill-McKee,
+2 - minimum degree on the admittance matrix structure'''),
+
+    ('pf_warm_cache_size', 0, '''number of converged AC power flow solutions
+kept for warm starts of cases with the same topology (0 - no warm starts)'''),
+
+    ('pf_islands', 0, '''power flow of networks split into islands:
+0 - solve the network as a whole,
+1 - solve each island separately, with its own slack bus,
+2 - same as 1, islands solved in parallel processes'''),
+
     ('enforce_q_lims', False, 'enforce gen reactive power limits, at '
      'expense of |V|'),
 
+    ('pf_qlim_tol', 1e-3, '''max P & Q mismatch (p.u.) below which Newton's
+method checks the gen reactive power limits and converts PV buses to PQ
+within its iterations (ENFORCE_Q_LIMS), 0 - new power flow from the
+previous solution after each conversion'''),
+
     ('pf_dc', False, '''use DC power flow formulation, for power flow and OPF:
 False - use AC formulation & corresponding algorithm opts,
 True  - use DC formulation, ignore AC algorithm options''')
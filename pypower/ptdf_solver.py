@@ -0,0 +1,182 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""DC PTDF computation with a cached factorization.
+"""
+
+from numpy import arange, array, asarray, zeros, isscalar, dot, ix_, \
+    multiply, flatnonzero as find
+
+from pypower.bus_ordering import order_unknowns
+from pypower.pflinsolver import LUSolver
+
+#: default bound on the number of entries of a block yielded by
+#: L{PTDFSolver.blocks}
+BLOCK_ENTRIES = 2**22
+
+
+class PTDFSolver(object):
+    """DC PTDF computation with a cached factorization.
+
+    Holds the full system C{Bbus} matrix and the branch matrix C{Bf}, as
+    returned by L{makeBdc}, and the slack distribution, together with the
+    LU factors of the B matrix reduced to the non-slack buses, which are
+    computed when they are first needed. The C{slack} is given as for
+    L{makePTDF}: a bus index, a vector of weights specifying the proportion
+    of the slack taken up at each bus, or an C{nb x nb} matrix.
+
+    Rows and columns of the PTDF matrix are computed with forward and back
+    substitutions, never forming the inverse of the reduced B matrix: the
+    rows of a set of monitored branches with one solve per branch, the
+    columns of a set of injection buses with one solve per bus, whichever
+    takes fewer. L{blocks} yields the rows in blocks of bounded size, for
+    PTDF matrices too large to be held in memory, and L{flows} returns the
+    branch flows C{H * P} of injections C{P} without computing C{H} at all.
+
+    The reduced B matrix is factored by an L{LUSolver}, in the order of
+    the fill-reducing bus ordering C{perm} if one is given (see
+    L{bus_ordering}), otherwise with a COLAMD column ordering.
+
+    Example::
+        Bbus, Bf, _, _ = makeBdc(baseMVA, bus, branch)
+        solver = PTDFSolver(Bbus, Bf, slack)
+        H = solver.ptdf(branch_idx=monitored)
+        for rows, Hk in solver.blocks(dtype=float32):
+            ...
+
+    @see: L{makePTDF}, L{makeBdc}
+    """
+
+    def __init__(self, Bbus, Bf, slack=0, perm=None):
+        #: number of factorizations of the reduced B matrix performed
+        self.factorizations = 0
+        #: time spent in factorizations (seconds)
+        self.et_factor = 0.0
+        #: fill-in of the current factors
+        self.fill = 0
+        #: fill-reducing bus ordering, C{None} for none
+        self.perm = perm
+
+        self.Bbus, self.Bf = Bbus.tocsr(), Bf.tocsr()
+        nb = self.Bbus.shape[0]
+
+        ## set the slack bus to be used to compute the initial PTDF
+        if isscalar(slack):
+            self.slack_bus = int(slack)
+            self.slack = None
+        else:
+            self.slack_bus = 0      ## use bus 1 for temp slack bus
+            self.slack = asarray(slack, float)
+            if self.slack.ndim == 1:    ## slack is a vector of weights
+                self.slack = self.slack / sum(self.slack)   ## normalize
+
+        self.noslack = find(arange(nb) != self.slack_bus)
+        self._Bf = self.Bf[:, self.noslack].tocsr()
+        self._solver = None
+
+    def factor(self):
+        """Factors the reduced B matrix, unless factors are available.
+        """
+        if self._solver is None:
+            noslack = self.noslack
+            self._solver = LUSolver(None if self.perm is None else
+                                    order_unknowns(self.perm, noslack))
+            self._solver.factor(self.Bbus[ix_(noslack, noslack)])
+            self.factorizations += 1
+            self.et_factor += self._solver.et_factor
+            self.fill = self._solver.fill
+
+    def ptdf(self, branch_idx=None, bus_idx=None, dtype=None):
+        """Returns rows and/or columns of the PTDF matrix.
+
+        Returns the rows of the branches C{branch_idx} and the columns of
+        the buses C{bus_idx} of the PTDF matrix, all rows or columns if
+        C{None}, as a dense matrix of type C{dtype} (e.g. C{float32}),
+        C{float64} if it is not given.
+        """
+        self.factor()
+        rows = None if branch_idx is None else array(branch_idx, int).flatten()
+        cols = None if bus_idx is None else array(bus_idx, int).flatten()
+        nrows = self.Bf.shape[0] if rows is None else len(rows)
+
+        if cols is not None and len(cols) < nrows:
+            H = self._columns(rows, cols)
+        else:
+            H = self._rows(rows)
+            if cols is not None:
+                H = H[:, cols]
+
+        return H if dtype is None else H.astype(dtype)
+
+    def blocks(self, branch_idx=None, bus_idx=None, block_size=None,
+               dtype=None):
+        """Yields the rows of the PTDF matrix in blocks.
+
+        Yields tuples of the branch indices of a block and the
+        corresponding rows of the PTDF matrix, restricted to the columns
+        of the buses C{bus_idx}, as returned by L{ptdf}. The blocks have
+        C{block_size} rows, by default as many as fit in about
+        C{BLOCK_ENTRIES} entries, so that only one block at a time is
+        held in memory.
+        """
+        if branch_idx is None:
+            rows = arange(self.Bf.shape[0])
+        else:
+            rows = array(branch_idx, int).flatten()
+        ncols = self.Bbus.shape[0] if bus_idx is None else len(bus_idx)
+        if block_size is None:
+            block_size = max(BLOCK_ENTRIES // max(ncols, 1), 1)
+
+        for k in range(0, len(rows), block_size):
+            idx = rows[k:k + block_size]
+            yield idx, self.ptdf(idx, bus_idx, dtype)
+
+    def flows(self, P, branch_idx=None):
+        """Returns the branch flows of the bus injections C{P}.
+
+        C{P} is a vector of length C{nb} or a C{nb x n} matrix with one
+        injection vector per column. Returns C{H * P}, where C{H} is the
+        PTDF matrix restricted to the rows of the branches C{branch_idx},
+        all branches if C{None}, with one solve per column of C{P}.
+        """
+        self.factor()
+        P = asarray(P, float)
+
+        ## distribute slack, if requested
+        if self.slack is not None:
+            if self.slack.ndim == 1:
+                P = P - multiply.outer(self.slack, P.sum(axis=0))
+            else:
+                P = dot(self.slack, P)
+
+        Va = self._solver.solve(P[self.noslack])
+        Bf = self._Bf if branch_idx is None else self._Bf[branch_idx, :]
+
+        return Bf * Va
+
+    def _rows(self, rows):
+        ## since Bbus is symmetric, the rows of the branches are the
+        ## solutions of Bbus[noslack, noslack] * x = Bf[rows, noslack].T
+        Bf = self._Bf if rows is None else self._Bf[rows, :]
+        H = zeros((Bf.shape[0], self.Bbus.shape[0]))
+        H[:, self.noslack] = self._solver.solve(Bf.T.toarray()).T
+
+        ## distribute slack, if requested
+        if self.slack is not None:
+            if self.slack.ndim == 1:
+                ## conceptually, we want to do ...
+                ##    H = H * (eye(nb, nb) - slack * ones((1, nb)))
+                ## ... we just do it more efficiently
+                H -= dot(H, self.slack).reshape(-1, 1)
+            else:
+                H = dot(H, self.slack)
+
+        return H
+
+    def _columns(self, rows, cols):
+        ## flows of unit injections at the buses cols
+        E = zeros((self.Bbus.shape[0], len(cols)))
+        E[cols, arange(len(cols))] = 1
+
+        return self.flows(E, rows)
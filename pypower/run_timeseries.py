@@ -0,0 +1,178 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Runs a quasi-static time series of AC power flows.
+"""
+
+from sys import stdout
+
+from os.path import dirname, join
+
+from numpy import zeros, pi, exp, conj, atleast_1d
+from numpy import flatnonzero as find
+
+from pypower.bustypes import bustypes
+from pypower.ext2int import ext2int
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.ppver import ppver
+from pypower.makeYbus import makeYbus
+from pypower.makeSbus import makeSbus
+from pypower.makeB import makeB
+from pypower.scale_load import scale_load
+from pypower.jacobian_plan import JacobianPlan
+from pypower.newtonpf import newtonpf
+from pypower.fdpf_solver import FDPFSolver
+
+from pypower.idx_bus import VM, VA
+from pypower.idx_brch import F_BUS, T_BUS
+from pypower.idx_gen import PG, VG, GEN_BUS, GEN_STATUS
+
+
+def run_timeseries(casedata=None, load=None, gen=None, ppopt=None,
+                   load_zone=None, out=None):
+    """Runs a quasi-static time series of AC power flows.
+
+    Solves one AC power flow of the case given by C{casedata} (see
+    L{runpf}) per time step. C{load} is an iterable with one element per
+    time step, e.g. a list, a generator or the rows of a (memory-mapped)
+    C{nt x nz} array, each of which holds the load scale factors of the
+    C{nz} load zones applied to the case's loads by L{scale_load}.
+    C{load_zone} is passed on to L{scale_load} and, if given, has one entry
+    per row of the case's bus matrix. The optional C{gen} is an iterable of
+    the same length whose elements hold the active power output C{PG} (MW)
+    of each row of the case's gen matrix, the output of the slack
+    generator being determined by the power flow.
+
+    The case is converted to internal indexing and the admittance matrix
+    and Jacobian structure (for Newton's method) or the factored B matrices
+    (for the fast-decoupled methods, C{PF_ALG} 2 or 3) are computed once.
+    Each step is started from the solution of the previous one, the first
+    one and any step following a non-converged one from the voltages of
+    the case. Generator reactive power limits are not enforced.
+
+    If C{out} is C{None}, a generator is returned which yields for each
+    time step a tuple with the vector of complex bus voltages (one entry
+    per row of the case's bus matrix, zero for isolated buses), the
+    convergence flag and the number of iterations. Otherwise C{out} is a
+    dict of preallocated arrays with one row per time step, into which
+    the results are written, and the number of time steps is returned.
+    The results written are those for which C{out} has an entry:
+        - C{'V'}            complex bus voltages, C{nt x nb}
+        - C{'success'}      convergence flags, C{nt}
+        - C{'iterations'}   number of iterations, C{nt}
+        - C{'Sf'}, C{'St'}  complex power flows (MVA) at the "from" and
+                            "to" ends of the branches, C{nt x nl}
+
+    Example::
+        load = numpy.load('load.npy', mmap_mode='r')
+        for V, success, iterations in run_timeseries('case30', load):
+            ...
+
+    @see: L{runpf}, L{scale_load}, L{runpf_batch}
+    """
+    steps = _timeseries(casedata, load, gen, ppopt, load_zone,
+                        out is not None and ('Sf' in out or 'St' in out))
+    if out is None:
+        return ((V, success, iterations)
+                for V, success, iterations, _, _ in steps)
+
+    nt = 0
+    for V, success, iterations, Sf, St in steps:
+        for key, value in [('V', V), ('success', success),
+                           ('iterations', iterations), ('Sf', Sf),
+                           ('St', St)]:
+            if key in out:
+                out[key][nt] = value
+        nt = nt + 1
+
+    return nt
+
+
+def _timeseries(casedata, load, gen, ppopt, load_zone, flows):
+    """Generator which solves the power flow of each time step.
+
+    Yields the results of each step as described in L{run_timeseries},
+    followed by the branch flows if C{flows} is true, or C{None} twice.
+    """
+    ## default arguments
+    if casedata is None:
+        casedata = join(dirname(__file__), 'case9')
+    ppopt = ppoption(ppopt)
+
+    ## options
+    verbose = ppopt["VERBOSE"]
+    alg = ppopt["PF_ALG"]
+    if alg not in (1, 2, 3):
+        raise ValueError('run_timeseries: PF_ALG must be 1, 2 or 3')
+
+    ## read data and convert to internal indexing
+    ppc = ext2int(loadcase(casedata))
+    baseMVA, bus, gen0, branch = \
+        ppc["baseMVA"], ppc["bus"], ppc["gen"], ppc["branch"]
+    o = ppc["order"]
+    on_bus = o["bus"]["status"]["on"]
+    nb_ext = o["ext"]["bus"].shape[0]
+    on_br = o["branch"]["status"]["on"]
+    nl_ext = o["ext"]["branch"].shape[0]
+    gen_i2e = o["gen"]["status"]["on"][o["gen"]["e2i"]]
+    if load_zone is not None:
+        load_zone = atleast_1d(load_zone)[on_bus]
+
+    ## get bus index lists of each type of bus
+    ref, pv, pq = bustypes(bus, gen0)
+
+    ## generator info
+    on = find(gen0[:, GEN_STATUS] > 0)      ## which generators are on?
+    gbus = gen0[on, GEN_BUS].astype(int)    ## what buses are they at?
+
+    if verbose > 0:
+        v = ppver('all')
+        stdout.write('PYPOWER Version %s, %s' % (v["Version"], v["Date"]))
+        stdout.write(' -- AC Power Flow (time series)\n')
+
+    ## build admittance matrices and the structures reused by the solvers
+    Ybus, Yf, Yt = makeYbus(baseMVA, bus, branch)
+    if alg == 1:
+        plan = JacobianPlan(Ybus, pv, pq)
+    else:
+        Bp, Bpp = makeB(baseMVA, bus, branch, alg)
+        fd = FDPFSolver(Ybus, Bp, Bpp, ref, pv, pq, ppopt)
+    f = branch[:, F_BUS].astype(int)
+    t = branch[:, T_BUS].astype(int)
+
+    ## initial state
+    V0  = bus[:, VM] * exp(1j * pi/180 * bus[:, VA])
+    V0[gbus] = gen0[on, VG] / abs(V0[gbus]) * V0[gbus]
+
+    V = V0
+    success = 1
+    gen_iter = None if gen is None else iter(gen)
+    for load_t in load:
+        ## injections of this time step
+        bus_t, gen_t = scale_load(atleast_1d(load_t), bus, gen0, load_zone)
+        if gen_iter is not None:
+            gen_t[:, PG] = atleast_1d(next(gen_iter))[gen_i2e]
+        Sbus = makeSbus(baseMVA, bus_t, gen_t)
+
+        ## run the power flow, starting from the previous solution
+        if not success:
+            V = V0
+        if alg == 1:
+            V, success, iterations = newtonpf(Ybus, Sbus, V.copy(), ref, pv,
+                                              pq, ppopt, plan=plan)
+        else:
+            V, success, iterations = fd.solve(Sbus, V.copy())
+
+        ## map results back to the rows of the external matrices
+        Vext = zeros(nb_ext, complex)
+        Vext[on_bus] = V
+        Sf, St = None, None
+        if flows:
+            Sf = zeros(nl_ext, complex)
+            St = zeros(nl_ext, complex)
+            Sf[on_br] = V[f] * conj(Yf * V) * baseMVA
+            St[on_br] = V[t] * conj(Yt * V) * baseMVA
+
+        yield Vext, success, iterations, Sf, St
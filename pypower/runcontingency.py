@@ -0,0 +1,245 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Runs an AC contingency analysis.
+"""
+
+import warnings
+
+from sys import stderr
+
+from os.path import dirname, join
+
+from multiprocessing import cpu_count
+
+from numpy import \
+    array, zeros, ones, arange, exp, pi, conj, maximum, array_split, \
+    c_, nan, vstack, flatnonzero as find
+
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.ext2int import ext2int
+from pypower.bustypes import bustypes
+from pypower.makeSbus import makeSbus
+from pypower.makeB import makeB
+from pypower.incremental_ybus import IncrementalYbus
+from pypower.newtonpf import newtonpf
+from pypower.fdpf_solver import FDPFSolver
+from pypower.util import have_fcn
+
+from pypower.idx_bus import VM, VA, VMAX, VMIN
+from pypower.idx_brch import RATE_A, BR_STATUS
+from pypower.idx_gen import GEN_STATUS
+
+## columns of the violations table
+CONT    = 0     ## index of the contingency in the list of contingencies
+VIOL    = 1     ## type of violation, see below
+ELEM    = 2     ## violating branch (row index) or bus (bus number), for
+                ## a non-converged contingency the outaged element
+VALUE   = 3     ## apparent power flow (MVA) or voltage magnitude (p.u.)
+LIMIT   = 4     ## violated limit, RATE_A (MVA), VMAX or VMIN (p.u.)
+
+## types of violations
+NOT_CONVERGED   = 0     ## power flow did not converge
+OVERLOAD        = 1     ## branch flow above RATE_A at either end
+HIGH_VOLTAGE    = 2     ## voltage magnitude above VMAX
+LOW_VOLTAGE     = 3     ## voltage magnitude below VMIN
+
+
+def runcontingency(casedata=None, contingencies=None, ppopt=None,
+                   workers=None):
+    """Runs an AC contingency analysis.
+
+    Solves the base case power flow and then one AC power flow for each
+    outage in C{contingencies}, a list of C{('branch', k)} and
+    C{('gen', k)} pairs, where C{k} is the row index of the branch or
+    generator in the case. By default all in-service branches and
+    generators are outaged one at a time (N-1). Each contingency is solved
+    with Newton's method, or the fast-decoupled method if C{PF_ALG} in
+    C{ppopt} is 2 or 3, starting from the base case voltages. The power
+    lost by a generator outage is picked up by the slack bus. Outages of
+    elements which are already out of service leave the base case
+    unchanged.
+
+    The contingencies are spread over C{workers} processes of a
+    C{concurrent.futures} process pool. The default is one process per
+    CPU. If C{workers} is 1, or C{concurrent.futures} is not available,
+    they are solved in the calling process. Each process builds the
+    admittance matrices once, as an L{IncrementalYbus}, and patches them
+    for each branch outage.
+
+    Returns a table of violations with one row per violation and the
+    columns C{CONT}, C{VIOL}, C{ELEM}, C{VALUE} and C{LIMIT} defined in
+    this module, with C{VIOL} one of C{NOT_CONVERGED}, C{OVERLOAD},
+    C{HIGH_VOLTAGE} or C{LOW_VOLTAGE}, and a boolean vector with the
+    convergence flag of each contingency. Branch ratings of zero are
+    treated as unlimited.
+
+    Example::
+        viol, success = runcontingency('case30')
+        overloads = viol[viol[:, VIOL] == OVERLOAD, :]
+
+    @see: L{runpf}, L{IncrementalYbus}
+    """
+    ## default arguments
+    if casedata is None:
+        casedata = join(dirname(__file__), 'case9')
+    ppopt = ppoption(ppopt)
+
+    ## base case
+    ppc = loadcase(casedata)
+    results, success = runpf(ppc, ppoption(ppopt, VERBOSE=0, OUT_ALL=0))
+    if not success:
+        stderr.write('runcontingency: base case power flow did not converge\n')
+        return zeros((0, 5)), zeros(0, bool)
+
+    if contingencies is None:
+        contingencies = \
+            [('branch', k) for k in find(ppc['branch'][:, BR_STATUS] > 0)] + \
+            [('gen', k) for k in find(ppc['gen'][:, GEN_STATUS] > 0)]
+
+    ## convert to internal indexing, with the base case solution
+    ppc = ext2int(results)
+    o = ppc['order']
+    bus = ppc['bus']
+
+    ## internal index of each external branch and gen, -1 if out of service
+    br_on = o['branch']['status']['on']
+    br_e2i = -ones(o['ext']['branch'].shape[0], int)
+    br_e2i[br_on] = arange(len(br_on))
+    gen_on = o['gen']['status']['on'][o['gen']['e2i']]
+    gen_e2i = -ones(o['ext']['gen'].shape[0], int)
+    gen_e2i[gen_on] = arange(len(gen_on))
+
+    conts = []
+    for k, (kind, idx) in enumerate(contingencies):
+        if kind == 'branch':
+            conts.append((k, kind, idx, br_e2i[idx]))
+        elif kind == 'gen':
+            conts.append((k, kind, idx, gen_e2i[idx]))
+        else:
+            raise ValueError('runcontingency: unknown outage type %r' % kind)
+
+    data = {
+        'baseMVA':  ppc['baseMVA'],
+        'bus':      bus,
+        'gen':      ppc['gen'],
+        'branch':   ppc['branch'],
+        'V0':       bus[:, VM] * exp(1j * pi / 180 * bus[:, VA]),
+        'bus_i2e':  o['bus']['i2e'],
+        'br_i2e':   br_on,
+        'ppopt':    ppoption(ppopt, VERBOSE=0),
+    }
+
+    ## solve the contingencies
+    if workers is None:
+        workers = cpu_count()
+    if workers > 1 and len(conts) > 1 and have_fcn('concurrent.futures'):
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunks = array_split(arange(len(conts)), min(4 * workers, len(conts)))
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(_solve_contingencies, data,
+                                   [conts[i] for i in chunk])
+                       for chunk in chunks]
+            out = [f.result() for f in futures]
+    else:
+        out = [_solve_contingencies(data, conts)]
+
+    viol = [v for v, _ in out if len(v)]
+    viol = vstack(viol) if len(viol) else zeros((0, 5))
+    success = zeros(len(conts), bool)
+    for _, s in out:
+        success[s[:, 0].astype(int)] = s[:, 1] > 0
+
+    return viol, success
+
+
+def _solve_contingencies(data, conts):
+    """Solves a list of contingencies.
+
+    Returns the rows of the violations table and a matrix with the
+    index and the convergence flag of each contingency.
+    """
+    baseMVA, bus, gen, branch = \
+        data['baseMVA'], data['bus'], data['gen'], data['branch']
+    V0, ppopt = data['V0'], data['ppopt']
+    alg = ppopt['PF_ALG']
+
+    yb = IncrementalYbus(baseMVA, bus, branch)
+    lim = find(branch[:, RATE_A] > 0)       ## branches with flow limits
+    ref0, pv0, pq0 = bustypes(bus, gen)
+    Sbus0 = makeSbus(baseMVA, bus, gen)
+
+    viol = []
+    success = zeros((len(conts), 2))
+    for n, (k, kind, idx, i) in enumerate(conts):
+        ## apply the outage
+        ref, pv, pq, Sbus = ref0, pv0, pq0, Sbus0
+        if i >= 0:
+            if kind == 'branch':
+                yb.outage(i)
+            else:
+                g = gen.copy()
+                g[i, GEN_STATUS] = 0
+                ref, pv, pq = bustypes(bus, g)
+                Sbus = makeSbus(baseMVA, bus, g)
+
+        ## solve the power flow, an outage may split the network and make
+        ## the matrices singular
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            try:
+                if alg == 2 or alg == 3:
+                    Bp, Bpp = makeB(baseMVA, bus, yb.branch, alg)
+                    V, ok, _ = FDPFSolver(yb.Ybus, Bp, Bpp, ref, pv, pq,
+                                          ppopt).solve(Sbus, V0.copy())
+                else:
+                    V, ok, _ = newtonpf(yb.Ybus, Sbus, V0.copy(),
+                                        ref, pv, pq, ppopt)
+            except (RuntimeError, ValueError, ArithmeticError):
+                ok = 0
+
+        success[n, :] = [k, ok]
+        if ok:
+            viol.extend(_violations(k, V, baseMVA, bus, yb, lim,
+                                    data['br_i2e'], data['bus_i2e']))
+        else:
+            viol.append([k, NOT_CONVERGED, idx, nan, nan])
+
+        if i >= 0 and kind == 'branch':
+            yb.restore(i)
+
+    viol = [array(v, float).reshape(-1, 5) for v in viol]
+    viol = vstack(viol) if len(viol) else zeros((0, 5))
+
+    return viol, success
+
+
+def _violations(k, V, baseMVA, bus, yb, lim, br_i2e, bus_i2e):
+    """Rows of the violations table for the solution C{V} of contingency
+    C{k}.
+    """
+    f, t = yb.f, yb.t
+    rate = yb.branch[:, RATE_A]
+    viol = []
+
+    ## branch flows
+    Sf = abs(V[f[lim]] * conj(yb.Yf[lim, :] * V)) * baseMVA
+    St = abs(V[t[lim]] * conj(yb.Yt[lim, :] * V)) * baseMVA
+    S = maximum(Sf, St)
+    j = find(S > rate[lim])
+    viol.append(c_[k * ones(len(j)), OVERLOAD * ones(len(j)),
+                   br_i2e[lim[j]], S[j], rate[lim[j]]])
+
+    ## voltage limits
+    Vm = abs(V)
+    for vtype, j, vlim in [
+            (HIGH_VOLTAGE, find(Vm > bus[:, VMAX]), bus[:, VMAX]),
+            (LOW_VOLTAGE, find(Vm < bus[:, VMIN]), bus[:, VMIN])]:
+        viol.append(c_[k * ones(len(j)), vtype * ones(len(j)),
+                       bus_i2e[j], Vm[j], vlim[j]])
+
+    return viol
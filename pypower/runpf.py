@@ -11,7 +11,8 @@ from os.path import dirname, join
 
 from time import time
 
-from numpy import r_, c_, ix_, zeros, pi, ones, exp, argmax
+from numpy import r_, c_, ix_, zeros, pi, ones, exp, argmax, any, add, \
+    in1d, setdiff1d, union1d, unique, array, arange, maximum
 from numpy import flatnonzero as find
 
 from pypower.bustypes import bustypes
@@ -24,17 +25,28 @@ from pypower.makeSbus import makeSbus
 from pypower.dcpf import dcpf
 from pypower.makeYbus import makeYbus
 from pypower.newtonpf import newtonpf
-from pypower.fdpf import fdpf
+from pypower.bus_ordering import bus_ordering
+from pypower.fdpf_solver import FDPFSolver
 from pypower.gausspf import gausspf
+from pypower.bfswpf import bfswpf
+from pypower.find_islands import find_islands
 from pypower.makeB import makeB
 from pypower.pfsoln import pfsoln
+from pypower.lrucache import LRUCache
+from pypower.topology_key import topology_key
 from pypower.printpf import printpf
 from pypower.savecase import savecase
 from pypower.int2ext import int2ext
+from pypower.util import have_fcn
 
-from pypower.idx_bus import PD, QD, VM, VA, GS, BUS_TYPE, PQ, REF
-from pypower.idx_brch import PF, PT, QF, QT
-from pypower.idx_gen import PG, QG, VG, QMAX, QMIN, GEN_BUS, GEN_STATUS
+from pypower.idx_bus import PD, QD, VM, VA, GS, BUS_TYPE, PQ, REF, NONE, \
+    BUS_I
+from pypower.idx_brch import PF, PT, QF, QT, F_BUS
+from pypower.idx_gen import PG, QG, VG, QMAX, QMIN, GEN_BUS, GEN_STATUS, \
+    PMAX
+
+#: converged voltages of previous AC power flows, keyed by L{topology_key}
+warm_cache = LRUCache(0)
 
 
 def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
@@ -69,6 +81,51 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
     Enforcing of generator Q limits inspired by contributions from Mu Lin,
     Lincoln University, New Zealand (1/14/05).
 
+    Statistics of the AC power flow solution are returned in the
+    C{'pf_info'} dict of the results: the total number of iterations and,
+    for Newton's method, the number of Jacobian factorizations and the time
+    spent factoring and solving (see L{newtonpf}). When generator Q limits
+    are enforced, the admittance matrices are built only once and the power
+    injections are only updated at the buses converted to PQ. Newton's
+    method checks the limits and converts buses within its iterations, as
+    soon as the mismatch is below the C{PF_QLIM_TOL} option, and returns
+    the number of conversions in C{'qlim_switches'}. The other methods, and
+    Newton's method if C{PF_QLIM_TOL} is 0 or for the gens at the slack
+    bus, run a new power flow from the previous solution after each
+    conversion, and return the number of these additional passes in
+    C{'qlim_passes'}. The time spent enforcing
+    the limits is returned in C{'et_qlim'}.
+
+    If the C{PF_WARM_CACHE_SIZE} option is greater than zero, the converged
+    voltages of AC power flows are kept in the module level L{LRUCache}
+    C{warm_cache}, keyed by the L{topology_key} of the case, which holds up
+    to that many entries. A later power flow of a case with the same key is
+    started from the cached voltages instead of the C{VM} and C{VA} columns
+    of the bus matrix. Whether a warm start was used and the hit and miss
+    counters of the cache are returned in C{'pf_info'}.
+
+    If the C{PF_ORDERING} option is greater than zero, a fill-reducing
+    L{bus_ordering} of the case is computed, or taken from its cache, and
+    kept in C{'order'}. The Jacobians of Newton's method and the B matrices
+    of the fast-decoupled methods are factored in that order. The time
+    spent ordering and the fill-in of the last factorization are returned
+    in C{'et_order'} and C{'fill'} of C{'pf_info'}, together with the
+    number of factorizations and the time spent factoring.
+
+    If the C{PF_ISLANDS} option is greater than zero and the in-service
+    network consists of more than one island (see L{find_islands}), each
+    island is solved as a case of its own, with its own admittance
+    matrices, and the results are merged back into the case. An island
+    without a reference bus gets the bus of its generator with the largest
+    C{PMAX} as slack bus. Islands without generators are de-energized,
+    i.e. their buses are set to C{NONE} with zero voltages and their
+    branches carry no flow. If C{PF_ISLANDS} is 2, the islands are solved
+    in the processes of a C{concurrent.futures} process pool, if
+    available. The number of islands, the number of de-energized islands
+    and the total number of iterations are returned in C{'islands'},
+    C{'dead_islands'} and C{'iterations'} of C{'pf_info'}, and the
+    algorithm is successful if all energized islands converged.
+
     @author: Ray Zimmerman (PSERC Cornell)
     """
     ## default arguments
@@ -104,11 +161,22 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
 
     ##-----  run the power flow  -----
     t0 = time()
+    info = {}
     if verbose > 0:
         v = ppver('all')
         stdout.write('PYPOWER Version %s, %s' % (v["Version"], v["Date"]))
 
-    if dc:                               # DC formulation
+    ## split the network into islands
+    islands = []
+    if ppopt['PF_ISLANDS'] > 0:
+        groups, isolated = find_islands(ppc)
+        islands = groups + [array([b]) for b in isolated]
+
+    if len(islands) > 1:                 ## solve each island separately
+        if verbose:
+            stdout.write(' -- Power Flow of %d islands\n' % len(islands))
+        success = _solve_islands(ppc, ppopt, islands, info)
+    elif dc:                             # DC formulation
         if verbose:
             stdout.write(' -- DC Power Flow\n')
 
@@ -153,6 +221,8 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
                 solver = 'fast-decoupled, BX'
             elif alg == 4:
                 solver = 'Gauss-Seidel'
+            elif alg == 5:
+                solver = 'backward/forward sweep'
             else:
                 solver = 'unknown'
             print(' -- AC Power Flow (%s)\n' % solver)
@@ -160,105 +230,105 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
         ## initial state
         # V0    = ones(bus.shape[0])            ## flat start
         V0  = bus[:, VM] * exp(1j * pi/180 * bus[:, VA])
+
+        ## warm start from the voltages of a case with the same topology
+        key = None
+        if ppopt['PF_WARM_CACHE_SIZE'] > 0:
+            warm_cache.maxsize = ppopt['PF_WARM_CACHE_SIZE']
+            key = topology_key(ppc)
+            Vw = warm_cache.get(key)
+            if Vw is not None:
+                V0 = Vw.copy()
+            info['warm_start'] = Vw is not None
+
         V0[gbus] = gen[on, VG] / abs(V0[gbus]) * V0[gbus]
 
+        ## fill-reducing ordering of the buses for the factorizations
+        perm = None
+        if ppopt['PF_ORDERING'] > 0:
+            to = time()
+            ppc = bus_ordering(ppc, ppopt['PF_ORDERING'])
+            perm = ppc['order']['bus']['perm']
+            info['et_order'] = time() - to
+
         if qlim:
             ref0 = ref                         ## save index and angle of
             Varef0 = bus[ref0, VA]             ##   original reference bus(es)
             limited = []                       ## list of indices of gens @ Q lims
             fixedQg = zeros(gen.shape[0])      ## Qg of gens at Q limits
 
+        ## build admittance matrices, factored B matrices for fast-decoupled
+        ## methods and complex bus power injections [generation - load],
+        ## which are only patched for the buses converted to PQ by the Q
+        ## limit loop
+        Ybus, Yf, Yt = makeYbus(baseMVA, bus, branch)
+        alg = ppopt["PF_ALG"]
+        if alg == 2 or alg == 3:
+            Bp, Bpp = makeB(baseMVA, bus, branch, alg)
+            fd = FDPFSolver(Ybus, Bp, Bpp, ref, pv, pq, ppopt, perm)
+        Sbus = makeSbus(baseMVA, bus, gen)
+
+        ## Newton's method converts the buses of generators at their Q
+        ## limits to PQ buses within its iterations, the other methods solve
+        ## a new power flow after each conversion
+        newton = {'types': None, 'limited': [], 'infeasible': False}
+        if qlim and alg == 1 and ppopt['PF_QLIM_TOL'] > 0:
+            qlim_fcn = _newton_qlim_fcn(baseMVA, bus, gen, branch, Ybus, Yf,
+                                        Yt, Sbus, fixedQg, qlim, verbose,
+                                        newton)
+        else:
+            qlim_fcn = None
+
         repeat = True
         while repeat:
-            ## build admittance matrices
-            Ybus, Yf, Yt = makeYbus(baseMVA, bus, branch)
-
-            ## compute complex bus power injections [generation - load]
-            Sbus = makeSbus(baseMVA, bus, gen)
-
             ## run the power flow
-            alg = ppopt["PF_ALG"]
             if alg == 1:
-                V, success, _ = newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt)
+                V, success, _ = newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt,
+                                         info=info, perm=perm,
+                                         qlim_fcn=qlim_fcn)
+                if newton['types'] is not None:
+                    ref, pv, pq = newton['types']
+                    newton['types'] = None
+                    limited = r_[limited, newton['limited']].astype(int)
+                    newton['limited'] = []
             elif alg == 2 or alg == 3:
-                Bp, Bpp = makeB(baseMVA, bus, branch, alg)
-                V, success, _ = fdpf(Ybus, Sbus, V0, Bp, Bpp, ref, pv, pq, ppopt)
+                fd.update(ref=ref, pv=pv, pq=pq)
+                V, success, its = fd.solve(Sbus, V0)
+                info['iterations'] = info.get('iterations', 0) + its
+                info['factorizations'] = fd.factorizations
+                info['et_factor'] = fd.et_factor
+                info['fill'] = fd.fill
             elif alg == 4:
-                V, success, _ = gausspf(Ybus, Sbus, V0, ref, pv, pq, ppopt)
+                V, success, its = gausspf(Ybus, Sbus, V0, ref, pv, pq, ppopt)
+                info['iterations'] = info.get('iterations', 0) + its
+            elif alg == 5:
+                V, success, its = bfswpf(Ybus, Yf, Yt, branch, Sbus, V0,
+                                         ref, pv, pq, ppopt)
+                info['iterations'] = info.get('iterations', 0) + its
             else:
-                stderr.write('Only Newton''s method, fast-decoupled, and '
-                             'Gauss-Seidel power flow algorithms currently '
-                             'implemented.\n')
+                stderr.write('Only Newton''s method, fast-decoupled, '
+                             'Gauss-Seidel and backward/forward sweep power '
+                             'flow algorithms currently implemented.\n')
+
+            if qlim and 'qlim_passes' not in info:
+                tq = time()                 ## start of Q limit enforcement
+                info['qlim_passes'] = 0
 
             ## update data matrices with solution
             bus, gen, branch = pfsoln(baseMVA, bus, gen, branch, Ybus, Yf, Yt, V, ref, pv, pq)
 
             if qlim:             ## enforce generator Q limits
-                ## find gens with violated Q constraints
-                gen_status = gen[:, GEN_STATUS] > 0
-                qg_max_lim = gen[:, QG] > gen[:, QMAX]
-                qg_min_lim = gen[:, QG] < gen[:, QMIN]
-                
-                mx = find( gen_status & qg_max_lim )
-                mn = find( gen_status & qg_min_lim )
-                
-                if len(mx) > 0 or len(mn) > 0:  ## we have some Q limit violations
-                    # No PV generators
-                    if len(pv) == 0:
-                        if verbose:
-                            if len(mx) > 0:
-                                print('Gen %d [only one left] exceeds upper Q limit : INFEASIBLE PROBLEM\n' % mx + 1)
-                            else:
-                                print('Gen %d [only one left] exceeds lower Q limit : INFEASIBLE PROBLEM\n' % mn + 1)
-
-                        success = 0
-                        break
-
-                    ## one at a time?
-                    if qlim == 2:    ## fix largest violation, ignore the rest
-                        k = argmax(r_[gen[mx, QG] - gen[mx, QMAX],
-                                      gen[mn, QMIN] - gen[mn, QG]])
-                        if k > len(mx):
-                            mn = mn[k - len(mx)]
-                            mx = []
-                        else:
-                            mx = mx[k]
-                            mn = []
-
-                    if verbose and len(mx) > 0:
-                        for i in range(len(mx)):
-                            print('Gen ' + str(mx[i] + 1) + ' at upper Q limit, converting to PQ bus\n')
-
-                    if verbose and len(mn) > 0:
-                        for i in range(len(mn)):
-                            print('Gen ' + str(mn[i] + 1) + ' at lower Q limit, converting to PQ bus\n')
-
-                    ## save corresponding limit values
-                    fixedQg[mx] = gen[mx, QMAX]
-                    fixedQg[mn] = gen[mn, QMIN]
-                    mx = r_[mx, mn].astype(int)
-
-                    ## convert to PQ bus
-                    gen[mx, QG] = fixedQg[mx]      ## set Qg to binding 
-                    for i in range(len(mx)):            ## [one at a time, since they may be at same bus]
-                        gen[mx[i], GEN_STATUS] = 0        ## temporarily turn off gen,
-                        bi = gen[mx[i], GEN_BUS]   ## adjust load accordingly,
-                        bus[bi, [PD, QD]] = (bus[bi, [PD, QD]] - gen[mx[i], [PG, QG]])
-                    
-                    if len(ref) > 1 and any(bus[gen[mx, GEN_BUS], BUS_TYPE] == REF):
-                        raise ValueError('Sorry, PYPOWER cannot enforce Q '
-                                         'limits for slack buses in systems '
-                                         'with multiple slacks.')
-                    
-                    bus[gen[mx, GEN_BUS].astype(int), BUS_TYPE] = PQ   ## & set bus type to PQ
-
-                    ## update bus index lists of each type of bus
-                    ref_temp = ref
-                    ref, pv, pq = bustypes(bus, gen)
-                    if verbose and ref != ref_temp:
-                        print('Bus %d is new slack bus\n' % ref)
-
+                mx, ref, pv, pq = _enforce_q_lims(baseMVA, bus, gen, Sbus,
+                                                  ref, pv, pq, fixedQg, qlim,
+                                                  verbose)
+                if mx is None or newton['infeasible']:
+                    success = 0
+                    break
+                if len(mx) > 0:
+                    ## continue from the current solution
+                    V0 = V
                     limited = r_[limited, mx].astype(int)
+                    info['qlim_passes'] += 1
                 else:
                     repeat = 0 ## no more generator Q limits violated
             else:
@@ -268,7 +338,7 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
             ## restore injections from limited gens [those at Q limits]
             gen[limited, QG] = fixedQg[limited]    ## restore Qg value,
             for i in range(len(limited)):               ## [one at a time, since they may be at same bus]
-                bi = gen[limited[i], GEN_BUS]           ## re-adjust load,
+                bi = int(gen[limited[i], GEN_BUS])      ## re-adjust load,
                 bus[bi, [PD, QD]] = bus[bi, [PD, QD]] + gen[limited[i], [PG, QG]]
                 gen[limited[i], GEN_STATUS] = 1           ## and turn gen back on
             
@@ -276,8 +346,19 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
                 ## adjust voltage angles to make original ref bus correct
                 bus[:, VA] = bus[:, VA] - bus[ref0, VA] + Varef0
 
+        if qlim:
+            info['et_qlim'] = info.get('et_qlim', 0) + time() - tq
+
+        ## save converged voltages for warm starts
+        if key is not None:
+            if success:
+                warm_cache.put(key, V.copy())
+            info['cache_hits'] = warm_cache.hits
+            info['cache_misses'] = warm_cache.misses
+
     ppc["et"] = time() - t0
     ppc["success"] = success
+    ppc["pf_info"] = info
 
     ##-----  output results  -----
     ## convert back to original bus numbering & print results
@@ -311,5 +392,238 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
     return results, success
 
 
+def _newton_qlim_fcn(baseMVA, bus, gen, branch, Ybus, Yf, Yt, Sbus, fixedQg,
+                     qlim, verbose, state):
+    """Returns the function converting PV buses to PQ within the iterations
+    of L{newtonpf}.
+
+    The function checks the generator Q limits at the current voltages with
+    L{_enforce_q_lims}, except for the gens at the slack bus, whose Pg is
+    only final once the power flow has converged, so they are left to the
+    outer loop of L{runpf}. The new bus index lists and the converted gens
+    are recorded in the C{'types'} and C{'limited'} entries of C{state},
+    and C{'infeasible'} is set if no PV bus is left to convert.
+    """
+    def qlim_fcn(V, ref, pv, pq):
+        if state['infeasible']:
+            return None
+        pfsoln(baseMVA, bus, gen, branch, Ybus, Yf, Yt, V, ref, pv, pq)
+        over = maximum(gen[:, QG] - gen[:, QMAX], gen[:, QMIN] - gen[:, QG])
+        over[gen[:, GEN_STATUS] <= 0] = 0
+        atref = in1d(gen[:, GEN_BUS], ref)
+        if qlim == 2:
+            atref = atref & (arange(len(over)) == argmax(over))
+        if any(atref & (over > 0)):
+            return None
+        mx, ref, pv, pq = _enforce_q_lims(baseMVA, bus, gen, Sbus, ref, pv,
+                                          pq, fixedQg, qlim, verbose)
+        if mx is None:
+            state['infeasible'] = True
+        if mx is None or len(mx) == 0:
+            return None
+        state['types'] = (ref, pv, pq)
+        state['limited'].extend(mx)
+        return ref, pv, pq, Sbus
+
+    return qlim_fcn
+
+
+def _enforce_q_lims(baseMVA, bus, gen, Sbus, ref, pv, pq, fixedQg, qlim,
+                    verbose):
+    """Converts the buses of generators at violated Q limits to PQ buses.
+
+    Checks the reactive power outputs C{gen[:, QG]} of a power flow solution
+    (see L{pfsoln}) against the limits of the generators. The generators
+    at violated limits, only the one with the largest violation if C{qlim}
+    is 2, get their Qg fixed at the limit, are turned off and added to the
+    load of their bus, which becomes a PQ bus, and the injections C{Sbus}
+    of those buses are updated. C{bus}, C{gen}, C{Sbus} and C{fixedQg} are
+    modified in place.
+
+    Returns the indices of the converted generators, empty if no limit is
+    violated and C{None} if there is no PV bus left to convert, and the
+    new bus index lists C{ref}, C{pv} and C{pq}.
+    """
+    ## find gens with violated Q constraints
+    gen_status = gen[:, GEN_STATUS] > 0
+    qg_max_lim = gen[:, QG] > gen[:, QMAX]
+    qg_min_lim = gen[:, QG] < gen[:, QMIN]
+
+    mx = find( gen_status & qg_max_lim )
+    mn = find( gen_status & qg_min_lim )
+
+    if len(mx) == 0 and len(mn) == 0:
+        return mx, ref, pv, pq
+
+    ## we have some Q limit violations
+    # No PV generators
+    if len(pv) == 0:
+        if verbose:
+            if len(mx) > 0:
+                print('Gen %d [only one left] exceeds upper Q limit : '
+                      'INFEASIBLE PROBLEM\n' % (mx[0] + 1))
+            else:
+                print('Gen %d [only one left] exceeds lower Q limit : '
+                      'INFEASIBLE PROBLEM\n' % (mn[0] + 1))
+
+        return None, ref, pv, pq
+
+    ## one at a time?
+    if qlim == 2:    ## fix largest violation, ignore the rest
+        k = argmax(r_[gen[mx, QG] - gen[mx, QMAX],
+                      gen[mn, QMIN] - gen[mn, QG]])
+        if k >= len(mx):
+            mn = mn[[k - len(mx)]]
+            mx = []
+        else:
+            mx = mx[[k]]
+            mn = []
+
+    if verbose and len(mx) > 0:
+        for i in range(len(mx)):
+            print('Gen ' + str(mx[i] + 1) +
+                  ' at upper Q limit, converting to PQ bus\n')
+
+    if verbose and len(mn) > 0:
+        for i in range(len(mn)):
+            print('Gen ' + str(mn[i] + 1) +
+                  ' at lower Q limit, converting to PQ bus\n')
+
+    ## save corresponding limit values
+    fixedQg[mx] = gen[mx, QMAX]
+    fixedQg[mn] = gen[mn, QMIN]
+    mx = r_[mx, mn].astype(int)
+
+    ## convert to PQ bus
+    gen[mx, QG] = fixedQg[mx]      ## set Qg to binding
+    ## [one at a time, since they may be at same bus]
+    for i in range(len(mx)):
+        gen[mx[i], GEN_STATUS] = 0        ## temporarily turn off gen,
+        bi = int(gen[mx[i], GEN_BUS])   ## adjust load accordingly,
+        bus[bi, [PD, QD]] = (bus[bi, [PD, QD]] - gen[mx[i], [PG, QG]])
+
+    bi = gen[mx, GEN_BUS].astype(int)
+    if len(ref) > 1 and any(bus[bi, BUS_TYPE] == REF):
+        raise ValueError('Sorry, PYPOWER cannot enforce Q '
+                         'limits for slack buses in systems '
+                         'with multiple slacks.')
+
+    bus[bi, BUS_TYPE] = PQ   ## & set bus type to PQ
+
+    ## update bus index lists of each type of bus, only reclassifying the
+    ## converted buses unless a new slack bus has to be picked
+    ref_temp = ref
+    if any(in1d(bi, ref)):
+        ref, pv, pq = bustypes(bus, gen)
+    else:
+        pv = setdiff1d(pv, bi)
+        pq = union1d(pq, bi)
+    if verbose and ref != ref_temp:
+        print('Bus %d is new slack bus\n' % ref)
+
+    ## patch injections of the converted buses
+    bi = unique(bi)
+    Sbus[bi] = -(bus[bi, PD] + 1j * bus[bi, QD]) / baseMVA
+    g = find((gen[:, GEN_STATUS] > 0) & in1d(gen[:, GEN_BUS], bi))
+    add.at(Sbus, gen[g, GEN_BUS].astype(int),
+           (gen[g, PG] + 1j * gen[g, QG]) / baseMVA)
+
+    return mx, ref, pv, pq
+
+
+def _solve_islands(ppc, ppopt, islands, info):
+    """Solves the power flow of each island of a case separately.
+
+    Updates the bus, gen and branch matrices of the case in internal
+    indexing in place with the results of the islands, given as arrays of
+    bus indices, and the statistics in C{info}. Returns C{True} if all
+    energized islands converged.
+    """
+    baseMVA, bus, gen, branch = \
+        ppc["baseMVA"], ppc["bus"], ppc["gen"], ppc["branch"]
+    ppopt = ppoption(ppopt, PF_ISLANDS=0, VERBOSE=0, OUT_ALL=0)
+
+    ## one case per energized island, with the bus indices as bus numbers
+    cases, rows, out = [], [], []
+    ndead = 0
+    for ib in islands:
+        ig = find(in1d(gen[:, GEN_BUS], ib) & (gen[:, GEN_STATUS] > 0))
+        il = find(in1d(branch[:, F_BUS], ib))
+        if len(ig) == 0:
+            ## de-energize islands without generation
+            bus[ib, BUS_TYPE] = NONE
+            bus[ib, VM] = 0
+            bus[ib, VA] = 0
+            branch[ix_(il, [PF, QF, PT, QT])] = 0
+            ndead += 1
+            continue
+
+        ## slack bus, the bus of the largest generator if there is none
+        if not any(bus[ib, BUS_TYPE] == REF):
+            bus[int(gen[ig[argmax(gen[ig, PMAX])], GEN_BUS]), BUS_TYPE] = REF
+
+        case = {'version': '2', 'baseMVA': baseMVA, 'bus': bus[ib, :],
+                'gen': gen[ig, :], 'branch': branch[il, :]}
+        rows.append((ib, ig, il))
+        if len(ib) == 1:
+            ## a single bus, no power flow to solve
+            out.append(_solve_bus(case, ppopt['PF_DC']))
+        else:
+            out.append(None)
+            cases.append((len(out) - 1, case))
+
+    ## solve the islands
+    if ppopt['PF_ISLANDS'] > 1 and len(cases) > 1 and \
+            have_fcn('concurrent.futures'):
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor() as pool:
+            futures = [(k, pool.submit(runpf, c, ppopt)) for k, c in cases]
+            for k, f in futures:
+                out[k] = f.result()
+    else:
+        for k, c in cases:
+            out[k] = runpf(c, ppopt)
+
+    ## merge the results
+    success = True
+    its = 0
+    for (ib, ig, il), (r, s) in zip(rows, out):
+        bus[ib, :] = r['bus']
+        gen[ig, :] = r['gen']
+        branch[il, :] = r['branch'][:, :branch.shape[1]]
+        success = success and s
+        its += r['pf_info'].get('iterations', 0)
+
+    info['islands'] = len(islands)
+    info['dead_islands'] = ndead
+    info['iterations'] = its
+
+    return success
+
+
+def _solve_bus(ppc, dc=False):
+    """Solves the power flow of a case with a single bus and no branches.
+
+    The first generator supplies the load and the shunt of the bus, at its
+    voltage set point, or at 1 p.u. for the DC formulation.
+    """
+    baseMVA, bus, gen, branch = \
+        ppc["baseMVA"], ppc["bus"].copy(), ppc["gen"].copy(), ppc["branch"]
+    bus[:, BUS_I] = 0
+    gen[:, GEN_BUS] = 0
+    bus[:, VM] = 1 if dc else gen[0, VG]
+
+    Ybus, Yf, Yt = makeYbus(baseMVA, bus, branch)
+    V = bus[:, VM] * exp(1j * pi/180 * bus[:, VA])
+    bus, gen, branch = pfsoln(baseMVA, bus, gen, branch, Ybus, Yf, Yt, V,
+                              array([0]), array([], int), array([], int))
+    bus[:, BUS_I] = ppc["bus"][:, BUS_I]
+    gen[:, GEN_BUS] = ppc["gen"][:, GEN_BUS]
+
+    return {'bus': bus, 'gen': gen, 'branch': branch,
+            'pf_info': {'iterations': 0}}, True
+
+
 if __name__ == '__main__':
     runpf()
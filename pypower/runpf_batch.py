@@ -0,0 +1,107 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Runs a batch of AC power flows sharing one network.
+"""
+
+from sys import stdout
+
+from os.path import dirname, join
+
+from numpy import zeros, pi, exp, atleast_2d
+from numpy import flatnonzero as find
+
+from pypower.bustypes import bustypes
+from pypower.ext2int import ext2int
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.ppver import ppver
+from pypower.makeYbus import makeYbus
+from pypower.makeSbus import makeSbus
+from pypower.newtonpf_batch import newtonpf_batch
+
+from pypower.idx_bus import VM, VA
+from pypower.idx_gen import VG, GEN_BUS, GEN_STATUS
+
+
+def runpf_batch(casedata=None, Sbus=None, ppopt=None):
+    """Runs a batch of AC power flows sharing one network.
+
+    Solves the power flow of the case given by C{casedata} (see L{runpf})
+    for each of the rows of C{Sbus}, an C{nscen x nb} matrix of complex bus
+    power injections in per unit, where C{nb} is the number of rows of
+    the case's bus matrix and the columns follow the order of those rows.
+    If C{Sbus} is not given, the injections of the case itself are solved
+    as a single scenario.
+
+    The conversion to internal indexing, the bus type classification and
+    the admittance matrix are computed only once for the whole batch, and
+    all scenarios are solved together by L{newtonpf_batch}, starting from
+    the voltages and generator set points of the case.
+
+    Returns an C{nscen x nb} matrix with the complex bus voltages of each
+    scenario (zero for isolated buses), a boolean vector of convergence
+    flags and a vector with the number of Newton iterations performed for
+    each scenario.
+
+    Example::
+        ppc = loadcase('case30')
+        Sbus = makeSbus(ppc['baseMVA'], ppc['bus'], ppc['gen'])
+        V, success, iterations = \\
+            runpf_batch(ppc, outer(scale, Sbus))
+
+    @see: L{runpf}, L{newtonpf_batch}
+    """
+    ## default arguments
+    if casedata is None:
+        casedata = join(dirname(__file__), 'case9')
+    ppopt = ppoption(ppopt)
+
+    ## options
+    verbose = ppopt["VERBOSE"]
+
+    ## read data
+    ppc = loadcase(casedata)
+
+    ## convert to internal indexing
+    ppc = ext2int(ppc)
+    baseMVA, bus, gen, branch = \
+        ppc["baseMVA"], ppc["bus"], ppc["gen"], ppc["branch"]
+    on_bus = ppc["order"]["bus"]["status"]["on"]
+    nb_ext = ppc["order"]["ext"]["bus"].shape[0]
+
+    ## get bus index lists of each type of bus
+    ref, pv, pq = bustypes(bus, gen)
+
+    ## generator info
+    on = find(gen[:, GEN_STATUS] > 0)      ## which generators are on?
+    gbus = gen[on, GEN_BUS].astype(int)    ## what buses are they at?
+
+    if verbose > 0:
+        v = ppver('all')
+        stdout.write('PYPOWER Version %s, %s' % (v["Version"], v["Date"]))
+        stdout.write(' -- AC Power Flow (Newton, batch)\n')
+
+    ## build admittance matrices
+    Ybus, _, _ = makeYbus(baseMVA, bus, branch)
+
+    ## injections of each scenario, in internal bus order
+    if Sbus is None:
+        Sbus = makeSbus(baseMVA, bus, gen)
+    else:
+        Sbus = atleast_2d(Sbus)[:, on_bus]
+
+    ## initial state
+    V0  = bus[:, VM] * exp(1j * pi/180 * bus[:, VA])
+    V0[gbus] = gen[on, VG] / abs(V0[gbus]) * V0[gbus]
+
+    ## run the power flows
+    V, success, iterations = \
+        newtonpf_batch(Ybus, Sbus, V0, ref, pv, pq, ppopt)
+
+    ## map voltages back to the rows of the external bus matrix
+    Vext = zeros((V.shape[0], nb_ext), complex)
+    Vext[:, on_bus] = V
+
+    return Vext, success, iterations
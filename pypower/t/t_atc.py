@@ -0,0 +1,133 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for C{atc}.
+"""
+
+from copy import deepcopy
+
+from numpy import array, zeros, inf, sign, flatnonzero as find
+
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.rundcpf import rundcpf
+from pypower.atc import atc, FCITC, ELEM, CONT, TDF, FLOW, LIMIT
+
+from pypower.idx_bus import BUS_I, PD, BUS_AREA
+from pypower.idx_brch import F_BUS, T_BUS, PF, RATE_A, RATE_B, BR_STATUS
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def _flows(ppc, k, dP=None):
+    """DC branch flows with branch C{k} out of service and the bus demands
+    changed by C{dP}.
+    """
+    c = deepcopy(ppc)
+    if k >= 0:
+        c['branch'][k, BR_STATUS] = 0
+    if dP is not None:
+        c['bus'][:, PD] += dP
+    r, _ = rundcpf(c, ppoption(VERBOSE=0, OUT_ALL=0))
+    F = r['branch'][:, PF]
+    if k >= 0:
+        F[k] = 0
+    return F
+
+
+def t_atc(quiet=False):
+    """Tests for C{atc}.
+    """
+    t_begin(11, quiet)
+
+    ppc = case30()
+    ppc['branch'][:, RATE_B] = 1.25 * ppc['branch'][:, RATE_A]
+    nb, nl = ppc['bus'].shape[0], ppc['branch'].shape[0]
+
+    ## transfers from bus 1 to bus 30 and from buses 2 and 13, in proportion
+    ## to their generation, to buses 7, 8 and 30, in proportion to their load
+    paths = [(1, 30), ([2, 13], [7, 8, 30])]
+    dP = zeros((nb, 2))
+    dP[0, 0] = -1
+    dP[29, 0] = 1
+    dP[[1, 12], 1] = -ppc['gen'][[1, 5], 1] / sum(ppc['gen'][[1, 5], 1])
+    d = ppc['bus'][[6, 7, 29], PD]
+    dP[[6, 7, 29], 1] = d / sum(d)
+
+    tc, p, islanding = atc(ppc, paths, cont_rate=RATE_B)
+
+    ## islanding outages from the graph of the network without the branch
+    f = ppc['branch'][:, F_BUS].astype(int) - 1
+    t = ppc['branch'][:, T_BUS].astype(int) - 1
+    split = zeros(nl, bool)
+    for k in range(nl):
+        on = find(array(range(nl)) != k)
+        G = csr_matrix((zeros(len(on)) + 1, (f[on], t[on])), (nb, nb))
+        split[k] = connected_components(G, directed=False)[0] > 1
+
+    ## capabilities from power flows of each outage with and without a
+    ## unit transfer
+    ref = zeros((2, 6))
+    ref[:, FCITC] = inf
+    for k in [-1] + list(find(~split)):
+        F = _flows(ppc, k)
+        rate = ppc['branch'][:, RATE_A if k < 0 else RATE_B]
+        for n in range(2):
+            T = _flows(ppc, k, dP[:, n]) - F
+            T[abs(T) < 1e-5] = 0
+            x = (sign(T) * rate - F) / T
+            x[T == 0] = inf
+            l = x.argmin()
+            if x[l] < ref[n, FCITC]:
+                ref[n] = [x[l], l, k, T[l], F[l], rate[l]]
+
+    t = 'atc : '
+    t_ok(p == paths, [t, 'paths'])
+    t_is(islanding.astype(int), split.astype(int), 12, [t, 'islanding'])
+    t_is(tc[:, FCITC], ref[:, FCITC], 6, [t, 'FCITC'])
+    t_is(tc[1, [ELEM, CONT]], ref[1, [ELEM, CONT]], 12,
+         [t, 'limiting branch and contingency'])
+    t_is(tc[1, [TDF, FLOW, LIMIT]], ref[1, [TDF, FLOW, LIMIT]], 6,
+         [t, 'TDF, flow and limit'])
+
+    ## the capability loads the limiting branch to its rating, also for
+    ## the first path, which has two limiting branches with the same values
+    Fl = zeros(2)
+    for n in range(2):
+        l, k = int(tc[n, ELEM]), int(tc[n, CONT])
+        Fl[n] = abs(_flows(ppc, k, tc[n, FCITC] * dP[:, n])[l])
+    t_is(Fl, tc[:, LIMIT], 6, [t, 'limiting flow at the rating'])
+
+    tc2, _, _ = atc(ppc, paths, cont_rate=RATE_B, block_size=4)
+    t_is(tc2, tc, 12, [t, 'blocks of contingencies'])
+    tc0, _, islanding0 = atc(ppc, paths, contingencies=[])
+    t_ok(all(tc0[:, CONT] == -1) and len(islanding0) == 0,
+         [t, 'base case only'])
+
+    ## areas
+    tc, p, _ = atc(ppc, areas=True)
+    t_ok(len(p) == 6 and (1, 2) in p and (3, 1) in p,
+         [t, 'areas, all pairs'])
+    area = ppc['bus'][:, BUS_AREA]
+    buses = (ppc['bus'][area == 1, BUS_I], ppc['bus'][area == 2, BUS_I])
+    tc1, _, _ = atc(ppc, [buses])
+    t_is(tc1[0], tc[p.index((1, 2))], 12, [t, 'areas, same as buses'])
+
+    try:
+        atc(ppc, [(1, 31)])
+        t_ok(0, [t, 'unknown bus'])
+    except ValueError:
+        t_ok(1, [t, 'unknown bus'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_atc(quiet=False)
@@ -0,0 +1,137 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the backward/forward sweep power flow.
+"""
+
+from numpy import array, zeros, ones, arange, r_, c_, exp, pi
+from numpy.random import RandomState
+
+from pypower.case9 import case9
+from pypower.ppoption import ppoption
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.bustypes import bustypes
+from pypower.makeYbus import makeYbus
+from pypower.makeSbus import makeSbus
+from pypower.newtonpf import newtonpf
+from pypower.bfswpf import bfswpf
+from pypower.runpf import runpf
+
+from pypower.idx_bus import BUS_I, BUS_TYPE, PD, QD, BS, VM, VA, ZONE, \
+    VMAX, VMIN, PQ, PV, REF
+from pypower.idx_brch import F_BUS, T_BUS, BR_R, BR_X, BR_B, TAP, \
+    BR_STATUS, ANGMIN, ANGMAX, PF, QT
+from pypower.idx_gen import GEN_BUS, PG, QG, QMAX, QMIN, VG, MBASE, \
+    GEN_STATUS, PMAX
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_bfswpf(quiet=False):
+    """Tests for the backward/forward sweep power flow.
+    """
+    t_begin(12, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+
+    ## radial feeder with high R/X ratios, branches in both orientations
+    ppc = _feeder(200)
+    ppc_int = ext2int(loadcase(ppc))
+    baseMVA, bus, gen, branch = \
+        ppc_int['baseMVA'], ppc_int['bus'], ppc_int['gen'], ppc_int['branch']
+    ref, pv, pq = bustypes(bus, gen)
+    Ybus, Yf, Yt = makeYbus(baseMVA, bus, branch)
+    Sbus = makeSbus(baseMVA, bus, gen)
+    V0 = bus[:, VM] * exp(1j * pi / 180 * bus[:, VA])
+
+    t = 'bfswpf : '
+    Vnr, _, _ = newtonpf(Ybus, Sbus, V0.copy(), ref, pv, pq, ppopt)
+    V, success, its = bfswpf(Ybus, Yf, Yt, branch, Sbus, V0.copy(), ref, pv,
+                             pq, ppopt)
+    t_ok(success, [t, 'success'])
+    t_is(V, Vnr, 7, [t, 'V'])
+    t_ok(its < 20, [t, 'iterations'])
+    t_is(V0, bus[:, VM] * exp(1j * pi / 180 * bus[:, VA]), 12,
+         [t, 'V0 unchanged'])
+
+    ## PV buses
+    t = 'bfswpf, PV buses : '
+    ppc_pv = _feeder(200, pv=[60, 150])
+    r_nr, _ = runpf(ppc_pv, ppopt)
+    r, success = runpf(ppc_pv, ppoption(ppopt, PF_ALG=5))
+    t_ok(success, [t, 'success'])
+    t_is(r['bus'][:, [VM, VA]], r_nr['bus'][:, [VM, VA]], 6, [t, 'V'])
+    t_is(r['gen'][:, [PG, QG]], r_nr['gen'][:, [PG, QG]], 4, [t, 'Pg, Qg'])
+    t_is(r['branch'][:, [PF, QT]], r_nr['branch'][:, [PF, QT]], 4,
+         [t, 'branch flows'])
+
+    ## runpf
+    t = 'runpf, PF_ALG = 5 : '
+    r_nr, _ = runpf(ppc, ppopt)
+    r, success = runpf(ppc, ppoption(ppopt, PF_ALG=5))
+    t_ok(success, [t, 'success'])
+    t_is(r['bus'][:, [VM, VA]], r_nr['bus'][:, [VM, VA]], 6, [t, 'V'])
+    t_ok(r['pf_info']['iterations'] > 0, [t, 'iterations'])
+
+    ## meshed network
+    t = 'bfswpf : '
+    try:
+        runpf(case9(), ppoption(ppopt, PF_ALG=5))
+        t_ok(0, [t, 'meshed network'])
+    except ValueError:
+        t_ok(1, [t, 'meshed network'])
+
+    t_end()
+
+
+def _feeder(nb, pv=None):
+    """Random radial feeder with C{nb} buses, the swing bus has number 1.
+    """
+    rs = RandomState(7)
+
+    ## each bus is connected to one of the 5 buses numbered just below it
+    f = array([max(1, k - rs.randint(1, 6)) for k in range(2, nb + 1)])
+    t = arange(2, nb + 1)
+    flip = rs.rand(nb - 1) < 0.3
+    f[flip], t[flip] = t[flip], f[flip].copy()
+
+    bus = zeros((nb, 13))
+    bus[:, BUS_I] = arange(1, nb + 1)
+    bus[:, BUS_TYPE] = PQ
+    bus[0, BUS_TYPE] = REF
+    bus[1:, PD] = 0.05 + 0.1 * rs.rand(nb - 1)
+    bus[1:, QD] = 0.02 + 0.05 * rs.rand(nb - 1)
+    bus[rs.randint(1, nb, 5), BS] = 0.2
+    bus[:, VM] = 1
+    bus[:, [ZONE, VMAX, VMIN]] = [1, 1.1, 0.9]
+
+    branch = zeros((nb - 1, 13))
+    branch[:, F_BUS], branch[:, T_BUS] = f, t
+    branch[:, BR_R] = 0.0003 + 0.0006 * rs.rand(nb - 1)
+    branch[:, BR_X] = 0.5 * branch[:, BR_R]
+    branch[:, BR_B] = 1e-4
+    branch[:, BR_STATUS] = 1
+    branch[:, [ANGMIN, ANGMAX]] = [-360, 360]
+    branch[:3, TAP] = 1.02                  ## some transformers
+
+    gbus = r_[1, [] if pv is None else pv]
+    gen = zeros((len(gbus), 21))
+    gen[:, GEN_BUS] = gbus
+    gen[:, PG] = r_[0, 0.5 * ones(len(gbus) - 1)]
+    gen[:, [QMAX, QMIN]] = [100, -100]
+    gen[:, VG] = r_[1.0, 0.98 * ones(len(gbus) - 1)]
+    gen[:, [MBASE, GEN_STATUS, PMAX]] = [10, 1, 10]
+    if pv is not None:
+        bus[array(pv) - 1, BUS_TYPE] = PV
+
+    return {'version': '2', 'baseMVA': 10.0, 'bus': bus, 'gen': gen,
+            'branch': c_[branch]}
+
+
+if __name__ == '__main__':
+    t_bfswpf(quiet=False)
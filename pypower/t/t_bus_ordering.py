@@ -0,0 +1,112 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for fill-reducing bus orderings.
+"""
+
+from numpy import arange, sort, exp, pi
+
+from pypower.case300 import case300
+from pypower.ppoption import ppoption
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.bustypes import bustypes
+from pypower.makeYbus import makeYbus
+from pypower.makeSbus import makeSbus
+from pypower.makeB import makeB
+from pypower.newtonpf import newtonpf
+from pypower.fdpf_solver import FDPFSolver
+from pypower.runpf import runpf
+from pypower.bus_ordering import bus_ordering, order_unknowns, ordering_cache
+
+from pypower.idx_bus import VM, VA
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_bus_ordering(quiet=False):
+    """Tests for fill-reducing bus orderings.
+    """
+    t_begin(19, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    ppc = ext2int(loadcase(case300()))
+    baseMVA, bus, gen, branch = \
+        ppc['baseMVA'], ppc['bus'], ppc['gen'], ppc['branch']
+    nb = bus.shape[0]
+    ref, pv, pq = bustypes(bus, gen)
+    Ybus, _, _ = makeYbus(baseMVA, bus, branch)
+    Sbus = makeSbus(baseMVA, bus, gen)
+    V0 = bus[:, VM] * exp(1j * pi / 180 * bus[:, VA])
+
+    ## orderings
+    t = 'bus_ordering : '
+    ordering_cache.clear()
+    for method in [1, 2]:
+        ppc = bus_ordering(ppc, method)
+        t_is(sort(ppc['order']['bus']['perm']), arange(nb), 12,
+             [t, 'method %d, permutation' % method])
+    hits = ordering_cache.hits
+    perm = ppc['order']['bus']['perm']
+    ppc['order']['bus']['perm'] = None
+    ppc = bus_ordering(ppc, 2)
+    t_is(ordering_cache.hits, hits + 1, 12, [t, 'cached'])
+    t_is(ppc['order']['bus']['perm'], perm, 12, [t, 'same ordering'])
+
+    try:
+        bus_ordering(ppc, 3)
+        t_ok(0, [t, 'unknown method'])
+    except ValueError:
+        t_ok(1, [t, 'unknown method'])
+
+    t = 'order_unknowns : '
+    t_is(order_unknowns([2, 0, 1], [0], [1, 2], [1, 2]), [2, 4, 0, 1, 3], 12,
+         [t, 'blocks'])
+    t_is(order_unknowns([2, 0, 1], [], [2, 1]), [0, 1], 12,
+         [t, 'empty block'])
+
+    ## Newton's method
+    t = 'newtonpf, ordered : '
+    V, success, its = newtonpf(Ybus, Sbus, V0.copy(), ref, pv, pq, ppopt)
+    info, info0 = {}, {}
+    newtonpf(Ybus, Sbus, V0.copy(), ref, pv, pq,
+             ppoption(ppopt, PF_LIN_SOLVER=1), info=info0)
+    Vo, success_o, its_o = newtonpf(Ybus, Sbus, V0.copy(), ref, pv, pq, ppopt,
+                                    info=info, perm=perm)
+    t_ok(success_o, [t, 'success'])
+    t_is(Vo, V, 10, [t, 'V'])
+    t_is(its_o, its, 12, [t, 'iterations'])
+    t_ok(info['fill'] < info0['fill'], [t, 'less fill than COLAMD'])
+
+    ## fast-decoupled
+    t = 'FDPFSolver, ordered : '
+    Bp, Bpp = makeB(baseMVA, bus, branch, 2)
+    fd = FDPFSolver(Ybus, Bp, Bpp, ref, pv, pq, ppopt)
+    V, _, _ = fd.solve(Sbus, V0.copy())
+    fdo = FDPFSolver(Ybus, Bp, Bpp, ref, pv, pq, ppopt, perm)
+    Vo, success_o, _ = fdo.solve(Sbus, V0.copy())
+    t_ok(success_o, [t, 'success'])
+    t_is(Vo, V, 10, [t, 'V'])
+    t_ok(fdo.fill < fd.fill, [t, 'less fill than COLAMD'])
+
+    ## runpf
+    t = 'runpf, PF_ORDERING = 2 : '
+    r, _ = runpf(case300(), ppopt)
+    for alg in [1, 2]:
+        ro, success = runpf(case300(), ppoption(ppopt, PF_ALG=alg,
+                                                PF_ORDERING=2))
+        t_ok(success, [t, 'PF_ALG = %d, success' % alg])
+        t_is(ro['bus'][:, [VM, VA]], r['bus'][:, [VM, VA]], 5,
+             [t, 'PF_ALG = %d, V' % alg])
+    t_ok(all([k in ro['pf_info'] for k in ['et_order', 'fill', 'et_factor']]),
+         [t, 'statistics'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_bus_ordering(quiet=False)
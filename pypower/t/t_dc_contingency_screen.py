@@ -0,0 +1,80 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the DC screening of single branch outages.
+"""
+
+from copy import deepcopy
+
+from numpy import array, argsort, flatnonzero as find
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.rundcpf import rundcpf
+from pypower.find_islands import find_islands
+from pypower.dc_contingency_screen import dc_contingency_screen, \
+    CONT, ELEM, FLOW, LIMIT, LOADING
+
+from pypower.idx_brch import PF, RATE_A, RATE_B, BR_STATUS
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_dc_contingency_screen(quiet=False):
+    """Tests for the DC screening of single branch outages.
+    """
+    t_begin(9, quiet)
+
+    ppc = case30()
+    ppc['branch'][:, RATE_B] = 0.6 * ppc['branch'][:, RATE_A]
+    ppc['branch'][3, BR_STATUS] = 0
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    nl = ppc['branch'].shape[0]
+    k = 3
+
+    ## reference: a DC power flow of each modified case
+    ref = []
+    split = []
+    for c in range(nl):
+        cc = deepcopy(ppc)
+        cc['branch'][c, BR_STATUS] = 0
+        groups, isolated = find_islands(cc)
+        if len(groups) > 1 or len(isolated):
+            split.append(c)
+            continue
+        r, _ = rundcpf(cc, ppopt)
+        F = r['branch'][:, PF]
+        rate = r['branch'][:, RATE_B]
+        lim = find((rate > 0) & (r['branch'][:, BR_STATUS] > 0))
+        ld = abs(F[lim]) / rate[lim]
+        j = argsort(-ld)[:k]
+        j = j[ld[j] > 1]
+        ref.extend([[c, lim[i], F[lim[i]], rate[lim[i]], ld[i]] for i in j])
+    ref = array(ref)
+
+    t = 'dc_contingency_screen : '
+    viol, islanding = dc_contingency_screen(ppc, range(nl), ppopt,
+                                            RATE_B, k, block_size=7)
+    t_is(viol.shape, ref.shape, 12, [t, 'number of violations'])
+    t_is(viol[:, [CONT, ELEM]], ref[:, :2], 12, [t, 'branches'])
+    t_is(viol[:, FLOW], ref[:, 2], 6, [t, 'flows'])
+    t_is(viol[:, LIMIT], ref[:, 3], 12, [t, 'limits'])
+    t_is(viol[:, LOADING], ref[:, 4], 6, [t, 'loading'])
+    t_is(find(islanding), split, 12, [t, 'islanding'])
+    t_ok(3 not in viol[viol[:, CONT] != 3, ELEM], [t, 'out of service branch'])
+
+    viol2, _ = dc_contingency_screen(ppc, range(nl), ppopt, RATE_B, k)
+    t_is(viol2, viol, 12, [t, 'default block size'])
+
+    viol, _ = dc_contingency_screen(ppc, None, ppopt, RATE_A, k)
+    t_ok(len(viol) < len(ref), [t, 'RATE_A, fewer violations'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_dc_contingency_screen(quiet=False)
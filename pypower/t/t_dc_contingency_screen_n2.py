@@ -0,0 +1,148 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the DC screening of double branch outages.
+"""
+
+from copy import deepcopy
+
+from numpy import array, zeros, argsort, lexsort, maximum, triu, ix_, c_, \
+    flatnonzero as find
+
+from scipy.sparse.csgraph import dijkstra
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.rundcpf import rundcpf
+from pypower.ext2int import ext2int
+from pypower.find_islands import find_islands
+from pypower.makePTDF import makePTDF
+from pypower.makeLODF import makeLODF
+from pypower.dc_contingency_screen_n2 import dc_contingency_screen_n2, \
+    CONT1, CONT2, ELEM, FLOW, LIMIT, LOADING
+
+from pypower.idx_brch import F_BUS, T_BUS, BR_X, TAP, PF, RATE_A, BR_STATUS
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_dc_contingency_screen_n2(quiet=False):
+    """Tests for the DC screening of double branch outages.
+    """
+    t_begin(15, quiet)
+
+    ppc = case30()
+    ppc['branch'][:, RATE_A] = 0.8 * ppc['branch'][:, RATE_A]
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    conts = array([0, 1, 2, 4, 5, 6, 9, 12, 15, 20, 26, 27, 30, 35])
+    k = 2
+
+    ## reference: a DC power flow of each modified case
+    ref = []
+    split = []
+    for a in range(len(conts)):
+        for b in range(a + 1, len(conts)):
+            cc = deepcopy(ppc)
+            cc['branch'][conts[[a, b]], BR_STATUS] = 0
+            groups, isolated = find_islands(cc)
+            if len(groups) > 1 or len(isolated):
+                split.append([a, b])
+                continue
+            r, _ = rundcpf(cc, ppopt)
+            F = r['branch'][:, PF]
+            rate = r['branch'][:, RATE_A]
+            lim = find(rate > 0)
+            ld = abs(F[lim]) / rate[lim]
+            i = argsort(-ld)[:k]
+            i = i[ld[i] > 1]
+            ref.extend([[a, b, lim[n], F[lim[n]], rate[lim[n]], ld[n]]
+                        for n in i])
+    ref = _sorted(array(ref))
+
+    t = 'dc_contingency_screen_n2 : '
+    viol, islanding, npairs = dc_contingency_screen_n2(ppc, conts, ppopt,
+                                                       RATE_A, k)
+    viol = _sorted(viol)
+    t_is(viol.shape, ref.shape, 12, [t, 'number of violations'])
+    t_is(viol[:, [CONT1, CONT2, ELEM]], ref[:, :3], 12, [t, 'branches'])
+    t_is(viol[:, FLOW], ref[:, 3], 6, [t, 'flows'])
+    t_is(viol[:, LIMIT], ref[:, 4], 12, [t, 'limits'])
+    t_is(viol[:, LOADING], ref[:, 5], 6, [t, 'loading'])
+    islanding = islanding[lexsort((islanding[:, 1], islanding[:, 0]))]
+    t_is(islanding, split, 12, [t, 'islanding'])
+    t_is(npairs, len(conts) * (len(conts) - 1) / 2, 12,
+         [t, 'number of pairs'])
+
+    t = 'dc_contingency_screen_n2, chunks : '
+    v, _, _ = dc_contingency_screen_n2(ppc, conts, ppopt, RATE_A, k,
+                                       max_memory=4000)
+    v = _sorted(v)
+    t_is(v, viol, 12, [t, 'in process'])
+    v, _, _ = dc_contingency_screen_n2(ppc, conts, ppopt, RATE_A, k,
+                                       max_memory=4000, workers=2)
+    v = _sorted(v)
+    t_is(v, viol, 12, [t, 'process pool'])
+
+    ## pairs kept by pruning, from the full LODF matrix and the shortest
+    ## paths in the network with parallel branches combined
+    t = 'dc_contingency_screen_n2, pruning : '
+    r = ext2int(deepcopy(ppc))
+    bus, branch = r['bus'], r['branch']
+    L = makeLODF(branch, makePTDF(r['baseMVA'], bus, branch))
+    Lcc = abs(L[ix_(conts, conts)])
+    f = branch[:, F_BUS].astype(int)
+    tb = branch[:, T_BUS].astype(int)
+    tap = branch[:, TAP].copy()
+    tap[tap == 0] = 1
+    B = zeros((bus.shape[0], bus.shape[0]))
+    for l in range(branch.shape[0]):
+        B[f[l], tb[l]] += 1 / (branch[l, BR_X] * tap[l])
+    B = B + B.T
+    G = zeros(B.shape)
+    G[B > 0] = 1 / B[B > 0]
+    D = dijkstra(G, directed=False)
+    ends = c_[f[conts], tb[conts]]
+    dist = array([[D[ix_(ends[a], ends[b])].min() for b in range(len(conts))]
+                  for a in range(len(conts))])
+
+    single = zeros(len(conts), bool)    ## islanding single outages
+    for a in range(len(conts)):
+        cc = deepcopy(ppc)
+        cc['branch'][conts[a], BR_STATUS] = 0
+        groups, isolated = find_islands(cc)
+        single[a] = len(groups) > 1 or len(isolated) > 0
+    Lcc[single, :] = 0                  ## excluded by the LODF threshold
+    Lcc[:, single] = 0
+
+    for name, opt, keep in [
+            ('LODF threshold', {'lodf_threshold': 0.1},
+             maximum(Lcc, Lcc.T) >= 0.1),
+            ('electrical distance', {'distance': 0.1}, dist <= 0.1)]:
+        keep = triu(keep, 1)
+        v, isl, n = dc_contingency_screen_n2(ppc, conts, ppopt, RATE_A, k,
+                                             max_memory=4000, workers=2,
+                                             **opt)
+        v = _sorted(v)
+        t_ok(0 < n < npairs and n == keep.sum(), [t, name + ', pairs'])
+        kept = keep[viol[:, CONT1].astype(int), viol[:, CONT2].astype(int)]
+        t_is(v, viol[kept], 12, [t, name + ', violations'])
+        t_ok(all(keep[isl[:, 0], isl[:, 1]]) and
+             len(isl) == sum([keep[a, b] for a, b in split]),
+             [t, name + ', islanding'])
+
+    t_end()
+
+
+def _sorted(viol):
+    """Violations sorted by pair, decreasing loading and branch.
+    """
+    return viol[lexsort((viol[:, ELEM], -viol[:, LOADING].round(8),
+                         viol[:, CONT2], viol[:, CONT1]))]
+
+
+if __name__ == '__main__':
+    t_dc_contingency_screen_n2(quiet=False)
@@ -0,0 +1,93 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the DC power flow solver with a cached factorization.
+"""
+
+from numpy import pi, c_, zeros
+from numpy.random import RandomState
+
+from pypower.case300 import case300
+from pypower.ppoption import ppoption
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.bustypes import bustypes
+from pypower.makeBdc import makeBdc
+from pypower.makeSbus import makeSbus
+from pypower.dcpf import dcpf
+from pypower.rundcpf import rundcpf
+from pypower.bus_ordering import bus_ordering
+from pypower.dcpf_solver import DCPFSolver
+
+from pypower.idx_bus import GS, VA
+from pypower.idx_brch import PF
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_dcpf_solver(quiet=False):
+    """Tests for the DC power flow solver with a cached factorization.
+    """
+    t_begin(12, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    ppc = ext2int(loadcase(case300()))
+    baseMVA, bus, gen, branch = \
+        ppc['baseMVA'], ppc['bus'], ppc['gen'], ppc['branch']
+    nb = bus.shape[0]
+    ref, pv, pq = bustypes(bus, gen)
+    B, Bf, Pbusinj, Pfinj = makeBdc(baseMVA, bus, branch)
+    Pbus = makeSbus(baseMVA, bus, gen).real - Pbusinj - bus[:, GS] / baseMVA
+    Va0 = bus[:, VA] * (pi / 180)
+
+    ## single scenario, against rundcpf
+    t = 'DCPFSolver : '
+    r, _ = rundcpf(case300(), ppopt)
+    solver = DCPFSolver(B, ref, pv, pq, Bf, Pfinj)
+    Va, Pf = solver.solve(Pbus, Va0)
+    t_is(Va * 180 / pi, r['bus'][:, VA], 8, [t, 'Va'])
+    t_is(Pf * baseMVA, r['branch'][:, PF], 8, [t, 'Pf'])
+    t_is(dcpf(B, Pbus, Va0, ref, pv, pq), Va, 12, [t, 'dcpf'])
+
+    ## scenarios solved together
+    t = 'DCPFSolver, nb x nscen : '
+    rs = RandomState(3)
+    P = c_[Pbus] * (0.8 + 0.4 * rs.rand(nb, 6))
+    Vas, Pfs = solver.solve(P, Va0)
+    t_is(Vas.shape, [nb, 6], 12, [t, 'shape'])
+    Vak, Pfk = zeros((nb, 6)), zeros((branch.shape[0], 6))
+    for k in range(6):
+        Vak[:, k], Pfk[:, k] = solver.solve(P[:, k], Va0)
+    t_is(Vas, Vak, 10, [t, 'Va'])
+    t_is(Pfs, Pfk, 10, [t, 'Pf'])
+    t_is(solver.factorizations, 1, 12, [t, 'factored once'])
+
+    ## reference angle
+    t = 'DCPFSolver : '
+    Va1, _ = solver.solve(Pbus, Va0)
+    Va, _ = DCPFSolver(B, ref, pv, pq).solve(Pbus)
+    t_is(Va[ref], 0, 12, [t, 'zero reference angle'])
+    t_is(Va, Va1 - Va0[ref], 10, [t, 'angles relative to reference'])
+
+    ## fill-reducing ordering
+    perm = bus_ordering(ppc, 2)['order']['bus']['perm']
+    so = DCPFSolver(B, ref, pv, pq, Bf, Pfinj, perm)
+    Vao, _ = so.solve(P, Va0)
+    t_is(Vao, Vas, 10, [t, 'ordered, Va'])
+    t_ok(so.fill < solver.fill, [t, 'ordered, less fill than COLAMD'])
+
+    ## network update
+    B2, Bf2, _, _ = makeBdc(baseMVA, bus, branch[1:, :])
+    solver.update(B2, Bf2, Pfinj[1:])
+    Va, _ = solver.solve(Pbus, Va0)
+    t_is(Va, dcpf(B2, Pbus, Va0, ref, pv, pq), 10, [t, 'update'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_dcpf_solver(quiet=False)
@@ -0,0 +1,110 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the fast decoupled power flow solver object.
+"""
+
+from numpy import exp, pi, r_
+
+from pypower.case14 import case14
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.bustypes import bustypes
+from pypower.makeYbus import makeYbus
+from pypower.makeSbus import makeSbus
+from pypower.makeB import makeB
+from pypower.newtonpf import newtonpf
+from pypower.fdpf import fdpf
+from pypower.fdpf_solver import FDPFSolver
+from pypower.runpf import runpf
+
+from pypower.idx_bus import VM, VA
+from pypower.idx_brch import BR_STATUS
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_fdpf_solver(quiet=False):
+    """Tests for the fast decoupled power flow solver object.
+    """
+    t_begin(15, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+
+    ppc = ext2int(loadcase(case30()))
+    baseMVA, bus, gen, branch = \
+        ppc['baseMVA'], ppc['bus'], ppc['gen'], ppc['branch']
+    ref, pv, pq = bustypes(bus, gen)
+    Ybus, _, _ = makeYbus(baseMVA, bus, branch)
+    Sbus = makeSbus(baseMVA, bus, gen)
+    Bp, Bpp = makeB(baseMVA, bus, branch, 2)
+    V0 = bus[:, VM] * exp(1j * pi / 180 * bus[:, VA])
+
+    t = 'FDPFSolver : '
+    solver = FDPFSolver(Ybus, Bp, Bpp, ref, pv, pq, ppopt)
+    V, success, its = solver.solve(Sbus, V0.copy())
+    V1, _, its1 = fdpf(Ybus, Sbus, V0.copy(), Bp, Bpp, ref, pv, pq, ppopt)
+    t_ok(success, [t, 'success'])
+    t_is(V, V1, 10, [t, 'same as fdpf'])
+    t_is(its, its1, 12, [t, 'iterations'])
+
+    for k, s in enumerate([0.9, 1.1]):
+        Vs, _, _ = solver.solve(s * Sbus, V0.copy())
+        Vnr, _, _ = newtonpf(Ybus, s * Sbus, V0.copy(), ref, pv, pq, ppopt)
+        t_is(Vs, Vnr, 6, [t, 'scenario %d' % k])
+    t_is(solver.factorizations, 2, 12, [t, 'factors reused'])
+
+    ## changes of the network and the bus types
+    solver.update(Bp=Bp.copy(), Bpp=Bpp.copy())
+    solver.factor()
+    t_is(solver.factorizations, 2, 12, [t, 'unchanged B matrices'])
+
+    solver.update(ref=ref, pv=pv[1:], pq=r_[pq, pv[0]])
+    solver.factor()
+    t_is(solver.factorizations, 3, 12, [t, 'PV to PQ, only Bpp refactored'])
+
+    solver.update(Bp=2 * Bp)
+    solver.factor()
+    t_is(solver.factorizations, 4, 12, [t, 'new Bp'])
+
+    ## change of the topology
+    solver = FDPFSolver(Ybus, Bp, Bpp, ref, pv, pq, ppopt)
+    solver.solve(Sbus, V0.copy())
+    Y = Ybus.copy()
+    solver.update(Ybus=Y)
+    solver.factor()
+    t_is(solver.factorizations, 2, 12, [t, 'same Ybus'])
+    br = branch.copy()
+    br[4, BR_STATUS] = 0
+    Ybus2, _, _ = makeYbus(baseMVA, bus, br)
+    try:
+        solver.update(Ybus=Ybus2)
+        t_ok(0, [t, 'new Ybus without B matrices'])
+    except ValueError:
+        t_ok(solver.Ybus is Y and solver.factorizations == 2,
+             [t, 'new Ybus without B matrices'])
+    solver.update(baseMVA=baseMVA, bus=bus, branch=br)
+    V, success, _ = solver.solve(Sbus, V0.copy())
+    Vnr, _, _ = newtonpf(Ybus2, Sbus, V0.copy(), ref, pv, pq, ppopt)
+    t_ok(success and solver.factorizations == 4,
+         [t, 'branch outage, both B matrices refactored'])
+    t_is(V, Vnr, 6, [t, 'branch outage, V'])
+
+    ## runpf with Q limits
+    t = 'runpf, fast-decoupled with Q limits : '
+    r, success = runpf(case14(), ppoption(ppopt, PF_ALG=2, ENFORCE_Q_LIMS=1))
+    rnr, _ = runpf(case14(), ppoption(ppopt, ENFORCE_Q_LIMS=1))
+    t_ok(success, [t, 'success'])
+    t_is(r['bus'][:, [VM, VA]], rnr['bus'][:, [VM, VA]], 5, [t, 'V'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_fdpf_solver(quiet=False)
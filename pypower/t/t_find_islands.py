@@ -0,0 +1,109 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for island detection and power flows of islanded networks.
+"""
+
+from numpy import arange, zeros, r_
+
+from pypower.case9 import case9
+from pypower.ppoption import ppoption
+from pypower.find_islands import find_islands
+from pypower.runpf import runpf
+
+from pypower.idx_bus import BUS_I, BUS_TYPE, VM, VA, PV, REF, NONE
+from pypower.idx_brch import F_BUS, T_BUS, BR_STATUS, PF, QF, PT, QT
+from pypower.idx_gen import GEN_BUS, GEN_STATUS, PG, QG, VG
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_find_islands(quiet=False):
+    """Tests for island detection and power flows of islanded networks.
+    """
+    t_begin(22, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+
+    ## two copies of case9, the second one without reference bus
+    ppc = _two_islands()
+
+    t = 'find_islands : '
+    groups, isolated = find_islands(ppc)
+    t_is(len(groups), 2, 12, [t, 'number of islands'])
+    t_is(r_[groups[0], groups[1]], arange(18), 12, [t, 'buses'])
+    t_is(len(isolated), 0, 12, [t, 'no isolated buses'])
+
+    c = case9()
+    c['branch'][3, BR_STATUS] = 0           ## bus 3 is isolated
+    c['bus'][4, BUS_TYPE] = NONE            ## and so is bus 5
+    groups, isolated = find_islands(c)
+    t_is(groups[0], [0, 1, 3, 5, 6, 7, 8], 12, [t, 'isolated buses ignored'])
+    t_is(isolated, [2], 12, [t, 'isolated'])
+
+    ## energized islands
+    r1, _ = runpf(case9(), ppopt)
+    c = case9()
+    c['bus'][0, BUS_TYPE] = PV
+    c['bus'][1, BUS_TYPE] = REF             ## gen with the largest PMAX
+    r2, _ = runpf(c, ppopt)
+    for islands in [1, 2]:
+        t = 'runpf, PF_ISLANDS = %d : ' % islands
+        r, success = runpf(ppc, ppoption(ppopt, PF_ISLANDS=islands))
+        t_ok(success, [t, 'success'])
+        t_is([r['pf_info']['islands'], r['pf_info']['dead_islands']], [2, 0],
+             12, [t, 'islands'])
+        t_is(r['bus'][:, [VM, VA]], r_[r1['bus'], r2['bus']][:, [VM, VA]], 8,
+             [t, 'V'])
+        t_is(r['gen'][:, [PG, QG]], r_[r1['gen'], r2['gen']][:, [PG, QG]], 6,
+             [t, 'Pg, Qg'])
+        t_is(r['branch'][:, [PF, QF, PT, QT]],
+             r_[r1['branch'], r2['branch']][:, [PF, QF, PT, QT]], 6,
+             [t, 'branch flows'])
+
+    ## de-energized island and single bus island
+    t = 'runpf, dead island : '
+    ppc['gen'][3:, GEN_STATUS] = 0
+    ppc['branch'][[3, 4], BR_STATUS] = 0
+    r, success = runpf(ppc, ppoption(ppopt, PF_ISLANDS=1))
+    t_ok(success, [t, 'success'])
+    t_is([r['pf_info']['islands'], r['pf_info']['dead_islands']], [3, 1], 12,
+         [t, 'islands'])
+    t_ok(all(r['bus'][9:, BUS_TYPE] == NONE), [t, 'buses de-energized'])
+    t_is(r['bus'][9:, [VM, VA]], zeros((9, 2)), 12, [t, 'V'])
+    t_is(r['branch'][9:, [PF, QF, PT, QT]], zeros((9, 4)), 12,
+         [t, 'branch flows'])
+
+    t = 'runpf, single bus island : '
+    t_is(r['bus'][2, [VM, VA]], [r['gen'][2, VG], 0], 12, [t, 'V'])
+    t_is(r['gen'][2, [PG, QG]], zeros(2), 12, [t, 'Pg, Qg'])
+
+    t_end()
+
+
+def _two_islands():
+    """Two copies of case9, the buses of the second one numbered from 101.
+    """
+    ppc = case9()
+    bus = ppc['bus'].copy()
+    gen = ppc['gen'].copy()
+    branch = ppc['branch'].copy()
+    bus[:, BUS_I] += 100
+    bus[bus[:, BUS_TYPE] == REF, BUS_TYPE] = PV
+    gen[:, GEN_BUS] += 100
+    branch[:, [F_BUS, T_BUS]] += 100
+
+    ppc['bus'] = r_[ppc['bus'], bus]
+    ppc['gen'] = r_[ppc['gen'], gen]
+    ppc['branch'] = r_[ppc['branch'], branch]
+    ppc['gencost'] = r_[ppc['gencost'], ppc['gencost']]
+
+    return ppc
+
+
+if __name__ == '__main__':
+    t_find_islands(quiet=False)
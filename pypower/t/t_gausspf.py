@@ -0,0 +1,84 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the Gauss-Seidel power flow sweeps.
+"""
+
+from numpy import exp, pi, ix_, concatenate
+
+from pypower.case9 import case9
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.bustypes import bustypes
+from pypower.makeYbus import makeYbus
+from pypower.makeSbus import makeSbus
+from pypower.newtonpf import newtonpf
+from pypower.gausspf import gausspf, _color
+
+from pypower.idx_bus import VM, VA
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_gausspf(quiet=False):
+    """Tests for the Gauss-Seidel power flow sweeps.
+    """
+    t_begin(13, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+
+    for case in [case9, case30]:
+        ppc = ext2int(loadcase(case()))
+        baseMVA, bus, gen, branch = \
+            ppc['baseMVA'], ppc['bus'], ppc['gen'], ppc['branch']
+        ref, pv, pq = bustypes(bus, gen)
+        Ybus, _, _ = makeYbus(baseMVA, bus, branch)
+        Sbus = makeSbus(baseMVA, bus, gen)
+        S0 = Sbus.copy()
+        V0 = bus[:, VM] * exp(1j * pi / 180 * bus[:, VA])
+        Vnr, _, _ = newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt)
+
+        for sweep in [0, 2]:
+            t = '%s, PF_GS_SWEEP = %d : ' % (case.__name__, sweep)
+            V, success, _ = gausspf(Ybus, Sbus, V0, ref, pv, pq,
+                                    ppoption(ppopt, PF_GS_SWEEP=sweep))
+            t_ok(success, [t, 'success'])
+            t_is(V, Vnr, 6, [t, 'V'])
+
+    t_is(Sbus, S0, 12, 'Sbus not modified')
+
+    ## Jacobi iteration (converges too slowly for case30)
+    ppc = ext2int(loadcase(case9()))
+    ref, pv, pq = bustypes(ppc['bus'], ppc['gen'])
+    Ybus, _, _ = makeYbus(ppc['baseMVA'], ppc['bus'], ppc['branch'])
+    Sbus = makeSbus(ppc['baseMVA'], ppc['bus'], ppc['gen'])
+    V0 = ppc['bus'][:, VM] * exp(1j * pi / 180 * ppc['bus'][:, VA])
+    Vnr, _, _ = newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt)
+    V, success, _ = gausspf(Ybus, Sbus, V0, ref, pv, pq,
+                            ppoption(ppopt, PF_GS_SWEEP=1))
+    t_ok(success, 'PF_GS_SWEEP = 1 : success')
+    t_is(V, Vnr, 6, 'PF_GS_SWEEP = 1 : V')
+
+    ## coloring
+    ppc = ext2int(loadcase(case30()))
+    Ybus, _, _ = makeYbus(ppc['baseMVA'], ppc['bus'], ppc['branch'])
+    Ybus = Ybus.tocsr()
+    buses = concatenate(bustypes(ppc['bus'], ppc['gen'])[1:])
+    groups = _color(Ybus, buses)
+    A = abs(Ybus.toarray()) > 0
+    t_ok(all([A[ix_(g, g)].sum() == len(g) for g in groups]),
+         '_color : no adjacent buses of the same color')
+    t_is(sorted(concatenate(groups)), sorted(buses), 12,
+         '_color : all buses colored')
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_gausspf(quiet=False)
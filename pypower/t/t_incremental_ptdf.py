@@ -0,0 +1,80 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for rank-1 updates of the PTDF matrix.
+"""
+
+from numpy import ones
+
+from pypower.case30 import case30
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.makePTDF import makePTDF
+from pypower.makeLODF import makeLODF
+from pypower.incremental_ptdf import IncrementalPTDF
+
+from pypower.idx_brch import BR_STATUS
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_incremental_ptdf(quiet=False):
+    """Tests for rank-1 updates of the PTDF matrix.
+    """
+    t_begin(14, quiet)
+
+    ppc = ext2int(loadcase(case30()))
+    baseMVA, bus, branch = ppc['baseMVA'], ppc['bus'], ppc['branch']
+    nb = bus.shape[0]
+    conts = [0, 5, 20, 30]
+
+    t = 'IncrementalPTDF : '
+    ip = IncrementalPTDF(baseMVA, bus, branch)
+    H = ip.H
+    t_is(ip.H, makePTDF(baseMVA, bus, branch), 10, [t, 'initial'])
+    ip.lodf.columns(conts)
+
+    br = branch.copy()
+    for k in [6, 26, 9]:
+        t_ok(ip.outage(k), [t, 'outage %d' % k])
+        br[k, BR_STATUS] = 0
+    Href = makePTDF(baseMVA, bus, br)
+    t_is(ip.H, Href, 8, [t, 'after outages'])
+    t_is(ip.lodf.columns(conts), makeLODF(br, Href)[:, conts], 8,
+         [t, 'cached LODF columns'])
+    t_is(ip.lodf.cache.stats()['misses'], len(conts), 12,
+         [t, 'LODF columns not recomputed from scratch'])
+
+    ip.restore(26)
+    br[26, BR_STATUS] = 1
+    t_is(ip.H, makePTDF(baseMVA, bus, br), 8, [t, 'after restoration'])
+    ip.restore(6)
+    ip.restore(9)
+    t_is(ip.H, makePTDF(baseMVA, bus, branch), 8, [t, 'all restored'])
+    t_ok(ip.H is H, [t, 'updated in place'])
+
+    ## branch 12 connects bus 11, which has no other branch
+    t_ok(ip.islanding(12), [t, 'islanding'])
+    t_ok(not ip.outage(12), [t, 'islanding outage refused'])
+    t_is(ip.H, makePTDF(baseMVA, bus, branch), 8, [t, 'islanding unchanged'])
+
+    t = 'IncrementalPTDF, distributed slack : '
+    br = branch.copy()
+    br[3, BR_STATUS] = 0
+    ip = IncrementalPTDF(baseMVA, bus, br, ones(nb))
+    ip.outage(7)
+    ip.restore(3)
+    br[3, BR_STATUS] = 1
+    br[7, BR_STATUS] = 0
+    t_is(ip.H, makePTDF(baseMVA, bus, br, ones(nb)), 8,
+         [t, 'initial outage restored'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_incremental_ptdf(quiet=False)
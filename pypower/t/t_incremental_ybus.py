@@ -0,0 +1,71 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for incremental updates of the admittance matrices.
+"""
+
+from pypower.case30 import case30
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.makeYbus import makeYbus
+from pypower.incremental_ybus import IncrementalYbus
+
+from pypower.idx_brch import BR_STATUS, BR_X, TAP, SHIFT
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_incremental_ybus(quiet=False):
+    """Tests for incremental updates of the admittance matrices.
+    """
+    t_begin(17, quiet)
+
+    ppc = ext2int(loadcase(case30()))
+    baseMVA, bus, branch = ppc['baseMVA'], ppc['bus'], ppc['branch']
+
+    def check(yb, br, msg):
+        Ybus, Yf, Yt = makeYbus(baseMVA, bus, br)
+        t_is(yb.Ybus.toarray(), Ybus.toarray(), 12, [t, msg, ', Ybus'])
+        t_is(yb.Yf.toarray(), Yf.toarray(), 12, [t, msg, ', Yf'])
+        t_is(yb.Yt.toarray(), Yt.toarray(), 12, [t, msg, ', Yt'])
+
+    t = 'IncrementalYbus : '
+    yb = IncrementalYbus(baseMVA, bus, branch)
+    Ybus = yb.Ybus
+    check(yb, branch, 'initial')
+
+    br = branch.copy()
+    br[[4, 9], BR_STATUS] = 0
+    yb.outage([4, 9])
+    check(yb, br, 'outage')
+    t_is(yb.branch[:, BR_STATUS], br[:, BR_STATUS], 12, [t, 'branch status'])
+
+    br[4, BR_STATUS] = 1
+    yb.restore(4)
+    check(yb, br, 'restore')
+
+    br[11, TAP] = 1.05
+    br[11, SHIFT] = -2
+    yb.set_tap(11, 1.05, -2)
+    br[12, BR_X] = 2 * br[12, BR_X]
+    yb.set_impedance(12, x=br[12, BR_X])
+    check(yb, br, 'tap and impedance')
+
+    t_ok(yb.Ybus is Ybus, [t, 'Ybus updated in place'])
+
+    ## parallel branches
+    br = branch[[0, 0, 1], :].copy()
+    yb = IncrementalYbus(baseMVA, bus, br)
+    br[1, BR_STATUS] = 0
+    yb.outage(1)
+    check(yb, br, 'parallel branches')
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_incremental_ybus(quiet=False)
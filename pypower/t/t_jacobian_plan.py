@@ -0,0 +1,110 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the precomputed power flow Jacobian structure.
+"""
+
+from numpy import array, exp, pi, r_, ix_
+from numpy.random import RandomState
+
+from scipy.sparse import csr_matrix
+
+from pypower.case30 import case30
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.bustypes import bustypes
+from pypower.idx_bus import VM, VA
+from pypower.makeYbus import makeYbus
+from pypower.makeSbus import makeSbus
+from pypower.newtonpf import newtonpf
+from pypower.ppoption import ppoption
+from pypower.dSbus_dV import dSbus_dV
+from pypower.jacobian_plan import JacobianPlan
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def full_jac(Ybus, V, pv, pq):
+    """Dense power flow Jacobian built directly from C{dSbus_dV}.
+    """
+    dS_dVm, dS_dVa = dSbus_dV(Ybus, V)
+    dS_dVm, dS_dVa = dS_dVm.toarray(), dS_dVa.toarray()
+    pvpq = r_[pv, pq]
+    return r_['0,2', r_['1,2', dS_dVa[ix_(pvpq, pvpq)].real,
+                               dS_dVm[ix_(pvpq, pq)].real],
+                     r_['1,2', dS_dVa[ix_(pq, pvpq)].imag,
+                               dS_dVm[ix_(pq, pq)].imag]]
+
+
+def t_jacobian_plan(quiet=False):
+    """Tests for the precomputed power flow Jacobian structure.
+    """
+    t_begin(12, quiet)
+
+    ppc = ext2int(loadcase(case30()))
+    baseMVA, bus, gen, branch = \
+        ppc['baseMVA'], ppc['bus'], ppc['gen'], ppc['branch']
+    ref, pv, pq = bustypes(bus, gen)
+    Ybus, _, _ = makeYbus(baseMVA, bus, branch)
+    nb = bus.shape[0]
+
+    rs = RandomState(42)
+    V1 = (1 + 0.1 * rs.randn(nb)) * exp(0.2j * rs.randn(nb))
+    V2 = (1 + 0.1 * rs.randn(nb)) * exp(0.2j * rs.randn(nb))
+
+    t = 'JacobianPlan : '
+    plan = JacobianPlan(Ybus, pv, pq)
+    J = plan.jac(V1)
+    t_is(J.toarray(), full_jac(Ybus, V1, pv, pq), 12, [t, 'J(V1)'])
+    J2 = plan.jac(V2)
+    t_ok(J2 is J, [t, 'same matrix refilled'])
+    t_is(J2.toarray(), full_jac(Ybus, V2, pv, pq), 12, [t, 'J(V2)'])
+
+    Jb = plan.jac_batch(array([V1, V2])).toarray()
+    n = J.shape[0]
+    t_is(Jb[:n, :n], full_jac(Ybus, V1, pv, pq), 12, [t, 'batch, block 1'])
+    t_is(Jb[n:, n:], full_jac(Ybus, V2, pv, pq), 12, [t, 'batch, block 2'])
+    t_is(abs(Jb[:n, n:]).max(), 0, 12, [t, 'batch, off-diagonal blocks'])
+
+    ## canonical CSR Ybus is used in place
+    Y = csr_matrix(Ybus)
+    Y.sort_indices()
+    plan = JacobianPlan(Y, pv, pq)
+    Y.data *= 2
+    t_is(plan.jac(V1).toarray(), full_jac(Y, V1, pv, pq), 12,
+         [t, 'in-place change of Ybus'])
+
+    ## another Ybus with the same pattern
+    Y2 = Ybus.tocoo()
+    Y2.data = Y2.data * 3
+    t_ok(plan.matches(Ybus, pv, pq) and plan.matches(Y2, pv, pq) and
+         not plan.matches(Ybus, pq[:1], pq[1:]), [t, 'matches'])
+    plan.update(Y2)
+    t_is(plan.jac(V1).toarray(), full_jac(Y2.tocsr(), V1, pv, pq), 12,
+         [t, 'update'])
+    Y3 = Ybus.tolil()
+    Y3[pq[0], pq[-1]] = 1j
+    t_ok(not plan.matches(Y3, pv, pq), [t, 'other pattern'])
+    try:
+        plan.update(Y3)
+        t_ok(0, [t, 'update, other pattern'])
+    except ValueError:
+        t_ok(1, [t, 'update, other pattern'])
+
+    ## newtonpf uses a plan built from the Ybus it is given
+    plan = JacobianPlan(Ybus, pv, pq)
+    Sbus = makeSbus(baseMVA, bus, gen)
+    V0 = bus[:, VM] * exp(1j * bus[:, VA] * pi / 180)
+    V, success, _ = newtonpf(Ybus, Sbus, V0, ref, pv, pq,
+                             ppoption(VERBOSE=0), plan=plan)
+    t_ok(success and abs(plan.J.data).max() > 0, [t, 'used by newtonpf'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_jacobian_plan(quiet=False)
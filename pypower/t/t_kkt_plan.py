@@ -0,0 +1,103 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the precomputed PIPS Newton (KKT) system structure.
+"""
+
+from numpy import array, zeros, ones
+from numpy.random import RandomState
+
+from scipy.sparse import vstack, hstack, diags, csr_matrix, \
+    random as sprandom, eye as speye
+
+from pypower.kkt_plan import KKTPlan
+from pypower.pips import pips
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def full_kkt(Lxx, dh, dg, d):
+    """KKT matrix assembled directly from its blocks.
+    """
+    M = Lxx if dh is None else Lxx + dh * diags(d) * dh.T
+    if dg is None:
+        return M.toarray()
+    neq = dg.shape[1]
+    return vstack([hstack([M, dg]),
+                   hstack([dg.T, csr_matrix((neq, neq))])]).toarray()
+
+
+def t_kkt_plan(quiet=False):
+    """Tests for the precomputed PIPS Newton (KKT) system structure.
+    """
+    t_begin(12, quiet)
+
+    rs = RandomState(42)
+    nx, niq, neq = 30, 40, 10
+    S = sprandom(nx, nx, 0.1, random_state=rs)
+    Lxx = (S + S.T + speye(nx)).tocsr()
+    dh = sprandom(nx, niq, 0.1, random_state=rs).tocsr()
+    dg = sprandom(nx, neq, 0.2, random_state=rs).tocsc()
+    d = rs.rand(niq)
+
+    t = 'KKTPlan : '
+    plan = KKTPlan(Lxx, dh, dg)
+    K = plan.kkt(Lxx, dh, dg, d)
+    t_is(K.toarray(), full_kkt(Lxx, dh, dg, d), 12, [t, 'KKT matrix'])
+    d = rs.rand(niq)
+    Lxx.data = rs.rand(Lxx.nnz)
+    K2 = plan.kkt(Lxx, dh, dg, d)
+    t_ok(K2 is K, [t, 'same matrix object'])
+    t_is(K2.toarray(), full_kkt(Lxx, dh, dg, d), 12, [t, 'refilled values'])
+    t_ok(plan.matches(Lxx.tocoo(), dh.tocsc(), dg.tocsr()),
+         [t, 'matches, other formats'])
+
+    ## entries left out, and entries outside the pattern
+    dh1 = dh.copy()
+    dh1.data[:5] = 0
+    dh1.eliminate_zeros()
+    t_ok(not plan.matches(Lxx, dh1, dg), [t, 'other pattern'])
+    t_is(plan.kkt(Lxx, dh1, dg, d).toarray(), full_kkt(Lxx, dh1, dg, d), 12,
+         [t, 'pattern fitting into the plan'])
+    dg2 = dg.tolil()
+    for r in range(nx):
+        if dg2[r, 0] == 0:
+            dg2[r, 0] = 1.0
+            break
+    dg2 = dg2.tocsc()
+    t_ok(plan.kkt(Lxx, dh, dg2, d) is None, [t, 'entries outside the pattern'])
+    plan2 = KKTPlan(Lxx, dh, dg2, plan)
+    t_is(plan2.kkt(Lxx, dh, dg, d).toarray(), full_kkt(Lxx, dh, dg, d), 12,
+         [t, 'union with the previous plan'])
+
+    ## without constraints of either kind
+    t_is(KKTPlan(Lxx, None, dg).kkt(Lxx, None, dg, None).toarray(),
+         full_kkt(Lxx, None, dg, None), 12, [t, 'no inequalities'])
+    t_is(KKTPlan(Lxx, dh, None).kkt(Lxx, dh, None, d).toarray(),
+         full_kkt(Lxx, dh, None, d), 12, [t, 'no equalities'])
+
+    ## PIPS on a QP, whose KKT pattern is fixed
+    t = 'pips : '
+    H = (S * S.T + speye(nx)).tocsr()
+    c = rs.randn(nx)
+    f_fcn = lambda x, return_hessian=False: \
+        (0.5 * x.dot(H * x) + c.dot(x), H * x + c) if not return_hessian \
+        else (0.5 * x.dot(H * x) + c.dot(x), H * x + c, H)
+    A = csr_matrix(ones((1, nx)))
+    sol = pips(f_fcn, zeros(nx), A, array([-1.0]), array([1.0]),
+               -ones(nx), ones(nx))
+    out = sol['output']
+    t_ok(sol['eflag'] and out['kkt_orderings'] == 1,
+         [t, 'converged, one ordering'])
+    t_ok(all(['et_assemble' in h and 'et_solve' in h for h in out['hist']]),
+         [t, 'timings'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_kkt_plan(quiet=False)
@@ -0,0 +1,87 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the line outage distribution factors computed on demand.
+"""
+
+from numpy import array, isnan
+
+from pypower.case118 import case118
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.bustypes import bustypes
+from pypower.makeBdc import makeBdc
+from pypower.makeSbus import makeSbus
+from pypower.makePTDF import makePTDF
+from pypower.makeLODF import makeLODF
+from pypower.ptdf_solver import PTDFSolver
+from pypower.lodf_solver import LODFSolver
+from pypower.dcpf_solver import DCPFSolver
+
+from pypower.idx_bus import GS
+from pypower.idx_brch import BR_STATUS
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_lodf_solver(quiet=False):
+    """Tests for the line outage distribution factors computed on demand.
+    """
+    t_begin(12, quiet)
+
+    ppc = ext2int(loadcase(case118()))
+    baseMVA, bus, gen, branch = \
+        ppc['baseMVA'], ppc['bus'], ppc['gen'], ppc['branch']
+    ref, pv, pq = bustypes(bus, gen)
+    B, Bf, Pbusinj, Pfinj = makeBdc(baseMVA, bus, branch)
+    H = makePTDF(baseMVA, bus, branch)
+    L = makeLODF(branch, H)
+
+    ## branch 8 connects bus 9, which has no other branch
+    idx = array([0, 5, 8, 100, 5])
+    ok = array([0, 1, 3, 4])
+
+    t = 'LODFSolver, PTDF matrix : '
+    lodf = LODFSolver(branch, H)
+    C = lodf.columns(idx)
+    t_is(C[:, ok], L[:, idx[ok]], 10, [t, 'columns'])
+    t_ok(all(isnan(C[:, 2])), [t, 'islanding column is nan'])
+    t_is(lodf.islanding(idx), [0, 0, 1, 0, 0], 12, [t, 'islanding'])
+    t_is(len(lodf.cache), 4, 12, [t, 'columns cached once'])
+
+    t = 'LODFSolver, PTDFSolver : '
+    lodf = LODFSolver(branch, PTDFSolver(B, Bf))
+    t_is(lodf.columns(idx)[:, ok], L[:, idx[ok]], 10, [t, 'columns'])
+
+    t = 'LODFSolver, threshold : '
+    lodf = LODFSolver(branch, H, threshold=1e-3, cache_size=2)
+    C = lodf.columns(idx[ok])
+    Lk = L[:, idx[ok]]
+    t_ok(C.nnz == (abs(Lk) >= 1e-3).sum(), [t, 'small entries dropped'])
+    Lk[abs(Lk) < 1e-3] = 0
+    t_is(C.toarray(), Lk, 10, [t, 'columns'])
+    t_is(len(lodf.cache), 2, 12, [t, 'cache size'])
+    t_is(lodf.columns([100]).toarray(), Lk[:, [2]], 10, [t, 'cached column'])
+    t_is(lodf.cache.stats()['hits'], 1, 12, [t, 'cache hit'])
+
+    ## post-outage flows from a DC power flow without the branch
+    t = 'LODFSolver : '
+    Pbus = makeSbus(baseMVA, bus, gen).real - Pbusinj - bus[:, GS] / baseMVA
+    _, F0 = DCPFSolver(B, ref, pv, pq, Bf, Pfinj).solve(Pbus)
+    branch2 = branch.copy()
+    branch2[100, BR_STATUS] = 0
+    B2, Bf2, _, _ = makeBdc(baseMVA, bus, branch2)
+    _, F = DCPFSolver(B2, ref, pv, pq, Bf2, Pfinj).solve(Pbus)
+    t_is(F, F0 + L[:, 100] * F0[100], 8, [t, 'post-outage flows'])
+    t_is(F, F0 + lodf.columns([100]).toarray()[:, 0] * F0[100], 1,
+         [t, 'post-outage flows, threshold'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_lodf_solver(quiet=False)
@@ -0,0 +1,111 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for C{loss_sensitivity}.
+"""
+
+from numpy import zeros, exp, pi, conj, r_
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.bustypes import bustypes
+from pypower.bus_ordering import bus_ordering
+from pypower.makeYbus import makeYbus
+from pypower.makeSbus import makeSbus
+from pypower.newtonpf import newtonpf
+from pypower.loss_sensitivity import loss_sensitivity
+from pypower.jacobian_plan import JacobianPlan
+from pypower.pflinsolver import ILUSolver
+
+from pypower.idx_bus import VM, VA
+from pypower.idx_gen import GEN_BUS, VG
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_loss_sensitivity(quiet=False):
+    """Tests for C{loss_sensitivity}.
+    """
+    t_begin(12, quiet)
+
+    ppopt = ppoption(VERBOSE=0, PF_TOL=1e-12)
+    ppc = bus_ordering(ext2int(loadcase(case30())))
+    baseMVA, bus, gen, branch = \
+        ppc['baseMVA'], ppc['bus'], ppc['gen'], ppc['branch']
+    ref, pv, pq = bustypes(bus, gen)
+    Ybus, _, _ = makeYbus(baseMVA, bus, branch)
+    Sbus = makeSbus(baseMVA, bus, gen)
+    V0 = bus[:, VM] * exp(1j * pi / 180 * bus[:, VA])
+    gbus = gen[:, GEN_BUS].astype(int)
+    V0[gbus] = gen[:, VG] / abs(V0[gbus]) * V0[gbus]
+    nb = bus.shape[0]
+
+    t = 'newtonpf : '
+    V, success, its = newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt)
+    info = {}
+    V1, success1, its1, lin = newtonpf(Ybus, Sbus, V0, ref, pv, pq,
+                                       ppoption(ppopt, PF_LIN_SOLVER=1),
+                                       info=info, return_solver=True)
+    t_ok(success1 and its1 == its, [t, 'return_solver, success'])
+    t_is(V1, V, 12, [t, 'return_solver, V'])
+    t_ok(info['factorizations'] == its + 1,
+         [t, 'return_solver, Jacobian at the solution factored'])
+
+    ## losses by central differences of the injections
+    loss = lambda V: sum((V * conj(Ybus * V)).real)
+    d = 1e-4
+    dP = zeros(nb)
+    dQ = zeros(nb)
+    for i in r_[pv, pq]:
+        for dS, u in [(dP, 1), (dQ, 1j)]:
+            if u == 1j and i in pv:
+                continue
+            S = Sbus.copy()
+            S[i] += d * u
+            L1 = loss(newtonpf(Ybus, S, V, ref, pv, pq, ppopt)[0])
+            S[i] -= 2 * d * u
+            L2 = loss(newtonpf(Ybus, S, V, ref, pv, pq, ppopt)[0])
+            dS[i] = (L1 - L2) / (2 * d)
+
+    t = 'loss_sensitivity : '
+    dPL_dP, dPL_dQ, pf = loss_sensitivity(Ybus, V, ref, pv, pq, lin)
+    t_is(dPL_dP, dP, 7, [t, 'dPL_dP'])
+    t_is(dPL_dQ, dQ, 7, [t, 'dPL_dQ'])
+    t_is(pf, 1 / (1 - dP), 7, [t, 'penalty factors'])
+    t_is(r_[dPL_dP[ref], dPL_dQ[ref], dPL_dQ[pv], pf[ref]],
+         r_[zeros(2 + len(pv)), 1], 12, [t, 'swing and PV buses'])
+
+    t_is(loss_sensitivity(Ybus, V, ref, pv, pq)[0], dPL_dP, 12,
+         [t, 'without solver'])
+    _, _, _, lin = newtonpf(Ybus, Sbus, V0, ref, pv, pq,
+                            ppoption(ppopt, PF_JAC_REUSE=2),
+                            perm=ppc['order']['bus']['perm'],
+                            return_solver=True)
+    t_is(loss_sensitivity(Ybus, V, ref, pv, pq, lin)[0], dPL_dP, 10,
+         [t, 'LU solver with bus ordering'])
+    _, _, _, lin = newtonpf(Ybus, Sbus, V0, ref, pv, pq,
+                            ppoption(ppopt, PF_LIN_SOLVER=2),
+                            return_solver=True)
+    t_is(loss_sensitivity(Ybus, V, ref, pv, pq, lin)[0], dPL_dP, 10,
+         [t, 'Krylov solver, new factorization'])
+    ilu = ILUSolver(drop_tol=0.1, fill_factor=1)
+    ilu.factor(JacobianPlan(Ybus, pv, pq).jac(V))
+    t_is(loss_sensitivity(Ybus, V, ref, pv, pq, ilu)[0], dPL_dP, 10,
+         [t, 'incomplete factors, new factorization'])
+
+    ## additional injections far from the swing bus reduce the losses,
+    ## so those buses have penalty factors below one
+    far = dPL_dP.argmin()
+    t_ok(dPL_dP[far] < 0 and pf[far] < 1, [t, 'sign'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_loss_sensitivity(quiet=False)
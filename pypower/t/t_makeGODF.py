@@ -0,0 +1,95 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for C{makeGSDF} and C{makeGODF}.
+"""
+
+from copy import deepcopy
+
+from numpy import zeros, ones, arange
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.rundcpf import rundcpf
+from pypower.ext2int import ext2int1
+from pypower.makePTDF import makePTDF
+from pypower.makeGSDF import makeGSDF
+from pypower.makeGODF import makeGODF
+
+from pypower.idx_gen import GEN_BUS, PG, GEN_STATUS, APF
+from pypower.idx_brch import PF
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_end import t_end
+
+
+def t_makeGODF(quiet=False):
+    """Tests for C{makeGSDF} and C{makeGODF}.
+    """
+    t_begin(7, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    ppc = case30()
+    ppc['gen'][:, APF] = [0, 2, 1, 1, 0, 3]
+    ppc['gen'][4, GEN_STATUS] = 0
+    r, _ = rundcpf(ppc, ppopt)
+    F0 = r['branch'][:, PF]
+    _, bus, gen, branch = ext2int1(r['bus'].copy(), r['gen'].copy(),
+                                   r['branch'].copy())
+    baseMVA = r['baseMVA']
+    ng = gen.shape[0]
+    gbus = gen[:, GEN_BUS].astype(int)
+
+    ## post-outage flows from a DC power flow of each modified case
+    Fref = zeros((branch.shape[0], ng))
+    for g in range(ng):
+        c = deepcopy(ppc)
+        c['gen'][:, PG] = r['gen'][:, PG]
+        if g != 4:
+            a = c['gen'][:, APF] * (c['gen'][:, GEN_STATUS] > 0)
+            a[g] = 0
+            c['gen'][:, PG] += a / sum(a) * c['gen'][g, PG]
+            c['gen'][g, GEN_STATUS] = 0
+        Fref[:, g] = rundcpf(c, ppopt)[0]['branch'][:, PF]
+
+    t = 'makeGSDF : '
+    H = makePTDF(baseMVA, bus, branch)
+    G = makeGSDF(baseMVA, bus, gen, branch)
+    t_is(G, H[:, gbus], 10, [t, 'PTDF columns'])
+    w = zeros(bus.shape[0])
+    w[gbus] = gen[:, APF]
+    Hw = makePTDF(baseMVA, bus, branch, w)
+    t_is(makeGSDF(baseMVA, bus, gen, branch, w, [3, 7]), Hw[[3, 7]][:, gbus],
+         10, [t, 'distributed slack, rows'])
+
+    t = 'makeGODF : '
+    GODF = makeGODF(gen, G)
+    F = F0.reshape(-1, 1) + GODF * gen[:, PG]
+    t_is(F, Fref, 6, [t, 'post-outage flows'])
+    t_is(GODF[:, 4], zeros(branch.shape[0]), 12,
+         [t, 'generator out of service'])
+    t_is(makeGODF(gen, Hw[:, gbus]), GODF, 10, [t, 'independent of slack'])
+
+    ## no participation factors, the slack bus picks up the lost output
+    gen0 = gen.copy()
+    gen0[:, APF] = 0
+    Fref = zeros((branch.shape[0], ng))
+    for g in arange(ng):
+        c = deepcopy(ppc)
+        c['gen'][:, PG] = r['gen'][:, PG]
+        c['gen'][g, GEN_STATUS] = 0
+        Fref[:, g] = rundcpf(c, ppopt)[0]['branch'][:, PF]
+    GODF = makeGODF(gen0, G)
+    F = F0.reshape(-1, 1) + GODF * gen[:, PG]
+    t_is(F[:, 1:], Fref[:, 1:], 6, [t, 'no APF, slack bus picks up'])
+    Gw = makeGSDF(baseMVA, bus, gen, branch, ones(bus.shape[0]))
+    t_is(makeGODF(gen0, Gw)[:, [0, 1, 2, 3, 5]], -Gw[:, [0, 1, 2, 3, 5]], 12,
+         [t, 'no APF, distributed slack picks up'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_makeGODF(quiet=False)
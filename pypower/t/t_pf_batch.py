@@ -0,0 +1,78 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for batched power flow solvers.
+"""
+
+from numpy import array, outer, pi, exp, r_
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.bustypes import bustypes
+from pypower.makeYbus import makeYbus
+from pypower.makeSbus import makeSbus
+from pypower.newtonpf import newtonpf
+from pypower.newtonpf_batch import newtonpf_batch
+from pypower.runpf import runpf
+from pypower.runpf_batch import runpf_batch
+
+from pypower.idx_bus import VM, VA
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_pf_batch(quiet=False):
+    """Tests for batched power flow solvers.
+    """
+    t_begin(12, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    scale = array([0.8, 1.0, 1.2, 1.5, 10.0])
+
+    ## set up the network
+    ppc = ext2int(loadcase(case30()))
+    baseMVA, bus, gen, branch = \
+        ppc['baseMVA'], ppc['bus'], ppc['gen'], ppc['branch']
+    ref, pv, pq = bustypes(bus, gen)
+    Ybus, _, _ = makeYbus(baseMVA, bus, branch)
+    Sbus = makeSbus(baseMVA, bus, gen)
+    V0 = bus[:, VM] * exp(1j * pi / 180 * bus[:, VA])
+
+    ## compare against individual Newton power flows
+    t = 'newtonpf_batch : '
+    V, success, its = newtonpf_batch(Ybus, outer(scale, Sbus), V0,
+                                     ref, pv, pq, ppopt)
+    for k in range(3):
+        Vk, sk, ik = newtonpf(Ybus, scale[k] * Sbus, V0.copy(),
+                              ref, pv, pq, ppopt)
+        t_is(V[k], Vk, 8, [t, 'V, scenario %d' % k])
+        t_is(int(its[k]), ik, 12, [t, 'iterations, scenario %d' % k])
+    t_is(success, [1, 1, 1, 1, 0], 12, [t, 'success'])
+    t_is(int(its[4]), ppopt['PF_MAX_IT'], 12,
+         [t, 'iterations, not converged'])
+
+    ## single scenario, matrix of initial voltages
+    V1, success, _ = newtonpf_batch(Ybus, Sbus, array([V0]),
+                                    ref, pv, pq, ppopt)
+    t_is(V1[0], V[1], 8, [t, 'single scenario'])
+
+    ## full case interface
+    t = 'runpf_batch : '
+    ppc = loadcase(case30())
+    V, success, _ = runpf_batch(ppc, outer(scale[:2], Sbus), ppopt)
+    r, s = runpf(ppc, ppopt)
+    t_ok(all(success), [t, 'success'])
+    t_is(abs(V[1]), r['bus'][:, VM], 6, [t, 'Vm'])
+    t_is(r_[V[0, 0], V[1, 0]], [1, 1], 6, [t, 'ref bus voltage'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_pf_batch(quiet=False)
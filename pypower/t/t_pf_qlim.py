@@ -0,0 +1,90 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for power flow with enforced generator reactive power limits.
+"""
+
+from numpy import exp, pi, conj, flatnonzero as find
+
+from pypower.case14 import case14
+from pypower.case30 import case30
+from pypower.case118 import case118
+from pypower.case300 import case300
+from pypower.ppoption import ppoption
+from pypower.ext2int import ext2int
+from pypower.makeYbus import makeYbus
+from pypower.makeSbus import makeSbus
+from pypower.runpf import runpf
+
+from pypower.idx_bus import VM, VA
+from pypower.idx_gen import QG, QMAX, QMIN, GEN_STATUS
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_pf_qlim(quiet=False):
+    """Tests for power flow with enforced generator reactive power limits.
+    """
+    t_begin(26, quiet)
+
+    for case, q in [(case14, 1), (case14, 2), (case300, 2)]:
+        t = '%s, ENFORCE_Q_LIMS = %d : ' % (case.__name__, q)
+        ppopt = ppoption(VERBOSE=0, OUT_ALL=0, ENFORCE_Q_LIMS=q)
+        r, success = runpf(case(), ppopt)
+        t_ok(success, [t, 'success'])
+
+        ## gens within limits
+        gen = r['gen'][find(r['gen'][:, GEN_STATUS] > 0), :]
+        t_ok(all(gen[:, QG] < gen[:, QMAX] + 1e-6) and
+             all(gen[:, QG] > gen[:, QMIN] - 1e-6), [t, 'Qg within limits'])
+
+        ## power balance at all buses with the final dispatch
+        ri = ext2int(r)
+        Ybus, _, _ = makeYbus(ri['baseMVA'], ri['bus'], ri['branch'])
+        V = ri['bus'][:, VM] * exp(1j * pi / 180 * ri['bus'][:, VA])
+        Sbus = makeSbus(ri['baseMVA'], ri['bus'], ri['gen'])
+        mis = V * conj(Ybus * V) - Sbus
+        t_is(abs(mis).max(), 0, 6, [t, 'mismatch'])
+
+        t_ok(r['pf_info']['qlim_passes'] +
+             r['pf_info'].get('qlim_switches', 0) > 0 and
+             r['pf_info']['et_qlim'] >= 0, [t, 'Q limit loop statistics'])
+
+    ## PV to PQ conversions within Newton's iterations vs. new power flows
+    for case in [case118, case300]:
+        t = '%s, PF_QLIM_TOL : ' % case.__name__
+        ppopt = ppoption(VERBOSE=0, OUT_ALL=0, ENFORCE_Q_LIMS=2)
+        r, success = runpf(case(), ppopt)
+        r0, success0 = runpf(case(), ppoption(ppopt, PF_QLIM_TOL=0))
+        t_ok(success and success0, [t, 'success'])
+        t_ok(r['pf_info']['qlim_switches'] > 0 and
+             r['pf_info']['qlim_passes'] < r0['pf_info']['qlim_passes'],
+             [t, 'conversions within iterations'])
+        t_ok(r['pf_info']['iterations'] < r0['pf_info']['iterations'],
+             [t, 'fewer iterations'])
+        t_is(r['bus'][:, [VM, VA]], r0['bus'][:, [VM, VA]], 6, [t, 'V'])
+
+    ## PV bus converted within the iterations, then the slack in a new pass
+    for case in [case14, case30]:
+        t = '%s, conversion of PV and slack gens : ' % case.__name__
+        ppc = case()
+        ppc['gen'][0, QMAX] = ppc['gen'][0, QG] + 1
+        ppc['gen'][0, QMIN] = -9999
+        ppc['gen'][1, QMAX] = ppc['gen'][1, QG] - 5
+        ppopt = ppoption(VERBOSE=0, OUT_ALL=0, ENFORCE_Q_LIMS=1)
+        r, success = runpf(ppc, ppopt)
+        r0, success0 = runpf(ppc, ppoption(ppopt, PF_QLIM_TOL=0))
+        t_ok(success and success0, [t, 'success'])
+        t_ok(r['pf_info']['qlim_switches'] == 1 and
+             r['pf_info']['qlim_passes'] == 1, [t, 'conversions'])
+        t_is(r['bus'][:, [VM, VA]], r0['bus'][:, [VM, VA]], 6, [t, 'V'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_pf_qlim(quiet=False)
@@ -0,0 +1,151 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the linear solvers of the Newton power flow.
+"""
+
+from numpy import exp, pi
+
+from scipy.sparse.linalg import gmres
+from numpy.random import RandomState
+
+from pypower.case30 import case30
+from pypower.case300 import case300
+from pypower.ppoption import ppoption
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.bustypes import bustypes
+from pypower.makeYbus import makeYbus
+from pypower.makeSbus import makeSbus
+from pypower.jacobian_plan import JacobianPlan
+from pypower.newtonpf import newtonpf
+from pypower.pflinsolver import pflinsolver, DirectSolver, LUSolver, \
+    ILUSolver, FDPreconditioner, KrylovSolver
+from pypower.runpf import runpf
+
+from pypower.idx_bus import VM, VA
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_pflinsolver(quiet=False):
+    """Tests for the linear solvers of the Newton power flow.
+    """
+    t_begin(31, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+
+    ## solvers on a sequence of Jacobians with the same pattern
+    ppc = ext2int(loadcase(case30()))
+    baseMVA, bus, gen, branch = \
+        ppc['baseMVA'], ppc['bus'], ppc['gen'], ppc['branch']
+    ref, pv, pq = bustypes(bus, gen)
+    Ybus, _, _ = makeYbus(baseMVA, bus, branch)
+    plan = JacobianPlan(Ybus, pv, pq)
+    nb = bus.shape[0]
+    rs = RandomState(42)
+
+    t = 'LUSolver : '
+    lin = LUSolver()
+    for k in range(2):
+        V = (1 + 0.05 * rs.randn(nb)) * exp(0.1j * rs.randn(nb))
+        J = plan.jac(V)
+        b = rs.randn(J.shape[0])
+        lin.factor(J)
+        t_is(J * lin.solve(b), b, 10, [t, 'solve, factorization %d' % k])
+    t_ok(lin.perm is not None, [t, 'ordering kept'])
+    t_is([lin.factorizations, lin.solves], [2, 2], 12, [t, 'counters'])
+    t_is(J.T * lin.solve_transposed(b), b, 10, [t, 'transposed solve'])
+    lin = LUSolver(rs.permutation(J.shape[0]))
+    lin.factor(J)
+    t_is(J.T * lin.solve_transposed(b), b, 10,
+         [t, 'transposed solve, given ordering'])
+
+    t = 'DirectSolver : '
+    lin = DirectSolver()
+    lin.factor(J)
+    t_is(J.T * lin.solve_transposed(b), b, 10, [t, 'transposed solve'])
+
+    t = 'KrylovSolver : '
+    lin = KrylovSolver(gmres, ILUSolver(), eta_max=1e-10, tol=0)
+    lin.factor(J)
+    t_is(J * lin.solve(b), b, 8, [t, 'GMRES, ILU, solve'])
+    t_ok(lin.lin_iterations > 0, [t, 'GMRES, ILU, iterations'])
+    lin = KrylovSolver(gmres, FDPreconditioner(Ybus, pv, pq), eta_max=1e-10,
+                       tol=0)
+    for k in range(2):
+        lin.factor(J)
+    t_is(J * lin.solve(b), b, 8, [t, 'GMRES, fast-decoupled, solve'])
+    t_is(lin.stats()['factorizations'], 2, 12,
+         [t, 'fast-decoupled, factored once'])
+
+    t = 'pflinsolver : '
+    t_ok(isinstance(pflinsolver(ppopt), DirectSolver), [t, 'default'])
+    t_ok(isinstance(pflinsolver(ppoption(ppopt, PF_JAC_REUSE=3)), LUSolver),
+         [t, 'LU for PF_JAC_REUSE'])
+    try:
+        pflinsolver(ppoption(ppopt, PF_LIN_SOLVER=-1))
+        t_ok(0, [t, 'unknown PF_LIN_SOLVER'])
+    except ValueError:
+        t_ok(1, [t, 'unknown PF_LIN_SOLVER'])
+    t_ok(isinstance(pflinsolver(ppoption(ppopt, PF_LIN_SOLVER=3)),
+                    KrylovSolver), [t, 'Krylov'])
+    try:
+        pflinsolver(ppoption(ppopt, PF_LIN_SOLVER=2, PF_KRYLOV_PREC=1))
+        t_ok(0, [t, 'fast-decoupled preconditioner without Ybus'])
+    except ValueError:
+        t_ok(1, [t, 'fast-decoupled preconditioner without Ybus'])
+
+    ## Newton power flow with the different solvers
+    ppc = ext2int(loadcase(case300()))
+    baseMVA, bus, gen, branch = \
+        ppc['baseMVA'], ppc['bus'], ppc['gen'], ppc['branch']
+    ref, pv, pq = bustypes(bus, gen)
+    Ybus, _, _ = makeYbus(baseMVA, bus, branch)
+    Sbus = makeSbus(baseMVA, bus, gen)
+    V0 = bus[:, VM] * exp(1j * pi / 180 * bus[:, VA])
+
+    t = 'newtonpf : '
+    V, success, its = newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt)
+    info = {}
+    V1, success1, its1 = newtonpf(Ybus, Sbus, V0, ref, pv, pq,
+                                  ppoption(ppopt, PF_LIN_SOLVER=1), info=info)
+    t_is(V1, V, 10, [t, 'LU, V'])
+    t_is([info['iterations'], info['factorizations']], [its, its], 12,
+         [t, 'LU, one factorization per iteration'])
+
+    info = {}
+    V2, success2, its2 = newtonpf(Ybus, Sbus, V0, ref, pv, pq,
+                                  ppoption(ppopt, PF_JAC_REUSE=2), info=info)
+    t_ok(success2, [t, 'Jacobian reuse, success'])
+    t_is(V2, V, 6, [t, 'Jacobian reuse, V'])
+    t_ok(info['factorizations'] < info['iterations'],
+         [t, 'Jacobian reuse, fewer factorizations than iterations'])
+
+    for alg, name in [(2, 'GMRES'), (3, 'BiCGSTAB')]:
+        for prec, pname in [(0, 'ILU'), (1, 'fast-decoupled')]:
+            info = {}
+            V3, success3, _ = newtonpf(Ybus, Sbus, V0, ref, pv, pq,
+                                       ppoption(ppopt, PF_LIN_SOLVER=alg,
+                                                PF_KRYLOV_PREC=prec),
+                                       info=info)
+            t_ok(success3 and info['lin_iterations'] > 0,
+                 [t, '%s, %s, success' % (name, pname)])
+            t_is(V3, V, 8, [t, '%s, %s, V' % (name, pname)])
+
+    ## statistics in runpf results
+    t = 'runpf : '
+    r, success = runpf(case30(), ppopt)
+    t_ok(success and r['pf_info']['iterations'] > 0, [t, 'iterations'])
+    t_is(r['pf_info']['factorizations'], r['pf_info']['iterations'], 12,
+         [t, 'factorizations'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_pflinsolver(quiet=False)
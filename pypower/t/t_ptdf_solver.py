@@ -0,0 +1,86 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the DC PTDF computation with a cached factorization.
+"""
+
+from numpy import ones, zeros, ix_, dot, vstack, float32
+from numpy.linalg import solve
+from numpy.random import RandomState
+
+from pypower.case118 import case118
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.makeBdc import makeBdc
+from pypower.makePTDF import makePTDF
+from pypower.ptdf_solver import PTDFSolver
+
+from pypower.idx_bus import PD
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_ptdf_solver(quiet=False):
+    """Tests for the DC PTDF computation with a cached factorization.
+    """
+    t_begin(14, quiet)
+
+    ppc = ext2int(loadcase(case118()))
+    baseMVA, bus, branch = ppc['baseMVA'], ppc['bus'], ppc['branch']
+    nb, nl = bus.shape[0], branch.shape[0]
+    B, Bf, _, _ = makeBdc(baseMVA, bus, branch)
+
+    ## dense reference, with bus 1 as slack
+    Bd, Bfd = B.todense(), Bf.todense()
+    H1 = zeros((nl, nb))
+    H1[:, 1:] = solve(Bd[1:, 1:].T, Bfd[:, 1:].T).T
+    w = bus[:, PD] + 1
+    Hw = H1 - dot(H1, w / sum(w)).reshape(-1, 1)
+
+    rows = [40, 3, 17, 150]
+    cols = [5, 0, 99]
+
+    t = 'PTDFSolver, single slack : '
+    solver = PTDFSolver(B, Bf, 0)
+    t_is(solver.ptdf(), H1, 10, [t, 'full'])
+    t_is(solver.ptdf(rows), H1[rows, :], 10, [t, 'rows'])
+    t_is(solver.ptdf(None, cols), H1[:, cols], 10, [t, 'columns'])
+    t_is(solver.ptdf(rows, cols), H1[ix_(rows, cols)], 10,
+         [t, 'rows and columns'])
+    t_is(solver.factorizations, 1, 12, [t, 'factored once'])
+
+    t = 'PTDFSolver, distributed slack : '
+    solver = PTDFSolver(B, Bf, w)
+    t_is(solver.ptdf(), Hw, 10, [t, 'full'])
+    t_is(solver.ptdf(rows), Hw[rows, :], 10, [t, 'rows'])
+    t_is(solver.ptdf(rows, cols), Hw[ix_(rows, cols)], 10,
+         [t, 'rows and columns'])
+
+    t = 'PTDFSolver, slack matrix : '
+    S = RandomState(5).rand(nb, nb)
+    t_is(PTDFSolver(B, Bf, S).ptdf(None, cols), dot(H1, S)[:, cols], 10,
+         [t, 'columns'])
+
+    t = 'PTDFSolver : '
+    H = vstack([Hk for _, Hk in solver.blocks(block_size=50)])
+    t_is(H, Hw, 10, [t, 'blocks'])
+    Hk = solver.ptdf(dtype=float32)
+    t_ok(Hk.dtype == float32, [t, 'float32'])
+    t_is(Hk, Hw, 5, [t, 'float32 values'])
+    P = RandomState(3).rand(nb, 4)
+    t_is(solver.flows(P, rows), dot(Hw[rows, :], P), 10, [t, 'flows'])
+
+    t = 'makePTDF : '
+    t_is(makePTDF(baseMVA, bus, branch, ones(nb), rows, cols),
+         H1[ix_(rows, cols)] - dot(H1[rows, :], ones(nb) / nb).reshape(-1, 1),
+         10, [t, 'rows and columns'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_ptdf_solver(quiet=False)
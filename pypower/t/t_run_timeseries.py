@@ -0,0 +1,79 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for quasi-static time series power flows.
+"""
+
+from numpy import array, zeros, exp, pi
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.loadcase import loadcase
+from pypower.runpf import runpf
+from pypower.run_timeseries import run_timeseries
+
+from pypower.idx_bus import PD, QD, VM, VA, BUS_AREA
+from pypower.idx_brch import PF, QT
+from pypower.idx_gen import PG
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_run_timeseries(quiet=False):
+    """Tests for quasi-static time series power flows.
+    """
+    t_begin(11, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    ppc = case30()
+
+    ## reference solutions of the individually scaled cases
+    zone_load = array([[1.0, 1.0, 1.0], [1.1, 0.9, 1.0], [0.8, 1.2, 1.1]])
+    pg = array([ppc['gen'][:, PG], ppc['gen'][:, PG], ppc['gen'][:, PG]])
+    pg[2, 1] = 40
+    ref = []
+    for load, g in zip(zone_load, pg):
+        c = loadcase(case30())
+        for k in range(3):
+            i = c['bus'][:, BUS_AREA] == k + 1
+            c['bus'][i, PD] = load[k] * c['bus'][i, PD]
+            c['bus'][i, QD] = load[k] * c['bus'][i, QD]
+        c['gen'][:, PG] = g
+        r, _ = runpf(c, ppopt)
+        ref.append(r)
+
+    ## yielded results, load profile from a generator
+    t = 'run_timeseries : '
+    steps = list(run_timeseries(ppc, (l for l in zone_load), pg, ppopt))
+    t_is(len(steps), 3, 12, [t, 'number of steps'])
+    for k, (V, success, iterations) in enumerate(steps):
+        Vref = ref[k]['bus'][:, VM] * exp(1j * pi / 180 * ref[k]['bus'][:, VA])
+        t_is(V, Vref, 8, [t, 'V, step %d' % k])
+    t_ok(all([s for _, s, _ in steps]), [t, 'success'])
+    t_ok(steps[1][2] < steps[0][2], [t, 'warm start'])
+
+    ## single zone, results written into preallocated arrays
+    t = 'run_timeseries, fast-decoupled, out : '
+    nb, nl = ppc['bus'].shape[0], ppc['branch'].shape[0]
+    out = {'V': zeros((4, nb), complex), 'success': zeros(4, bool),
+           'Sf': zeros((4, nl), complex), 'St': zeros((4, nl), complex)}
+    n = run_timeseries(ppc, [1.0, 1.05, 0.95], ppopt=ppoption(ppopt, PF_ALG=2),
+                       out=out)
+    t_is(n, 3, 12, [t, 'number of steps'])
+    t_is(out['success'], [1, 1, 1, 0], 12, [t, 'success'])
+    c = loadcase(case30())
+    c['bus'][:, [PD, QD]] = 1.05 * c['bus'][:, [PD, QD]]
+    r, _ = runpf(c, ppopt)
+    t_is(abs(out['V'][1]), r['bus'][:, VM], 5, [t, 'Vm'])
+    t_is(out['Sf'][1].real, r['branch'][:, PF], 3, [t, 'Pf'])
+    t_is(out['St'][1].imag, r['branch'][:, QT], 3, [t, 'Qt'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_run_timeseries(quiet=False)
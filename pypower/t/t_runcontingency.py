@@ -0,0 +1,97 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for AC contingency analysis.
+"""
+
+from copy import deepcopy
+
+from numpy import maximum, hypot, nan_to_num, flatnonzero as find
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.runcontingency import runcontingency, \
+    CONT, VIOL, ELEM, NOT_CONVERGED, OVERLOAD, HIGH_VOLTAGE, LOW_VOLTAGE
+
+from pypower.idx_bus import BUS_I, VM, VMAX, VMIN
+from pypower.idx_brch import PF, QF, PT, QT, RATE_A, BR_STATUS
+from pypower.idx_gen import GEN_STATUS
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_runcontingency(quiet=False):
+    """Tests for AC contingency analysis.
+    """
+    t_begin(10, quiet)
+
+    ppc = case30()
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    nl = ppc['branch'].shape[0]
+    ng = ppc['gen'].shape[0]
+    conts = [('branch', k) for k in [0, 5, 6, 15, 28]] + \
+            [('gen', k) for k in [0, 3]]
+
+    ## reference violations from a power flow of each modified case
+    base, _ = runpf(ppc, ppopt)
+    ref = set()
+    for k, (kind, i) in enumerate(conts):
+        c = deepcopy(base)
+        if kind == 'branch':
+            c['branch'][i, BR_STATUS] = 0
+        else:
+            c['gen'][i, GEN_STATUS] = 0
+        r, success = runpf(c, ppopt)
+        if not success:
+            ref.add((k, NOT_CONVERGED, i))
+            continue
+        br, bus = r['branch'], r['bus']
+        S = maximum(hypot(br[:, PF], br[:, QF]), hypot(br[:, PT], br[:, QT]))
+        for j in find((br[:, RATE_A] > 0) & (S > br[:, RATE_A])):
+            ref.add((k, OVERLOAD, j))
+        for j in find(bus[:, VM] > bus[:, VMAX]):
+            ref.add((k, HIGH_VOLTAGE, int(bus[j, BUS_I])))
+        for j in find(bus[:, VM] < bus[:, VMIN]):
+            ref.add((k, LOW_VOLTAGE, int(bus[j, BUS_I])))
+
+    t = 'runcontingency : '
+    viol, success = runcontingency(ppc, conts, ppopt, workers=1)
+    got = set([tuple(v) for v in viol[:, [CONT, VIOL, ELEM]].astype(int)])
+    t_ok(got == ref, [t, 'violations'])
+    t_is(success, [1, 1, 1, 0, 1, 1, 1], 12, [t, 'success'])
+    t_is(viol[viol[:, VIOL] == NOT_CONVERGED, ELEM], [15], 12,
+         [t, 'outaged element of non-converged contingency'])
+
+    viol2, success2 = runcontingency(ppc, conts, ppopt, workers=2)
+    t_is(nan_to_num(viol2), nan_to_num(viol), 12,
+         [t, 'workers = 2, violations'])
+    t_is(success2.astype(int), success.astype(int), 12,
+         [t, 'workers = 2, success'])
+
+    viol, success = runcontingency(ppc, ppopt=ppopt, workers=1)
+    t_is(len(success), nl + ng, 12, [t, 'default N-1 contingencies'])
+    t_is(find(~success), [15, 33], 12, [t, 'default N-1, not converged'])
+
+    t = 'runcontingency, fast-decoupled : '
+    viol, success = runcontingency(ppc, conts, ppoption(ppopt, PF_ALG=2),
+                                   workers=1)
+    got = set([tuple(v) for v in viol[:, [CONT, VIOL, ELEM]].astype(int)])
+    t_is(success, [1, 1, 1, 0, 1, 1, 1], 12, [t, 'success'])
+    t_ok(got == ref, [t, 'violations'])
+
+    try:
+        runcontingency(ppc, [('bus', 1)], ppopt, workers=1)
+        t_ok(0, 'unknown outage type')
+    except ValueError:
+        t_ok(1, 'unknown outage type')
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_runcontingency(quiet=False)
@@ -0,0 +1,101 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for C{VoltageSensitivity}.
+"""
+
+from numpy import exp, pi, r_, argsort, linalg
+
+from scipy.sparse import issparse
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.bustypes import bustypes
+from pypower.makeYbus import makeYbus
+from pypower.makeSbus import makeSbus
+from pypower.newtonpf import newtonpf
+from pypower.voltage_sensitivity import VoltageSensitivity
+
+from pypower.idx_bus import VM, VA
+from pypower.idx_gen import GEN_BUS, VG
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_voltage_sensitivity(quiet=False):
+    """Tests for C{VoltageSensitivity}.
+    """
+    t_begin(13, quiet)
+
+    ppopt = ppoption(VERBOSE=0, PF_TOL=1e-12, PF_LIN_SOLVER=1)
+    ppc = ext2int(loadcase(case30()))
+    baseMVA, bus, gen, branch = \
+        ppc['baseMVA'], ppc['bus'], ppc['gen'], ppc['branch']
+    ref, pv, pq = bustypes(bus, gen)
+    Ybus, _, _ = makeYbus(baseMVA, bus, branch)
+    Sbus = makeSbus(baseMVA, bus, gen)
+    V0 = bus[:, VM] * exp(1j * pi / 180 * bus[:, VA])
+    gbus = gen[:, GEN_BUS].astype(int)
+    V0[gbus] = gen[:, VG] / abs(V0[gbus]) * V0[gbus]
+    npv, npq = len(pv), len(pq)
+    n1 = npv + npq
+
+    V, success, _, lin = newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt,
+                                  return_solver=True)
+    vs = VoltageSensitivity(Ybus, V, ref, pv, pq, lin)
+
+    ## reference blocks of the dense inverse of the Jacobian
+    J = vs.J.toarray()
+    Jinv = linalg.inv(J)
+
+    t = 'VoltageSensitivity : '
+    t_ok(vs._solver is lin, [t, 'factors from newtonpf reused'])
+    t_is(vs.dVm_dQ(), Jinv[n1:, n1:], 10, [t, 'dVm_dQ'])
+    t_is(vs.dVm_dP(), Jinv[n1:, :n1], 10, [t, 'dVm_dP'])
+    t_is(vs.dVm_dQ(bus_idx=pq[[4, 2]]), Jinv[n1 + r_[4, 2], n1:], 10,
+         [t, 'dVm_dQ, rows by transposed solves'])
+    t_is(vs.dVm_dP(inj_idx=[pq[3], pv[1]]), Jinv[n1:, [npv + 3, 1]], 10,
+         [t, 'dVm_dP, columns'])
+    S = vs.dVm_dQ(threshold=1e-3)
+    t_ok(issparse(S) and S.nnz < npq * npq, [t, 'threshold, sparse'])
+    t_is(S.toarray(), Jinv[n1:, n1:] * (abs(Jinv[n1:, n1:]) >= 1e-3), 10,
+         [t, 'threshold, values'])
+    try:
+        vs.dVm_dQ(inj_idx=pv[:1])
+        t_ok(0, [t, 'PV bus injection of reactive power'])
+    except ValueError:
+        t_ok(1, [t, 'PV bus injection of reactive power'])
+
+    ## voltage changes of a reactive injection from the power flow
+    d = 1e-4
+    S = Sbus.copy()
+    S[pq[5]] += 1j * d
+    V1 = newtonpf(Ybus, S, V, ref, pv, pq, ppopt)[0]
+    t_is((abs(V1[pq]) - abs(V[pq])) / d, vs.dVm_dQ(inj_idx=pq[[5]])[:, 0], 4,
+         [t, 'dVm_dQ, power flow'])
+
+    ## modal analysis against the dense reduced Jacobian
+    JR = J[n1:, n1:] - J[n1:, :n1].dot(linalg.solve(J[:n1, :n1], J[:n1, n1:]))
+    lam, X = linalg.eig(JR)
+    lam = lam[argsort(abs(lam))].real
+
+    t = 'VoltageSensitivity.modes : '
+    lam1, X1, P1 = vs.modes(4)
+    t_is(lam1, lam[:4], 8, [t, 'eigenvalues'])
+    t_is(JR.dot(X1), X1 * lam1, 8, [t, 'eigenvectors'])
+    t_is(P1.sum(axis=0), [1, 1, 1, 1], 10, [t, 'participation factors'])
+    lam2, _, P2 = vs.modes(npq)
+    t_is(r_[lam2[:4], P2[:, :4].flatten()], r_[lam1, P1.flatten()], 8,
+         [t, 'dense, small system'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_voltage_sensitivity(quiet=False)
@@ -0,0 +1,78 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for warm starts of runpf from cached solutions.
+"""
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.lrucache import LRUCache
+from pypower.topology_key import topology_key
+from pypower.runpf import runpf, warm_cache
+
+from pypower.idx_bus import VM, VA, PD, QD
+from pypower.idx_brch import BR_STATUS
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_warm_start(quiet=False):
+    """Tests for warm starts of runpf from cached solutions.
+    """
+    t_begin(13, quiet)
+
+    ## LRU cache
+    t = 'LRUCache : '
+    c = LRUCache(2)
+    c.put('a', 1)
+    c.put('b', 2)
+    c.get('a')
+    c.put('c', 3)
+    t_ok('a' in c and 'c' in c and 'b' not in c, [t, 'evicts least recent'])
+    t_is([c.get('b', 0), c.get('c')], [0, 3], 12, [t, 'get'])
+    t_is([c.hits, c.misses], [2, 1], 12, [t, 'counters'])
+    t_ok(c.keys() == ['a', 'c'], [t, 'keys, least recent first'])
+    c.maxsize = 1
+    t_is(len(c), 1, 12, [t, 'decrease maxsize'])
+
+    ## topology key
+    t = 'topology_key : '
+    ppc = loadcase(case30())
+    key = topology_key(ext2int(loadcase(case30())))
+    ppc2 = loadcase(case30())
+    ppc2['bus'][:, PD] = 1.1 * ppc2['bus'][:, PD]
+    t_ok(topology_key(ext2int(ppc2)) == key, [t, 'independent of loads'])
+    ppc2['branch'][5, BR_STATUS] = 0
+    t_ok(topology_key(ext2int(ppc2)) != key, [t, 'branch status'])
+
+    ## warm starts in runpf
+    t = 'runpf : '
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0, PF_WARM_CACHE_SIZE=2)
+    warm_cache.clear()
+    r1, success = runpf(ppc, ppopt)
+    t_ok(success and not r1['pf_info']['warm_start'], [t, 'cold start'])
+
+    ppc2 = loadcase(case30())
+    ppc2['bus'][:, [PD, QD]] = 1.01 * ppc2['bus'][:, [PD, QD]]
+    r2, success = runpf(ppc2, ppopt)
+    r3, _ = runpf(ppc2, ppoption(ppopt, PF_WARM_CACHE_SIZE=0))
+    t_ok(success and r2['pf_info']['warm_start'], [t, 'warm start'])
+    t_is(r2['bus'][:, [VM, VA]], r3['bus'][:, [VM, VA]], 6,
+         [t, 'same solution as cold start'])
+    t_ok(r2['pf_info']['iterations'] < r3['pf_info']['iterations'],
+         [t, 'fewer iterations'])
+    t_is([r2['pf_info']['cache_hits'], r2['pf_info']['cache_misses']],
+         [1, 1], 12, [t, 'counters'])
+    t_ok('warm_start' not in r3['pf_info'], [t, 'disabled'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_warm_start(quiet=False)
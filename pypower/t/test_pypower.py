@@ -23,12 +23,36 @@ def test_pypower(verbose=False):
     tests.append('t_loadcase')
     # tests.append('t_ext2int2ext')
     tests.append('t_jacobian')
+    tests.append('t_jacobian_plan')
+    tests.append('t_incremental_ybus')
+    tests.append('t_pf_batch')
+    tests.append('t_pflinsolver')
+    tests.append('t_loss_sensitivity')
+    tests.append('t_voltage_sensitivity')
+    tests.append('t_bus_ordering')
+    tests.append('t_gausspf')
+    tests.append('t_bfswpf')
+    tests.append('t_find_islands')
+    tests.append('t_dcpf_solver')
+    tests.append('t_ptdf_solver')
+    tests.append('t_lodf_solver')
+    tests.append('t_incremental_ptdf')
+    tests.append('t_makeGODF')
+    tests.append('t_fdpf_solver')
+    tests.append('t_runcontingency')
+    tests.append('t_dc_contingency_screen')
+    tests.append('t_dc_contingency_screen_n2')
+    tests.append('t_atc')
+    tests.append('t_run_timeseries')
+    tests.append('t_warm_start')
+    tests.append('t_pf_qlim')
     tests.append('t_hessian')
     tests.append('t_totcost')
     tests.append('t_modcost')
     tests.append('t_hasPQcap')
 
     # tests.append('t_pips')
+    tests.append('t_kkt_plan')
 
     # tests.append('t_qps_pypower')
     # tests.append('t_pf')
@@ -71,7 +95,23 @@ def test_pf(verbose=False):
     tests.append('t_loadcase')
     tests.append('t_ext2int2ext')
     tests.append('t_jacobian')
+    tests.append('t_jacobian_plan')
+    tests.append('t_incremental_ybus')
     tests.append('t_pf')
+    tests.append('t_pf_batch')
+    tests.append('t_pflinsolver')
+    tests.append('t_loss_sensitivity')
+    tests.append('t_voltage_sensitivity')
+    tests.append('t_bus_ordering')
+    tests.append('t_gausspf')
+    tests.append('t_bfswpf')
+    tests.append('t_find_islands')
+    tests.append('t_dcpf_solver')
+    tests.append('t_fdpf_solver')
+    tests.append('t_runcontingency')
+    tests.append('t_run_timeseries')
+    tests.append('t_warm_start')
+    tests.append('t_pf_qlim')
 
     return t_run_tests(tests, verbose)
 
@@ -95,6 +135,7 @@ def test_opf(verbose=False, *others):
     tests.append('t_opf_dc_pips_sc')
 
     tests.append('t_pips')
+    tests.append('t_kkt_plan')
 
     tests.append('t_opf_pips')
     tests.append('t_opf_pips_sc')
@@ -109,7 +150,14 @@ def test_opf(verbose=False, *others):
     tests.append('t_runopf_w_res')
 
     tests.append('t_makePTDF')
+    tests.append('t_ptdf_solver')
     tests.append('t_makeLODF')
+    tests.append('t_lodf_solver')
+    tests.append('t_incremental_ptdf')
+    tests.append('t_makeGODF')
+    tests.append('t_dc_contingency_screen')
+    tests.append('t_dc_contingency_screen_n2')
+    tests.append('t_atc')
     tests.append('t_total_load')
     tests.append('t_scale_load')
 
@@ -0,0 +1,48 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Hash of the topology of a case.
+"""
+
+from hashlib import sha1
+
+from numpy import arange, ascontiguousarray, int64, flatnonzero as find
+
+from pypower.idx_bus import BUS_TYPE
+from pypower.idx_brch import F_BUS, T_BUS, BR_STATUS
+
+
+def topology_key(ppc):
+    """Returns a hash of the topology of a case.
+
+    The key is a hex string computed from the bus ordering, the bus types
+    and the terminal buses of the in-service branches. Two cases with the
+    same key have the same number and order of buses and the same network
+    structure, so that a solution of one is a meaningful starting point
+    for the other. Branch parameters, loads and generator dispatch do not
+    enter the key.
+
+    For a case in internal indexing (see L{ext2int}), the external bus
+    numbers and the external indices of the in-service branches are used,
+    which makes the key independent of the buses and branches that were
+    removed by the conversion.
+
+    @see: L{runpf}
+    """
+    bus, branch = ppc['bus'], ppc['branch']
+    on = find(branch[:, BR_STATUS] > 0)
+
+    if 'order' in ppc and ppc['order']['state'] == 'i':
+        i2e = ppc['order']['bus']['i2e']
+        br = ppc['order']['branch']['status']['on'][on]
+    else:
+        i2e = arange(bus.shape[0])
+        br = on
+
+    h = sha1()
+    for a in [i2e, bus[:, BUS_TYPE], br, branch[on, F_BUS], branch[on, T_BUS]]:
+        h.update(ascontiguousarray(a, int64).tobytes())
+        h.update(b'|')
+
+    return h.hexdigest()
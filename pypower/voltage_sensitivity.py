@@ -0,0 +1,192 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Voltage sensitivities and modal analysis of an AC power flow solution.
+"""
+
+from numpy import array, arange, zeros, ones, r_, argsort, real_if_close, \
+    linalg, flatnonzero as find
+
+from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import LinearOperator, eigs
+
+from pypower.jacobian_plan import JacobianPlan
+from pypower.pflinsolver import LUSolver, ILUSolver
+
+
+class VoltageSensitivity(object):
+    """Voltage sensitivities and modal analysis of an AC power flow solution.
+
+    Holds the Newton power flow Jacobian C{J} at the solution C{V}, with
+    the unknowns C{[Va(pv), Va(pq), Vm(pq)]} of L{newtonpf}, and its LU
+    factors, which are computed when they are first needed, unless the
+    L{LUSolver} C{lin} with C{J} factored is given, as returned by
+    L{newtonpf} with C{return_solver} and C{PF_LIN_SOLVER} 1. A
+    L{JacobianPlan} for C{Ybus}, C{pv} and C{pq} can be given in C{plan}.
+
+    The sensitivities of the voltage magnitudes of the PQ buses to the
+    reactive (L{dVm_dQ}) and real (L{dVm_dP}) power injections are blocks
+    of the inverse of C{J}, which is never formed: the columns of a set of
+    injections are computed with one solve per injection, the rows of a
+    set of buses with one solve with the transposed factors per bus,
+    whichever takes fewer. Entries smaller than a threshold can be dropped
+    to return a sparse matrix.
+
+    L{modes} performs the modal analysis of the reduced Jacobian::
+        JR = J_QV - J_QVa * inv(J_PVa) * J_PV
+    which relates the reactive power injections and the voltage magnitudes
+    of the PQ buses at constant real power injections, C{dQ = JR * dVm}.
+    Its inverse is L{dVm_dQ}, so the least stable modes, the eigenvalues of
+    C{JR} of smallest magnitude, are found by ARPACK from solves with the
+    factors of C{J}, without forming C{JR}.
+
+    All bus indices are internal (see L{ext2int}) and all quantities per
+    unit.
+
+    Example::
+        V, success, _, lin = newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt,
+                                      return_solver=True)
+        vs = VoltageSensitivity(Ybus, V, ref, pv, pq, lin)
+        S = vs.dVm_dQ(bus_idx=weak, threshold=1e-6)
+        lam, x, p = vs.modes(5)
+
+    @see: L{newtonpf}, L{JacobianPlan}, L{loss_sensitivity}
+    """
+
+    def __init__(self, Ybus, V, ref, pv, pq, lin=None, plan=None):
+        self.ref = array(ref, int).flatten()
+        self.pv = array(pv, int).flatten()
+        self.pq = array(pq, int).flatten()
+        self.pvpq = r_[self.pv, self.pq]
+
+        if plan is None or not plan.matches(Ybus, pv, pq):
+            plan = JacobianPlan(Ybus, pv, pq)
+        else:
+            plan.update(Ybus)
+        #: power flow Jacobian at C{V}
+        self.J = plan.jac(V)
+
+        ## position of the angle and magnitude of each bus in the unknowns
+        nb = len(V)
+        self._Va = -ones(nb, int)
+        self._Va[self.pvpq] = arange(len(self.pvpq))
+        self._Vm = -ones(nb, int)
+        self._Vm[self.pq] = len(self.pvpq) + arange(len(self.pq))
+
+        if lin is not None and (not isinstance(lin, LUSolver) or
+                                isinstance(lin, ILUSolver)):
+            lin = None
+        self._solver = lin
+
+    def factor(self):
+        """Factors the Jacobian, unless factors are available.
+        """
+        if self._solver is None:
+            self._solver = LUSolver()
+            self._solver.factor(self.J)
+
+    def dVm_dQ(self, bus_idx=None, inj_idx=None, threshold=None):
+        """Sensitivities of the voltage magnitudes to the reactive power
+        injections.
+
+        Returns the matrix of the changes of the voltage magnitudes of the
+        PQ buses C{bus_idx} per unit of reactive power injected at the PQ
+        buses C{inj_idx}, both C{pq} if C{None}, with rows and columns in
+        the given order. The matrix is dense unless a C{threshold} is
+        given, in which case smaller entries are dropped and it is sparse.
+        """
+        rows = self._index(self._Vm, self.pq, bus_idx, 'bus_idx')
+        cols = self._index(self._Vm, self.pq, inj_idx, 'inj_idx')
+
+        return self._block(rows, cols, threshold)
+
+    def dVm_dP(self, bus_idx=None, inj_idx=None, threshold=None):
+        """Sensitivities of the voltage magnitudes to the real power
+        injections.
+
+        Returns the matrix of the changes of the voltage magnitudes of the
+        PQ buses C{bus_idx}, C{pq} if C{None}, per unit of real power
+        injected at the PV or PQ buses C{inj_idx}, C{r_[pv, pq]} if
+        C{None}, taken up by the swing bus. Returned as for L{dVm_dQ}.
+        """
+        rows = self._index(self._Vm, self.pq, bus_idx, 'bus_idx')
+        cols = self._index(self._Va, self.pvpq, inj_idx, 'inj_idx')
+
+        return self._block(rows, cols, threshold)
+
+    def modes(self, k=6, tol=0):
+        """Modal analysis of the reduced Jacobian.
+
+        Returns the C{k} eigenvalues of the reduced Jacobian of smallest
+        magnitude in increasing order, real if their imaginary parts are
+        negligible, the corresponding right eigenvectors as the columns of
+        an C{npq x k} matrix, in the order of C{pq}, and the C{npq x k}
+        matrix of the bus participation factors of each mode, which sum
+        to one. C{tol} is the relative accuracy of the eigenvalues passed
+        to ARPACK, machine precision if 0. Small systems, with at most
+        C{k + 1} PQ buses, are solved with dense eigenvalue routines.
+        """
+        self.factor()
+        npq = len(self.pq)
+        k = min(k, npq)
+        solve, solve_t = self._solver.solve, self._solver.solve_transposed
+
+        ## inverse of the reduced Jacobian and its transpose
+        def inv(q, trans=False):
+            b = zeros(self.J.shape[0])
+            b[len(self.pvpq):] = q.flatten()
+            return (solve_t(b) if trans else solve(b))[len(self.pvpq):]
+
+        if k + 1 < npq:
+            n = (npq, npq)
+            mu, X = eigs(LinearOperator(n, matvec=inv), k, tol=tol)
+            mu_t, Y = eigs(LinearOperator(n, matvec=lambda q: inv(q, True)),
+                           k, tol=tol)
+        else:
+            S = self._block(self._Vm[self.pq], self._Vm[self.pq])
+            mu, X = linalg.eig(S)
+            mu_t, Y = linalg.eig(S.T)
+
+        ## pair the left with the right eigenvectors
+        Y = Y[:, [abs(mu_t - m).argmin() for m in mu]]
+
+        ## smallest eigenvalues of the reduced Jacobian first
+        i = argsort(-abs(mu))[:k]
+        lam, X, Y = 1 / mu[i], X[:, i], Y[:, i]
+
+        P = X * Y
+        P = real_if_close(P / P.sum(axis=0), 1e6).real
+
+        return real_if_close(lam, 1e6), real_if_close(X, 1e6), P
+
+    def _index(self, pos, default, idx, name):
+        """Positions in the unknowns of the buses C{idx}, C{default} if
+        C{None}.
+        """
+        idx = default if idx is None else array(idx, int).flatten()
+        p = pos[idx]
+        if any(p < 0):
+            raise ValueError('VoltageSensitivity: %s contains buses %s of '
+                             'the wrong type' % (name, idx[find(p < 0)]))
+        return p
+
+    def _block(self, rows, cols, threshold=None):
+        """Rows C{rows} and columns C{cols} of the inverse of C{J}.
+        """
+        self.factor()
+        n = self.J.shape[0]
+        if len(cols) <= len(rows):
+            E = zeros((n, len(cols)))
+            E[cols, arange(len(cols))] = 1
+            X = self._solver.solve(E)[rows, :]
+        else:
+            E = zeros((n, len(rows)))
+            E[rows, arange(len(rows))] = 1
+            X = self._solver.solve_transposed(E)[cols, :].T
+
+        if threshold is not None:
+            X[abs(X) < threshold] = 0
+            X = csc_matrix(X)
+
+        return X